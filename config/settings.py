@@ -2,130 +2,251 @@
 
 import os
 import logging
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
 from dotenv import load_dotenv
 
+
+@lru_cache(maxsize=1)
+def _load_env() -> bool:
+    """Load the .env file once per process; later calls are no-ops."""
+    # override=False keeps variables that are already set in the environment
+    return load_dotenv(override=False)
+
+
 # Load environment variables from .env file
-load_dotenv()
+_load_env()
 
 logger = logging.getLogger(__name__)
 
+# Snapshot of the environment (taken after .env is loaded) so the class body
+# below reads from a plain dict instead of going through os.environ each time
+_ENV = dict(os.environ)
+
+
+def _to_bool(raw: str) -> bool:
+    """Parse a "true"/"false" environment flag."""
+    return raw.lower() == "true"
+
+
+def _to_optional_int(raw: str) -> Optional[int]:
+    """Parse an integer where empty or zero means "not set"."""
+    return int(raw or "0") or None
+
+
+def _to_path(raw: str) -> Path:
+    """Parse a filesystem path, resolved to an absolute path."""
+    path = Path(raw)
+    # resolve() stats every component; an absolute path without ".." is
+    # already in the form callers need
+    if path.is_absolute() and ".." not in path.parts:
+        return path
+    return path.resolve()
+
+
+# Parser for each setting type, looked up from the attribute's annotation
+_PARSERS: Dict[Any, Callable[[str], Any]] = {
+    str: str,
+    int: int,
+    float: float,
+    bool: _to_bool,
+    Optional[int]: _to_optional_int,
+    Path: _to_path,
+}
+
+
+class _EnvSetting:
+    """
+    Class-level descriptor that reads an environment variable on first access.
+
+    The raw string is converted with the parser registered in ``_PARSERS`` for
+    the attribute's annotation. The parsed value replaces the descriptor on the
+    owning class, so later lookups are plain attribute reads and only settings
+    that are actually used pay for the lookup and conversion.
+    """
+
+    def __init__(self, default: str = ""):
+        self.default = default
+        self.cast: Callable[[str], Any] = str
+        self.name = ""
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+        self.cast = _PARSERS[owner.__annotations__.get(name, str)]
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        value = self.cast(_ENV.get(self.name, self.default))
+        setattr(owner, self.name, value)
+        return value
+
+
 # Get project root directory (where config/ is located)
 PROJECT_ROOT = Path(__file__).parent.parent.absolute()
 
+# Subdirectories of DATA_DIR created by Settings.ensure_data_directories()
+_DATA_SUBDIRS = ("raw", "processed", "chunks", "embeddings", "hashes", "manifests")
+
+
+@lru_cache(maxsize=256)
+def _data_path(data_dir: Path, subpaths: Tuple[str, ...]) -> Path:
+    """Join (and memoize) a path under the data directory."""
+    return data_dir.joinpath(*subpaths)
+
+
+# Allowed values for the enumerated settings checked in Settings.validate()
+_VALID_STORAGE_MODES = frozenset({"local", "s3", "auto"})
+_VALID_PIPELINE_MODES = frozenset({"batch", "streaming"})
+_VALID_EMBEDDING_PROVIDERS = frozenset({"sentence-transformers", "ollama", "openai"})
+_VALID_EMBEDDING_PRECISIONS = frozenset({"auto", "fp32", "fp16", "bf16"})
+_VALID_EMBEDDING_BACKENDS = frozenset({"torch", "onnx", "openvino"})
+
 
 class Settings:
-    """Application settings loaded from environment variables with defaults."""
+    """
+    Application settings loaded from environment variables with defaults.
+
+    Each setting is resolved lazily on first access (see ``_EnvSetting``).
+    Long-running processes can call ``resolve_all()`` once at startup so every
+    later lookup is a plain class attribute read.
+    """
+
+    __slots__ = ()
 
     # ============================================================================
     # Storage Configuration
     # ============================================================================
     # Storage mode: "local" (data/ folder only), "s3" (AWS S3), "auto" (S3 if configured, else local)
-    STORAGE_MODE: str = os.getenv("STORAGE_MODE", "auto")
+    STORAGE_MODE: str = _EnvSetting("auto")
     
     # Pipeline Processing Mode
     # "batch": Wait for all scraping to complete, then process all at once (traditional)
     # "streaming": Process items as they're scraped for concurrent stage execution (faster)
-    PIPELINE_MODE: str = os.getenv("PIPELINE_MODE", "streaming")
+    PIPELINE_MODE: str = _EnvSetting("streaming")
     
     # Neo4j Configuration (OPTIONAL - disabled by default)
-    USE_NEO4J: bool = os.getenv("USE_NEO4J", "false").lower() == "true"
-    NEO4J_URI: str = os.getenv("NEO4J_URI", "neo4j://localhost:7687")
-    NEO4J_USERNAME: str = os.getenv("NEO4J_USERNAME", "neo4j")
-    NEO4J_PASSWORD: str = os.getenv("NEO4J_PASSWORD", "")
-    NEO4J_DATABASE: str = os.getenv("NEO4J_DATABASE", "neo4j")
+    USE_NEO4J: bool = _EnvSetting("false")
+    NEO4J_URI: str = _EnvSetting("neo4j://localhost:7687")
+    NEO4J_USERNAME: str = _EnvSetting("neo4j")
+    NEO4J_PASSWORD: str = _EnvSetting("")
+    NEO4J_DATABASE: str = _EnvSetting("neo4j")
 
     # Pipeline Configuration - Always use project root (absolute path)
-    DATA_DIR: Path = Path(os.getenv("DATA_DIR", str(PROJECT_ROOT / "data"))).resolve()
-    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    DATA_DIR: Path = _EnvSetting(str(PROJECT_ROOT / "data"))
+    LOG_LEVEL: str = _EnvSetting("INFO")
 
     # ============================================================================
     # Embedding Configuration
     # ============================================================================
     # Provider: "sentence-transformers" (local), "ollama" (local), "openai" (API)
-    EMBEDDING_PROVIDER: str = os.getenv("EMBEDDING_PROVIDER", "sentence-transformers")
+    EMBEDDING_PROVIDER: str = _EnvSetting("sentence-transformers")
     
     # Model name (provider-specific)
     # - sentence-transformers: "BAAI/bge-small-en-v1.5", "all-MiniLM-L6-v2", "all-mpnet-base-v2"
     # - ollama: "nomic-embed-text", "mxbai-embed-large"
     # - openai: "text-embedding-3-small", "text-embedding-3-large", "text-embedding-ada-002"
-    EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "BAAI/bge-small-en-v1.5")
+    EMBEDDING_MODEL: str = _EnvSetting("BAAI/bge-small-en-v1.5")
     
     # Batch size for embedding generation
-    EMBEDDING_BATCH_SIZE: int = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+    EMBEDDING_BATCH_SIZE: int = _EnvSetting("32")
+    
+    # Scale embeddings to unit length (for dot-product indexes; cosine
+    # similarity is unaffected)
+    EMBEDDING_NORMALIZE: bool = _EnvSetting("false")
+    
+    # Reuse embeddings of previously seen texts from DATA_DIR/embedding_cache.sqlite
+    EMBEDDING_CACHE_ENABLED: bool = _EnvSetting("true")
+    
+    # Inference precision for sentence-transformers models:
+    # "auto" (fp16 on CUDA, fp32 otherwise), "fp32", "fp16", "bf16"
+    EMBEDDING_PRECISION: str = _EnvSetting("auto")
+    
+    # Runtime for sentence-transformers models: "torch", "onnx" (ONNX Runtime)
+    # or "openvino"; the last two need sentence-transformers[onnx]/[openvino]
+    EMBEDDING_BACKEND: str = _EnvSetting("torch")
+    
+    # CPU threads used by torch for local models (unset: min(8, CPU count)),
+    # keeps several workers on one host from oversubscribing the cores
+    EMBEDDING_THREADS: Optional[int] = _EnvSetting("")
     
     # Ollama Configuration (for local Ollama server)
-    OLLAMA_BASE_URL: str = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+    OLLAMA_BASE_URL: str = _EnvSetting("http://localhost:11434")
+    # Embedding requests sent to Ollama in parallel (match OLLAMA_NUM_PARALLEL)
+    OLLAMA_MAX_CONCURRENCY: int = _EnvSetting("8")
     
     # OpenAI-Compatible API Configuration
-    OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
-    OPENAI_API_BASE: str = os.getenv("OPENAI_API_BASE", "https://api.openai.com/v1")
-    OPENAI_ORG_ID: str = os.getenv("OPENAI_ORG_ID", "")  # Optional
+    OPENAI_API_KEY: str = _EnvSetting("")
+    OPENAI_API_BASE: str = _EnvSetting("https://api.openai.com/v1")
+    OPENAI_ORG_ID: str = _EnvSetting("")  # Optional
     
     # Embedding dimension (auto-detected if not set, or override for custom models)
-    EMBEDDING_DIMENSION: Optional[int] = int(os.getenv("EMBEDDING_DIMENSION") or "0") or None
+    EMBEDDING_DIMENSION: Optional[int] = _EnvSetting("")
 
     # Scraper Configuration
-    SCRAPER_DOWNLOAD_DELAY: float = float(os.getenv("SCRAPER_DOWNLOAD_DELAY", "1.0"))
-    SCRAPER_CONCURRENT_REQUESTS: int = int(os.getenv("SCRAPER_CONCURRENT_REQUESTS", "2"))
-    SCRAPER_DEPTH_LIMIT: int = int(os.getenv("SCRAPER_DEPTH_LIMIT", "4"))
+    SCRAPER_DOWNLOAD_DELAY: float = _EnvSetting("1.0")
+    SCRAPER_CONCURRENT_REQUESTS: int = _EnvSetting("2")
+    SCRAPER_DEPTH_LIMIT: int = _EnvSetting("4")
 
     # Chunking Configuration
-    CHUNK_SIZE: int = int(os.getenv("CHUNK_SIZE", "512"))
-    CHUNK_OVERLAP: int = int(os.getenv("CHUNK_OVERLAP", "64"))
+    CHUNK_SIZE: int = _EnvSetting("512")
+    CHUNK_OVERLAP: int = _EnvSetting("64")
 
     # ============================================================================
     # Integration Configuration
     # ============================================================================
     # LlamaIndex Cloud Configuration (OPTIONAL - disabled by default)
-    USE_LLAMAINDEX: bool = os.getenv("USE_LLAMAINDEX", "false").lower() == "true"
-    LLAMACLOUD_API_KEY: str = os.getenv("LLAMACLOUD_API_KEY", "")
-    LLAMACLOUD_BASE_URL: str = os.getenv("LLAMACLOUD_BASE_URL", "https://api.cloud.llamaindex.ai")
-    LLAMACLOUD_INDEX_NAME: str = os.getenv("LLAMACLOUD_INDEX_NAME", "")
-    LLAMACLOUD_PROJECT_NAME: str = os.getenv("LLAMACLOUD_PROJECT_NAME", "Default")
-    LLAMACLOUD_ORGANIZATION_ID: str = os.getenv("LLAMACLOUD_ORGANIZATION_ID", "")
+    USE_LLAMAINDEX: bool = _EnvSetting("false")
+    LLAMACLOUD_API_KEY: str = _EnvSetting("")
+    LLAMACLOUD_BASE_URL: str = _EnvSetting("https://api.cloud.llamaindex.ai")
+    LLAMACLOUD_INDEX_NAME: str = _EnvSetting("")
+    LLAMACLOUD_PROJECT_NAME: str = _EnvSetting("Default")
+    LLAMACLOUD_ORGANIZATION_ID: str = _EnvSetting("")
 
     # n8n Configuration
-    N8N_BASE_URL: str = os.getenv("N8N_BASE_URL", "http://localhost:5678")
-    N8N_API_KEY: str = os.getenv("N8N_API_KEY", "")
-    N8N_WEBHOOK_URL: str = os.getenv("N8N_WEBHOOK_URL", "")
+    N8N_BASE_URL: str = _EnvSetting("http://localhost:5678")
+    N8N_API_KEY: str = _EnvSetting("")
+    N8N_WEBHOOK_URL: str = _EnvSetting("")
 
     # ClickHouse Configuration
-    CLICKHOUSE_HOST: str = os.getenv("CLICKHOUSE_HOST", "localhost")
-    CLICKHOUSE_PORT: int = int(os.getenv("CLICKHOUSE_PORT", "8123"))
-    CLICKHOUSE_USERNAME: str = os.getenv("CLICKHOUSE_USERNAME", "default")
-    CLICKHOUSE_PASSWORD: str = os.getenv("CLICKHOUSE_PASSWORD", "")
-    CLICKHOUSE_DATABASE: str = os.getenv("CLICKHOUSE_DATABASE", "default")
+    CLICKHOUSE_HOST: str = _EnvSetting("localhost")
+    CLICKHOUSE_PORT: int = _EnvSetting("8123")
+    CLICKHOUSE_USERNAME: str = _EnvSetting("default")
+    CLICKHOUSE_PASSWORD: str = _EnvSetting("")
+    CLICKHOUSE_DATABASE: str = _EnvSetting("default")
 
     # AWS S3 Configuration
-    S3_BUCKET_NAME: str = os.getenv("S3_BUCKET_NAME", "")
-    AWS_ACCESS_KEY_ID: str = os.getenv("AWS_ACCESS_KEY_ID", "")
-    AWS_SECRET_ACCESS_KEY: str = os.getenv("AWS_SECRET_ACCESS_KEY", "")
-    AWS_REGION: str = os.getenv("AWS_REGION", "us-east-1")
+    S3_BUCKET_NAME: str = _EnvSetting("")
+    AWS_ACCESS_KEY_ID: str = _EnvSetting("")
+    AWS_SECRET_ACCESS_KEY: str = _EnvSetting("")
+    AWS_REGION: str = _EnvSetting("us-east-1")
 
     # Pinecone Configuration (OPTIONAL - disabled by default)
-    USE_PINECONE: bool = os.getenv("USE_PINECONE", "false").lower() == "true"
-    PINECONE_API_KEY: str = os.getenv("PINECONE_API_KEY", "")
-    PINECONE_ENVIRONMENT: str = os.getenv("PINECONE_ENVIRONMENT", "")
-    PINECONE_INDEX_NAME: str = os.getenv("PINECONE_INDEX_NAME", "")
-    PINECONE_NAMESPACE: str = os.getenv("PINECONE_NAMESPACE", "")
+    USE_PINECONE: bool = _EnvSetting("false")
+    PINECONE_API_KEY: str = _EnvSetting("")
+    PINECONE_ENVIRONMENT: str = _EnvSetting("")
+    PINECONE_INDEX_NAME: str = _EnvSetting("")
+    PINECONE_NAMESPACE: str = _EnvSetting("")
 
     @classmethod
-    def validate(cls) -> bool:
-        """Validate that required settings are present."""
-        errors = []
+    def resolve_all(cls) -> None:
+        """Resolve every pending environment-backed setting now."""
+        for name, value in list(vars(cls).items()):
+            if isinstance(value, _EnvSetting):
+                getattr(cls, name)
 
+    @classmethod
+    def _iter_errors(cls) -> Iterator[str]:
+        """Yield a message for each invalid or missing setting."""
         # Validate storage mode
-        if cls.STORAGE_MODE not in ["local", "s3", "auto"]:
-            errors.append(
+        if cls.STORAGE_MODE not in _VALID_STORAGE_MODES:
+            yield (
                 f"Invalid STORAGE_MODE: {cls.STORAGE_MODE}. "
                 "Must be 'local', 's3', or 'auto'"
             )
         
         # Validate pipeline mode
-        if cls.PIPELINE_MODE not in ["batch", "streaming"]:
-            errors.append(
+        if cls.PIPELINE_MODE not in _VALID_PIPELINE_MODES:
+            yield (
                 f"Invalid PIPELINE_MODE: {cls.PIPELINE_MODE}. "
                 "Must be 'batch' or 'streaming'"
             )
@@ -133,47 +254,78 @@ class Settings:
         # Validate S3 configuration if storage mode is s3
         if cls.STORAGE_MODE == "s3":
             if not cls.S3_BUCKET_NAME:
-                errors.append("S3_BUCKET_NAME is required when STORAGE_MODE is 's3'")
+                yield "S3_BUCKET_NAME is required when STORAGE_MODE is 's3'"
             if not cls.AWS_ACCESS_KEY_ID:
-                errors.append("AWS_ACCESS_KEY_ID is required when STORAGE_MODE is 's3'")
+                yield "AWS_ACCESS_KEY_ID is required when STORAGE_MODE is 's3'"
             if not cls.AWS_SECRET_ACCESS_KEY:
-                errors.append("AWS_SECRET_ACCESS_KEY is required when STORAGE_MODE is 's3'")
+                yield "AWS_SECRET_ACCESS_KEY is required when STORAGE_MODE is 's3'"
 
         # Validate Neo4j configuration only if enabled
         if cls.USE_NEO4J:
             if not cls.NEO4J_URI:
-                errors.append("NEO4J_URI is required when USE_NEO4J is enabled")
+                yield "NEO4J_URI is required when USE_NEO4J is enabled"
             if not cls.NEO4J_USERNAME:
-                errors.append("NEO4J_USERNAME is required when USE_NEO4J is enabled")
+                yield "NEO4J_USERNAME is required when USE_NEO4J is enabled"
             if not cls.NEO4J_PASSWORD:
-                errors.append("NEO4J_PASSWORD is required when USE_NEO4J is enabled")
+                yield "NEO4J_PASSWORD is required when USE_NEO4J is enabled"
         
         # Validate LlamaIndex configuration only if enabled
         if cls.USE_LLAMAINDEX:
             if not cls.LLAMACLOUD_API_KEY:
-                errors.append("LLAMACLOUD_API_KEY is required when USE_LLAMAINDEX is enabled")
+                yield "LLAMACLOUD_API_KEY is required when USE_LLAMAINDEX is enabled"
             if not cls.LLAMACLOUD_INDEX_NAME:
-                errors.append("LLAMACLOUD_INDEX_NAME is required when USE_LLAMAINDEX is enabled")
+                yield "LLAMACLOUD_INDEX_NAME is required when USE_LLAMAINDEX is enabled"
         
         # Validate Pinecone configuration only if enabled
         if cls.USE_PINECONE:
             if not cls.PINECONE_API_KEY:
-                errors.append("PINECONE_API_KEY is required when USE_PINECONE is enabled")
+                yield "PINECONE_API_KEY is required when USE_PINECONE is enabled"
             if not cls.PINECONE_INDEX_NAME:
-                errors.append("PINECONE_INDEX_NAME is required when USE_PINECONE is enabled")
+                yield "PINECONE_INDEX_NAME is required when USE_PINECONE is enabled"
         
         # Validate embedding provider settings
         if cls.EMBEDDING_PROVIDER == "openai" and not cls.OPENAI_API_KEY:
-            errors.append("OPENAI_API_KEY is required when EMBEDDING_PROVIDER is 'openai'")
+            yield "OPENAI_API_KEY is required when EMBEDDING_PROVIDER is 'openai'"
         
-        if cls.EMBEDDING_PROVIDER not in ["sentence-transformers", "ollama", "openai"]:
-            errors.append(
+        if cls.EMBEDDING_PROVIDER not in _VALID_EMBEDDING_PROVIDERS:
+            yield (
                 f"Invalid EMBEDDING_PROVIDER: {cls.EMBEDDING_PROVIDER}. "
                 "Must be 'sentence-transformers', 'ollama', or 'openai'"
             )
 
+        if cls.EMBEDDING_PRECISION not in _VALID_EMBEDDING_PRECISIONS:
+            yield (
+                f"Invalid EMBEDDING_PRECISION: {cls.EMBEDDING_PRECISION}. "
+                "Must be 'auto', 'fp32', 'fp16', or 'bf16'"
+            )
+
+        if cls.EMBEDDING_BACKEND not in _VALID_EMBEDDING_BACKENDS:
+            yield (
+                f"Invalid EMBEDDING_BACKEND: {cls.EMBEDDING_BACKEND}. "
+                "Must be 'torch', 'onnx', or 'openvino'"
+            )
+
+    @classmethod
+    def validate(cls, fail_fast: bool = False) -> bool:
+        """
+        Validate that required settings are present.
+
+        Args:
+            fail_fast: Stop at the first problem instead of collecting all of them
+
+        Returns:
+            True if the configuration is valid, False otherwise
+        """
+        if fail_fast:
+            error = next(cls._iter_errors(), None)
+            if error is not None:
+                logger.error("Configuration validation failed: %s", error)
+                return False
+            return True
+
+        errors = list(cls._iter_errors())
         if errors:
-            logger.error(f"Configuration validation failed: {', '.join(errors)}")
+            logger.error("Configuration validation failed: %s", ", ".join(errors))
             return False
 
         return True
@@ -182,22 +334,16 @@ class Settings:
     @classmethod
     def get_data_path(cls, *subpaths: str) -> Path:
         """Get a path within the data directory."""
-        return cls.DATA_DIR.joinpath(*subpaths)
+        # DATA_DIR is part of the cache key so overriding it is still honoured
+        return _data_path(cls.DATA_DIR, subpaths)
 
     @classmethod
     def ensure_data_directories(cls) -> None:
         """Ensure all required data directories exist."""
-        directories = [
-            "raw",
-            "processed",
-            "chunks",
-            "embeddings",
-            "hashes",
-            "manifests",
-        ]
-        for directory in directories:
+        for directory in _DATA_SUBDIRS:
+            # mkdir with exist_ok is a single syscall when the directory exists
             cls.get_data_path(directory).mkdir(parents=True, exist_ok=True)
-            logger.debug(f"Ensured directory exists: {cls.get_data_path(directory)}")
+        logger.debug("Ensured data directories exist under %s", cls.DATA_DIR)
     
     @classmethod
     def is_s3_configured(cls) -> bool:
@@ -224,7 +370,7 @@ class Settings:
             # Use S3 if configured, otherwise local
             return "s3" if cls.is_s3_configured() else "local"
         else:
-            logger.warning(f"Unknown STORAGE_MODE: {cls.STORAGE_MODE}, defaulting to local")
+            logger.warning("Unknown STORAGE_MODE: %s, defaulting to local", cls.STORAGE_MODE)
             return "local"
 
     def __repr__(self) -> str:
@@ -1,21 +1,27 @@
 """Scrapy item definitions."""
 
-import scrapy
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 
 
-class AmazonSellerItem(scrapy.Item):
-    """Item for scraped Amazon Seller help pages."""
+@dataclass
+class AmazonSellerItem:
+    """Item for scraped Amazon Seller help pages.
 
-    url = scrapy.Field()
-    title = scrapy.Field()
-    html_content = scrapy.Field()
-    text_content = scrapy.Field()
-    last_updated = scrapy.Field()
-    breadcrumbs = scrapy.Field()
-    related_links = scrapy.Field()
-    things_to_know = scrapy.Field()
-    things_to_do = scrapy.Field()
-    things_to_avoid = scrapy.Field()
-    metadata = scrapy.Field()
-    scraped_at = scrapy.Field()
+    A plain dataclass item (supported by Scrapy through ItemAdapter) so field
+    access is regular attribute access instead of ``scrapy.Item``'s dict and
+    Field lookups.
+    """
 
+    url: str = ""
+    title: str = ""
+    html_content: str = ""
+    text_content: str = ""
+    last_updated: Optional[str] = None
+    breadcrumbs: List[str] = field(default_factory=list)
+    related_links: List[str] = field(default_factory=list)
+    things_to_know: List[str] = field(default_factory=list)
+    things_to_do: List[str] = field(default_factory=list)
+    things_to_avoid: List[str] = field(default_factory=list)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    scraped_at: Optional[str] = None
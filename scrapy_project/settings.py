@@ -16,6 +16,7 @@ ITEM_PIPELINES = {
     "src.scraper.pipeline.StreamingStoragePipeline": 800,
 }
 
-# DEBUG: Print to confirm settings are being loaded
-print(f"[SCRAPY SETTINGS] Loaded with ITEM_PIPELINES={ITEM_PIPELINES}", file=sys.stderr)
+# DEBUG: Print to confirm settings are being loaded (set SCRAPY_SETTINGS_DEBUG=true)
+if os.getenv("SCRAPY_SETTINGS_DEBUG", "false").lower() == "true":
+    print(f"[SCRAPY SETTINGS] Loaded with ITEM_PIPELINES={ITEM_PIPELINES}", file=sys.stderr)
 
@@ -0,0 +1,87 @@
+"""Shared robots.txt lookup for the debug scripts, cached in memory and on disk."""
+
+import json
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple, Optional
+from urllib.robotparser import RobotFileParser
+
+import requests
+
+CACHE_DIR = Path.home() / ".cache" / "docs2vector" / "robots"
+
+# Cached copies older than this are fetched again
+CACHE_TTL_SECONDS = 24 * 60 * 60
+
+
+class RobotsTxt(NamedTuple):
+    """A fetched robots.txt and its parsed rules."""
+
+    status_code: int
+    text: str
+    parser: RobotFileParser
+    from_cache: bool
+
+
+def _parse(status_code: int, text: str) -> RobotFileParser:
+    """Build a parser the way RobotFileParser.read() treats the status, plus 5xx as disallow-all."""
+    rp = RobotFileParser()
+    # Server errors mean the rules are unknown, so nothing is assumed allowed
+    if status_code in (401, 403) or status_code >= 500:
+        rp.disallow_all = True
+    elif 400 <= status_code < 500:
+        rp.allow_all = True
+    else:
+        rp.parse(text.splitlines())
+    return rp
+
+
+@lru_cache(maxsize=32)
+def get_robots(host: str, session: Optional[requests.Session] = None) -> RobotsTxt:
+    """
+    Return robots.txt for a host, fetching it at most once per TTL.
+
+    Args:
+        host: Host name, e.g. 'sellercentral.amazon.com'
+        session: Session to fetch with (default: a one-off request)
+
+    Returns:
+        RobotsTxt with the raw text and a ready RobotFileParser
+
+    Raises:
+        requests.RequestException: If the file is not cached and the fetch fails
+    """
+    cache_file = CACHE_DIR / f"{host}.json"
+    try:
+        cached = json.loads(cache_file.read_text(encoding="utf-8"))
+        if time.time() - cached["fetched_at"] < CACHE_TTL_SECONDS:
+            return RobotsTxt(
+                cached["status_code"],
+                cached["text"],
+                _parse(cached["status_code"], cached["text"]),
+                True,
+            )
+    except (OSError, ValueError, KeyError):
+        pass
+
+    response = (session or requests).get(f"https://{host}/robots.txt", timeout=10)
+
+    # Server errors are transient, so only definitive answers are persisted
+    if response.status_code < 500:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(
+            json.dumps({
+                "fetched_at": time.time(),
+                "status_code": response.status_code,
+                "text": response.text,
+            }),
+            encoding="utf-8",
+        )
+
+    return RobotsTxt(
+        response.status_code,
+        response.text,
+        _parse(response.status_code, response.text),
+        False,
+    )
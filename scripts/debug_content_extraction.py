@@ -1,59 +1,180 @@
 #!/usr/bin/env python
 """Debug script to test content extraction selectors on Amazon Seller Help pages."""
 
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import NamedTuple, Optional, Tuple
 import requests
-from scrapy.http import HtmlResponse
+from requests.adapters import HTTPAdapter
+from lxml import etree
+from lxml import html as lxml_html
+from parsel.csstranslator import HTMLTranslator
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
 
-def test_selectors(url):
+TEST_URLS = [
+    "https://sellercentral.amazon.com/help/hub/reference/external/G2?locale=en-US",
+    "https://sellercentral.amazon.com/help/hub/reference/external/G200141480?locale=en-US",
+]
+
+# One keep-alive session for all fetches; the pool is sized so the
+# concurrent fetches in main() each get their own connection
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=len(TEST_URLS)))
+
+# Upper bound on how much of a page is read into memory
+MAX_PAGE_BYTES = 5 * 1024 * 1024
+
+# Phrases that suggest the page is behind a login wall
+AUTH_INDICATORS = (
+    "sign-in", "login", "authenticate", "access denied",
+    "unauthorized", "session expired",
+)
+
+# One case-insensitive pass over the raw page bytes instead of a substring
+# scan per indicator (and no decoded or lowercased copy of the whole page);
+# the indicators are ASCII, so bytes IGNORECASE matching is exact
+_AUTH_RE = re.compile(
+    b"|".join(re.escape(ind.encode('ascii')) for ind in AUTH_INDICATORS), re.IGNORECASE
+)
+
+_CSS = HTMLTranslator()
+
+
+def _css(selector):
+    """Compile a Scrapy-style CSS selector (``::text``/``::attr()`` included) to XPath."""
+    return etree.XPath(_CSS.css_to_xpath(selector))
+
+
+# Selectors are compiled once at import and evaluated against a single parsed tree
+SELECTORS_TO_TEST = {
+    "article tag": "article",
+    "article::text": "article::text",
+    "article *::text": "article *::text",
+    ".help-content": ".help-content",
+    ".help-content::text": ".help-content *::text",
+    "main": "main",
+    "main *::text": "main *::text",
+    ".content": ".content",
+    "#content": "#content",
+    "[role='main']": "[role='main']",
+    "h1": "h1::text",
+    "all p tags": "p::text",
+    "body text (all)": "body *::text",
+}
+
+# Descendant-text selectors are answered per outermost root element, each
+# root's "*::text" nodes collected once, instead of a whole-document
+# "*::text" traversal per selector
+_TEXT_ROOTS = {
+    "article *::text": _css("article"),
+    ".help-content::text": _css(".help-content"),
+    "main *::text": _css("main"),
+    "body text (all)": _css("body"),
+}
+_COMPILED_SELECTORS = {
+    name: _css(selector)
+    for name, selector in SELECTORS_TO_TEST.items()
+    if name not in _TEXT_ROOTS
+}
+
+_TITLE_SELECTORS = {
+    "h1::text": _css("h1::text"),
+    ".title::text": _css(".title::text"),
+    "title tag": etree.XPath("//title/text()"),
+    "[role='heading']": _css("[role='heading']::text"),
+}
+
+_HELP_LINKS = _css("a[href*='/help/']::attr(href)")
+
+
+# "<root> *::text" relative to one root; HTMLTranslator compiles it to every
+# text node under the root (comments excluded), which is what this matches
+_DESCENDANT_TEXT = etree.XPath("descendant-or-self::text()")
+
+
+def _outermost(roots):
+    """Drop roots nested inside another root, so no text node is counted twice."""
+    found = set(roots)
+    return [root for root in roots if not any(a in found for a in root.iterancestors())]
+
+
+def _text_nodes(element, cache):
+    """Return the "*::text" nodes under ``element``, collecting each element only once."""
+    nodes = cache.get(element)
+    if nodes is None:
+        nodes = cache[element] = _DESCENDANT_TEXT(element)
+    return nodes
+
+
+def _as_text(result):
+    """Return a selector result as a string (text nodes as-is, elements as their HTML)."""
+    if isinstance(result, str):
+        return str(result)
+    return etree.tostring(result, encoding="unicode", method="html", with_tail=False)
+
+
+class FetchedPage(NamedTuple):
+    """Raw page body plus the response details reported in the statistics."""
+
+    body: bytes
+    status_code: int
+    content_type: str
+
+
+def fetch_page(url) -> Tuple[Optional[FetchedPage], Optional[Exception]]:
+    """Fetch a page, returning ``(page, None)`` or ``(None, error)``."""
+    # Read at most MAX_PAGE_BYTES straight off the socket
+    try:
+        with SESSION.get(url, timeout=10, stream=True) as response:
+            response.raise_for_status()
+            body = response.raw.read(MAX_PAGE_BYTES, decode_content=True)
+            content_type = response.headers.get('Content-Type', 'Unknown')
+            return FetchedPage(body, response.status_code, content_type), None
+    except Exception as e:
+        return None, e
+
+
+def test_selectors(url, page=None, error=None):
     """Test various CSS selectors on a URL to find the right ones."""
     print(f"🔍 Testing selectors on: {url}\n")
     
-    # Fetch the page
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    }
-    
-    try:
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-    except Exception as e:
-        print(f"❌ Error fetching page: {e}")
+    if page is None and error is None:
+        page, error = fetch_page(url)
+    if error is not None:
+        print(f"❌ Error fetching page: {error}")
         return
     
-    # Create Scrapy response for testing
-    scrapy_response = HtmlResponse(
-        url=url,
-        body=response.content,
-        encoding='utf-8'
+    body = page.body
+    
+    # Parse once; every selector below runs against this tree
+    tree = lxml_html.document_fromstring(
+        body, parser=lxml_html.HTMLParser(encoding='utf-8')
     )
     
-    # Test different selectors
-    selectors_to_test = {
-        "article tag": "article",
-        "article::text": "article::text",
-        "article *::text": "article *::text",
-        ".help-content": ".help-content",
-        ".help-content::text": ".help-content *::text",
-        "main": "main",
-        "main *::text": "main *::text",
-        ".content": ".content",
-        "#content": "#content",
-        "[role='main']": "[role='main']",
-        "h1": "h1::text",
-        "all p tags": "p::text",
-        "body text (all)": "body *::text",
-    }
+    # "*::text" nodes per root element
+    text_cache = {}
     
+    # Test different selectors
     print("=" * 80)
-    for name, selector in selectors_to_test.items():
-        results = scrapy_response.css(selector).getall()
+    for name, selector in SELECTORS_TO_TEST.items():
+        if name in _TEXT_ROOTS:
+            results = [
+                text
+                for root in _outermost(_TEXT_ROOTS[name](tree))
+                for text in _text_nodes(root, text_cache)
+            ]
+        else:
+            results = _COMPILED_SELECTORS[name](tree)
         count = len(results)
         
         if count > 0:
@@ -63,6 +184,7 @@ def test_selectors(url):
             # Show first few results
             preview = results[:3] if count > 3 else results
             for i, result in enumerate(preview, 1):
+                result = _as_text(result)
                 # Truncate long results
                 preview_text = result[:100] + "..." if len(result) > 100 else result
                 # Clean whitespace
@@ -80,14 +202,9 @@ def test_selectors(url):
     # Test title extraction
     print("\n\n📌 Title Extraction:")
     print("=" * 80)
-    title_selectors = {
-        "h1::text": scrapy_response.css("h1::text").get(),
-        ".title::text": scrapy_response.css(".title::text").get(),
-        "title tag": scrapy_response.xpath("//title/text()").get(),
-        "[role='heading']": scrapy_response.css("[role='heading']::text").get(),
-    }
-    
-    for selector, result in title_selectors.items():
+    for selector, compiled in _TITLE_SELECTORS.items():
+        matches = compiled(tree)
+        result = str(matches[0]) if matches else None
         if result:
             print(f"✅ {selector}: {result.strip()}")
         else:
@@ -96,13 +213,8 @@ def test_selectors(url):
     # Check for authentication/login requirements
     print("\n\n🔐 Authentication Check:")
     print("=" * 80)
-    auth_indicators = [
-        "sign-in", "login", "authenticate", "access denied",
-        "unauthorized", "session expired"
-    ]
-    
-    page_text_lower = scrapy_response.text.lower()
-    found_indicators = [ind for ind in auth_indicators if ind in page_text_lower]
+    matched = {match.lower().decode('ascii') for match in _AUTH_RE.findall(body)}
+    found_indicators = [ind for ind in AUTH_INDICATORS if ind in matched]
     
     if found_indicators:
         print(f"⚠️  Possible authentication required!")
@@ -113,20 +225,26 @@ def test_selectors(url):
     # Check page size
     print(f"\n📊 Page Statistics:")
     print("=" * 80)
-    print(f"   HTML size: {len(response.content)} bytes")
-    print(f"   Status code: {response.status_code}")
-    print(f"   Content-Type: {response.headers.get('Content-Type', 'Unknown')}")
+    print(f"   HTML size: {len(body)} bytes")
+    print(f"   Status code: {page.status_code}")
+    print(f"   Content-Type: {page.content_type}")
     
     # Extract all links
     print(f"\n🔗 Internal Help Links:")
     print("=" * 80)
-    help_links = scrapy_response.css("a[href*='/help/']::attr(href)").getall()
+    help_links = [str(link) for link in _HELP_LINKS(tree)]
     print(f"   Found {len(help_links)} help links")
     
     if help_links:
-        # Show unique G-number links
-        g_links = [link for link in help_links if '/external/G' in link]
-        unique_g_links = list(set(g_links))[:5]
+        # Show unique G-number links (stop once we have five)
+        unique_g_links = []
+        seen = set()
+        for link in help_links:
+            if '/external/G' in link and link not in seen:
+                seen.add(link)
+                unique_g_links.append(link)
+                if len(unique_g_links) == 5:
+                    break
         print(f"   Sample G-number links:")
         for link in unique_g_links:
             print(f"      - {link}")
@@ -134,20 +252,14 @@ def test_selectors(url):
 
 def main():
     """Run selector tests on sample URLs."""
-    test_urls = [
-        "https://sellercentral.amazon.com/help/hub/reference/external/G2?locale=en-US",
-        "https://sellercentral.amazon.com/help/hub/reference/external/G200141480?locale=en-US",
-    ]
-    
-    for i, url in enumerate(test_urls, 1):
-        if i > 1:
-            print("\n\n" + "=" * 100 + "\n")
-        test_selectors(url)
+    # Fetch all pages concurrently, then analyse them in order
+    with ThreadPoolExecutor(max_workers=len(TEST_URLS)) as executor:
+        fetched = executor.map(fetch_page, TEST_URLS)
         
-        if i < len(test_urls):
-            print("\n⏸️  Pausing between requests...\n")
-            import time
-            time.sleep(2)
+        for i, (url, (page, error)) in enumerate(zip(TEST_URLS, fetched), 1):
+            if i > 1:
+                print("\n\n" + "=" * 100 + "\n")
+            test_selectors(url, page, error)
 
 
 if __name__ == "__main__":
@@ -1,37 +1,119 @@
 #!/usr/bin/env python
 """Debug script to test LinkExtractor patterns and robots.txt compliance."""
 
+import re
 import sys
 from pathlib import Path
+from urllib.parse import urljoin
 import requests
-from scrapy.http import HtmlResponse
-from scrapy.linkextractors import LinkExtractor
-from urllib.robotparser import RobotFileParser
+from requests.adapters import HTTPAdapter
+from lxml import etree, html as lxml_html
+from lxml.cssselect import CSSSelector
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from scripts._robots_cache import get_robots
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+# One keep-alive session so every fetch reuses the pooled HTTPS connection
+SESSION = requests.Session()
+SESSION.headers.update({'User-Agent': USER_AGENT})
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+# Same allow/deny patterns as the spider's LinkExtractor rule, applied
+# directly to the lxml tree instead of going through a Scrapy response
+ALLOW_PATTERN = r"/help/hub/reference/external/G\d+"
+DENY_PATTERNS = [
+    r"/ap/",
+    r"/gp/sign-in",
+    r"/logout",
+]
+ALLOW_RE = re.compile(ALLOW_PATTERN)
+DENY_RE = re.compile("|".join(DENY_PATTERNS))
+
+
+def _compile_hyperscan_db():
+    """Compile all patterns into one Hyperscan database (id 0 = allow)."""
+    patterns = [ALLOW_PATTERN, *DENY_PATTERNS]
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[pattern.encode() for pattern in patterns],
+        ids=list(range(len(patterns))),
+        elements=len(patterns),
+        flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(patterns),
+    )
+    return db
+
+
+# With the optional 'hyperscan' package, every URL is checked against all
+# patterns in a single DFA scan instead of separate regex searches
+HYPERSCAN_DB = _compile_hyperscan_db() if hyperscan is not None else None
+
+
+def _collect_match(pattern_id, start, end, flags, matched):
+    """Hyperscan match callback: record which pattern matched."""
+    matched.add(pattern_id)
+
+
+def is_followed(url):
+    """Whether the spider's rule would follow this absolute URL."""
+    if HYPERSCAN_DB is None:
+        return ALLOW_RE.search(url) is not None and DENY_RE.search(url) is None
+    
+    matched = set()
+    HYPERSCAN_DB.scan(url.encode(), match_event_handler=_collect_match, context=matched)
+    return matched == {0}
+
+# Alternative allow-patterns checked when the main extractor finds nothing
+ALTERNATIVE_PATTERNS = [
+    (re.compile(r"/help/"), "Any help page"),
+    (re.compile(r"/help/hub/reference/"), "Help hub reference"),
+    (re.compile(r"/help/hub/reference/.*G\d+"), "Help pages with G-numbers (any position)"),
+    (re.compile(r"external/G\d+"), "External G-number pages"),
+]
+
+# Compiled once; the fallback collects every href in a single DOM walk
+ANCHOR_SELECTOR = CSSSelector("a[href]")
+
+# Every authentication indicator in one compiled XPath union; matches are
+# classified by tag afterwards
+AUTH_XPATH = etree.XPath(
+    "//form[contains(@action, 'sign-in') or contains(@action, 'login')]"
+    " | //input[@type='password']"
+    " | //button[contains(., 'Sign')]"
+    " | //a[contains(., 'Sign')]"
+)
+AUTH_INDICATORS = {
+    "form": "login form",
+    "input": "password field",
+    "button": "sign-in button",
+    "a": "sign-in button",
+}
+
 
 def test_robots_txt():
     """Check if robots.txt allows crawling."""
     print("🤖 Testing robots.txt compliance\n")
     print("=" * 80)
     
-    robots_url = "https://sellercentral.amazon.com/robots.txt"
-    user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-    
     try:
-        response = requests.get(robots_url, timeout=10)
-        print(f"✅ robots.txt fetched successfully\n")
+        robots = get_robots("sellercentral.amazon.com", SESSION)
+        source = "from cache" if robots.from_cache else "successfully"
+        print(f"✅ robots.txt fetched {source}\n")
         print("Content preview:")
         print("-" * 80)
-        print(response.text[:500])
+        print(robots.text[:500])
         print("-" * 80)
         
-        # Parse robots.txt
-        rp = RobotFileParser()
-        rp.parse(response.text.splitlines())
+        rp = robots.parser
         
         # Test specific paths
         test_paths = [
@@ -43,7 +125,7 @@ def test_robots_txt():
         print("\n\nPath accessibility check:")
         print("=" * 80)
         for path in test_paths:
-            can_fetch = rp.can_fetch(user_agent, path)
+            can_fetch = rp.can_fetch(USER_AGENT, path)
             status = "✅ ALLOWED" if can_fetch else "❌ BLOCKED"
             print(f"{status}: {path}")
             
@@ -51,53 +133,47 @@ def test_robots_txt():
         print(f"❌ Error checking robots.txt: {e}")
 
 
-def test_link_extractor(url):
-    """Test LinkExtractor to see what links it finds."""
-    print(f"\n\n🔗 Testing LinkExtractor on: {url}\n")
+def extract_links(root, base_url):
+    """
+    Extract unique (url, text) links the spider's LinkExtractor rule would follow.
+
+    Args:
+        root: Parsed lxml document
+        base_url: URL the document was fetched from
+
+    Returns:
+        List of (absolute_url, link_text) tuples in document order
+    """
+    seen = set()
+    links = []
+    for a in root.iter('a'):
+        href = a.get('href')
+        if not href:
+            continue
+        url = urljoin(base_url, href.strip())
+        if url in seen or not is_followed(url):
+            continue
+        seen.add(url)
+        links.append((url, a.text_content().strip()))
+    return links
+
+
+def test_link_extractor(root, base_url):
+    """Test the spider's link patterns to see what links they find."""
+    print(f"\n\n🔗 Testing LinkExtractor on: {base_url}\n")
     print("=" * 80)
     
-    # Fetch the page
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    }
-    
-    try:
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-    except Exception as e:
-        print(f"❌ Error fetching page: {e}")
-        return
-    
-    # Create Scrapy response
-    scrapy_response = HtmlResponse(
-        url=url,
-        body=response.content,
-        encoding='utf-8'
-    )
-    
-    # Test the actual LinkExtractor configuration from spider
-    link_extractor = LinkExtractor(
-        allow=r"/help/hub/reference/external/G\d+",
-        deny=[
-            r"/ap/",
-            r"/gp/sign-in",
-            r"/logout",
-        ],
-        unique=True,
-    )
-    
-    # Extract links
-    extracted_links = link_extractor.extract_links(scrapy_response)
+    extracted_links = extract_links(root, base_url)
     
     print(f"✅ Found {len(extracted_links)} matching links\n")
     
     if extracted_links:
         print("Extracted links:")
         print("-" * 80)
-        for i, link in enumerate(extracted_links[:20], 1):  # Show first 20
-            print(f"{i:2d}. {link.url}")
-            if link.text:
-                text_preview = link.text[:60] + "..." if len(link.text) > 60 else link.text
+        for i, (url, text) in enumerate(extracted_links[:20], 1):  # Show first 20
+            print(f"{i:2d}. {url}")
+            if text:
+                text_preview = text[:60] + "..." if len(text) > 60 else text
                 print(f"    Text: {text_preview}")
         
         if len(extracted_links) > 20:
@@ -107,8 +183,11 @@ def test_link_extractor(url):
         print("\nDebugging info:")
         print("-" * 80)
         
+        # Collect every link once, straight from the lxml tree
+        all_hrefs = [a.get('href') for a in ANCHOR_SELECTOR(root)]
+        
         # Show all help links
-        all_help_links = scrapy_response.css("a[href*='/help/']::attr(href)").getall()
+        all_help_links = [href for href in all_hrefs if '/help/' in href]
         print(f"Total links with '/help/': {len(all_help_links)}")
         
         if all_help_links:
@@ -116,35 +195,22 @@ def test_link_extractor(url):
             for link in all_help_links[:10]:
                 print(f"  - {link}")
         
-        # Test simpler patterns
+        # Test simpler patterns against the same set of (absolute, unique) URLs
         print("\n\nTesting alternative patterns:")
         print("-" * 80)
         
-        alternative_patterns = [
-            (r"/help/", "Any help page"),
-            (r"/help/hub/reference/", "Help hub reference"),
-            (r"/help/hub/reference/.*G\d+", "Help pages with G-numbers (any position)"),
-            (r"external/G\d+", "External G-number pages"),
-        ]
-        
-        for pattern, description in alternative_patterns:
-            extractor = LinkExtractor(allow=pattern, unique=True)
-            links = extractor.extract_links(scrapy_response)
-            print(f"  {description}: '{pattern}' -> {len(links)} links")
+        absolute_urls = {urljoin(base_url, href.strip()) for href in all_hrefs}
+        for regex, description in ALTERNATIVE_PATTERNS:
+            count = sum(1 for link in absolute_urls if regex.search(link))
+            print(f"  {description}: '{regex.pattern}' -> {count} links")
 
 
-def check_page_structure(url):
+def check_page_structure(response, root):
     """Check if the page requires authentication or has special structure."""
-    print(f"\n\n📄 Checking page structure: {url}\n")
+    print(f"\n\n📄 Checking page structure: {response.url}\n")
     print("=" * 80)
     
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-    }
-    
     try:
-        response = requests.get(url, headers=headers, timeout=10)
-        
         # Check for redirects
         if response.history:
             print("⚠️  Page was redirected:")
@@ -158,25 +224,16 @@ def check_page_structure(url):
         content_type = response.headers.get('Content-Type', 'Unknown')
         print(f"\nContent-Type: {content_type}")
         
-        # Check for common authentication indicators in HTML
-        scrapy_response = HtmlResponse(
-            url=response.url,
-            body=response.content,
-            encoding='utf-8'
-        )
-        
         # Look for login forms or auth requirements
-        login_indicators = {
-            "login form": scrapy_response.css("form[action*='sign-in'], form[action*='login']").getall(),
-            "password field": scrapy_response.css("input[type='password']").getall(),
-            "sign-in button": scrapy_response.css("button:contains('Sign'), a:contains('Sign')").getall(),
-        }
+        login_indicators = dict.fromkeys(AUTH_INDICATORS.values(), 0)
+        for element in AUTH_XPATH(root):
+            login_indicators[AUTH_INDICATORS[element.tag]] += 1
         
         print("\n🔐 Authentication indicators:")
         print("-" * 80)
-        for indicator, elements in login_indicators.items():
-            if elements:
-                print(f"  ⚠️  Found {len(elements)} {indicator}(s)")
+        for indicator, count in login_indicators.items():
+            if count:
+                print(f"  ⚠️  Found {count} {indicator}(s)")
             else:
                 print(f"  ✅ No {indicator}")
                 
@@ -198,8 +255,25 @@ def main():
     ]
     
     for url in test_urls:
-        check_page_structure(url)
-        test_link_extractor(url)
+        # Fetch and parse each page once; both checks share the result
+        try:
+            response = SESSION.get(url, timeout=10)
+        except Exception as e:
+            print(f"❌ Error fetching page: {e}")
+            continue
+        
+        try:
+            root = lxml_html.document_fromstring(response.content, base_url=response.url)
+        except Exception as e:
+            print(f"❌ Error parsing page: {e}")
+            continue
+        
+        check_page_structure(response, root)
+        
+        if response.ok:
+            test_link_extractor(root, response.url)
+        else:
+            print(f"❌ Error fetching page: HTTP {response.status_code}")
     
     print("\n\n" + "=" * 100)
     print("✅ Debug complete!")
@@ -4,12 +4,23 @@
 import sys
 from pathlib import Path
 import requests
-from parsel import Selector
+from requests.adapters import HTTPAdapter
+from selectolax.lexbor import LexborHTMLParser
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from scripts._robots_cache import get_robots
+
+# One keep-alive session so the page and robots.txt fetches share a connection
+SESSION = requests.Session()
+SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+})
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
+
 def test_amazon_selectors():
     """Test CSS selectors on a real Amazon Seller Central page."""
 
@@ -21,20 +32,20 @@ def test_amazon_selectors():
     print(f"📄 Test URL: {test_url}")
     print()
 
-    # Fetch the page
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-    }
-
     try:
         print("⏳ Fetching page...")
-        response = requests.get(test_url, headers=headers, timeout=10)
+        response = SESSION.get(test_url, timeout=10)
         print(f"✅ Status Code: {response.status_code}")
-        print(f"📊 Content Length: {len(response.text)} characters")
+        # Byte-level checks and the saved copy use the raw body
+        content = response.content
+        print(f"📊 Content Length: {len(content)} bytes")
         print()
 
-        # Parse with Scrapy's selector
-        selector = Selector(text=response.text)
+        # Parse once with Lexbor and reuse the tree for every selector below.
+        # Lexbor decodes bytes as UTF-8 regardless of the page's charset, so
+        # it gets the text decoded by requests using the response's charset
+        text = response.text
+        tree = LexborHTMLParser(text)
 
         # Test different selectors
         print("=" * 60)
@@ -44,13 +55,15 @@ def test_amazon_selectors():
 
         # Test 1: Page title
         print("1️⃣  Testing h1::text")
-        h1_result = selector.css("h1::text").get()
+        h1_node = tree.css_first("h1")
+        h1_result = h1_node.text(deep=False) if h1_node else None
         print(f"   Result: {h1_result}")
         print()
 
         # Test 2: Article tag
         print("2️⃣  Testing article tag")
-        article_result = selector.css("article").get()
+        article_node = tree.css_first("article")
+        article_result = article_node.html if article_node else None
         if article_result:
             print(f"   Found! Length: {len(article_result)} chars")
             print(f"   Preview: {article_result[:200]}...")
@@ -60,7 +73,8 @@ def test_amazon_selectors():
 
         # Test 3: Content div
         print("3️⃣  Testing .help-content class")
-        help_content = selector.css(".help-content").get()
+        help_content_node = tree.css_first(".help-content")
+        help_content = help_content_node.html if help_content_node else None
         if help_content:
             print(f"   Found! Length: {len(help_content)} chars")
         else:
@@ -69,7 +83,7 @@ def test_amazon_selectors():
 
         # Test 4: Paragraphs
         print("4️⃣  Testing p tags")
-        paragraphs = selector.css("p::text").getall()
+        paragraphs = [p.text(deep=False) for p in tree.css("p")]
         print(f"   Found {len(paragraphs)} paragraphs")
         if paragraphs:
             print(f"   First paragraph: {paragraphs[0][:100]}...")
@@ -77,18 +91,19 @@ def test_amazon_selectors():
 
         # Test 5: All text content
         print("5️⃣  Testing all text extraction")
-        all_text = selector.css("body::text").getall()
-        print(f"   Found {len(all_text)} text nodes")
-        total_chars = sum(len(t.strip()) for t in all_text)
-        print(f"   Total text: {total_chars} characters")
+        # Every descendant text node of <body>, stripped and joined in one pass
+        body = tree.body
+        body_text = body.text(deep=True, strip=True) if body else ""
+        print(f"   Total text: {len(body_text)} characters")
         print()
 
         # Test 6: Check for login/redirect
         print("6️⃣  Checking for login requirement")
+        head = content[:1000].lower()
         login_indicators = [
-            selector.css("input[type='password']").get(),
-            "sign in" in response.text.lower()[:1000],
-            "login" in response.text.lower()[:1000],
+            tree.css_first("input[type='password']") is not None,
+            b"sign in" in head,
+            b"login" in head,
         ]
 
         if any(login_indicators):
@@ -100,11 +115,11 @@ def test_amazon_selectors():
 
         # Test 7: Check robots.txt compliance
         print("7️⃣  Testing robots.txt")
-        robots_url = "https://sellercentral.amazon.com/robots.txt"
-        robots_response = requests.get(robots_url, timeout=10)
-        print(f"   Status: {robots_response.status_code}")
+        robots = get_robots("sellercentral.amazon.com", SESSION)
+        cached = " (cached)" if robots.from_cache else ""
+        print(f"   Status: {robots.status_code}{cached}")
 
-        if "Disallow: /help" in robots_response.text:
+        if "Disallow: /help" in robots.text:
             print("   ⚠️  WARNING: /help might be disallowed in robots.txt")
         else:
             print("   ✅ /help appears to be allowed")
@@ -114,8 +129,8 @@ def test_amazon_selectors():
         output_file = project_root / "data" / "test_scrape" / "debug_page.html"
         output_file.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(response.text)
+        with open(output_file, 'wb') as f:
+            f.write(content)
 
         print("=" * 60)
         print("💾 SAVED HTML FOR INSPECTION")
@@ -128,7 +143,7 @@ def test_amazon_selectors():
         print("=" * 60)
         print("📋 HTML STRUCTURE PREVIEW (first 2000 chars)")
         print("=" * 60)
-        print(response.text[:2000])
+        print(text[:2000])
         print("...")
         print()
 
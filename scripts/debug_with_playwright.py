@@ -3,6 +3,7 @@
 
 import sys
 import asyncio
+import argparse
 from pathlib import Path
 from playwright.async_api import async_playwright
 
@@ -10,181 +11,274 @@ from playwright.async_api import async_playwright
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+TEST_URLS = [
+    "https://sellercentral.amazon.com/help/hub/reference/external/G2?locale=en-US",
+]
 
-async def test_with_playwright(url):
-    """Test content extraction using Playwright with JavaScript rendering."""
-    print(f"🎭 Testing with Playwright on: {url}\n")
-    print("=" * 80)
+# Pages rendered at the same time in the shared browser
+MAX_CONCURRENT_PAGES = 4
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# Browser profile kept between runs so HTTP cache, cookies and TLS sessions
+# stay warm for repeated debugging of the same host
+DEFAULT_USER_DATA_DIR = Path.home() / ".cache" / "docs2vector" / "pw-profile"
+
+# Subresources the report never looks at. Stylesheets are still loaded since
+# the screenshot and innerText depend on them.
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+
+async def _block_unneeded(route):
+    """Abort requests for resource types listed in BLOCKED_RESOURCE_TYPES."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+SELECTORS = {
+    "Title (h1)": "h1",
+    "Article content": "article",
+    "Main content": "main",
+    "All paragraphs": "p",
+    "All headings": "h1, h2, h3, h4, h5, h6",
+    "Links": "a[href*='/help/']",
+}
+
+# Runs every selector inside the page and returns {name: {count, previews}},
+# so the whole table costs one round-trip instead of one per element
+SELECTOR_SUMMARY_JS = """
+(selectors) => Object.fromEntries(Object.entries(selectors).map(([name, selector]) => {
+    const elements = [...document.querySelectorAll(selector)];
+    return [name, {
+        count: elements.length,
+        previews: elements.slice(0, 3)
+            .map(e => (e.textContent || '').trim().replace(/\\s+/g, ' ').slice(0, 100)),
+    }];
+}))
+"""
+
+# Help links from the first 20 '/help/' anchors that match the G-number
+# pattern, plus the first few hrefs of any kind as a fallback
+HELP_LINKS_JS = """
+() => {
+    const links = [...document.querySelectorAll("a[href*='/help/']")];
+    return {
+        total: links.length,
+        sample: links.slice(0, 5).map(a => a.getAttribute('href')),
+        matching: links.slice(0, 20)
+            .map(a => ({href: a.getAttribute('href'), text: a.textContent}))
+            .filter(l => l.href && l.href.includes('/help/hub/reference/external/G')),
+    };
+}
+"""
+
+# Text of the first <article>, falling back to the first <main>
+MAIN_CONTENT_JS = """
+() => {
+    const el = document.querySelector('article') || document.querySelector('main');
+    return el ? {tag: el.tagName.toLowerCase(), text: el.textContent || ''} : null;
+}
+"""
+
+
+def _screenshot_path(index):
+    """Screenshot location for the index-th test URL."""
+    suffix = "" if index == 1 else f"_{index}"
+    return project_root / "scripts" / f"debug_screenshot{suffix}.png"
+
+
+async def test_with_playwright(context, url, screenshot_path):
+    """
+    Test content extraction using Playwright with JavaScript rendering.
+
+    Opens its own page in the shared context and returns the report as a list
+    of lines so concurrent runs don't interleave their output.
+    """
+    lines = []
+    log = lines.append
     
-    async with async_playwright() as p:
-        # Launch browser
-        print("🚀 Launching Chromium browser...")
-        browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
-        
-        # Set user agent
-        await page.set_extra_http_headers({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-        
-        # Navigate to page
-        print(f"📄 Loading page: {url}")
+    log(f"🎭 Testing with Playwright on: {url}\n")
+    log("=" * 80)
+    
+    page = await context.new_page()
+    try:
+        # Navigate to page; only the DOM is needed, not an idle network
+        log(f"📄 Loading page: {url}")
         try:
-            response = await page.goto(url, wait_until='networkidle', timeout=30000)
-            print(f"✅ Page loaded! Status: {response.status}")
+            response = await page.goto(url, wait_until='domcontentloaded', timeout=15000)
+            log(f"✅ Page loaded! Status: {response.status}")
         except Exception as e:
-            print(f"❌ Error loading page: {e}")
-            await browser.close()
-            return
+            log(f"❌ Error loading page: {e}")
+            return lines
         
-        # Wait for content to load
-        print("⏳ Waiting for content to render...")
+        # Wait for the content we actually inspect to be attached
+        log("⏳ Waiting for content to render...")
         try:
-            await page.wait_for_selector('article, main, .content, body', timeout=10000)
-            print("✅ Content selector found!")
+            await page.wait_for_selector('article, main, h1', state='attached', timeout=8000)
+            log("✅ Content selector found!")
         except Exception as e:
-            print(f"⚠️  Timeout waiting for selector: {e}")
+            log(f"⚠️  Timeout waiting for selector: {e}")
         
         # Extract content using various selectors
-        print("\n\n📊 Testing Content Extraction:")
-        print("=" * 80)
+        log("\n\n📊 Testing Content Extraction:")
+        log("=" * 80)
         
-        selectors = {
-            "Title (h1)": "h1",
-            "Article content": "article",
-            "Main content": "main",
-            "All paragraphs": "p",
-            "All headings": "h1, h2, h3, h4, h5, h6",
-            "Links": "a[href*='/help/']",
-        }
+        summary = await page.evaluate(SELECTOR_SUMMARY_JS, SELECTORS)
         
-        results = {}
-        for name, selector in selectors.items():
-            elements = await page.query_selector_all(selector)
-            count = len(elements)
-            results[name] = count
+        for name, selector in SELECTORS.items():
+            count = summary[name]["count"]
             
             if count > 0:
-                print(f"\n✅ {name}: '{selector}' - Found {count} elements")
+                log(f"\n✅ {name}: '{selector}' - Found {count} elements")
                 
-                # Get text content for first few elements
-                for i, elem in enumerate(elements[:3], 1):
-                    try:
-                        text = await elem.text_content()
-                        if text and text.strip():
-                            preview = text.strip()[:100]
-                            preview = " ".join(preview.split())
-                            print(f"   [{i}] {preview}...")
-                    except:
-                        pass
+                # Text content for the first few elements
+                for i, preview in enumerate(summary[name]["previews"], 1):
+                    if preview:
+                        log(f"   [{i}] {preview}...")
                 
                 if count > 3:
-                    print(f"   ... and {count - 3} more")
+                    log(f"   ... and {count - 3} more")
             else:
-                print(f"❌ {name}: '{selector}' - No matches")
+                log(f"❌ {name}: '{selector}' - No matches")
         
         # Extract full article content
-        print("\n\n📝 Full Article Content:")
-        print("=" * 80)
+        log("\n\n📝 Full Article Content:")
+        log("=" * 80)
         
         try:
-            # Try article tag first
-            article = await page.query_selector("article")
-            if article:
-                article_text = await article.text_content()
-                words = len(article_text.split())
-                print(f"✅ Article found! Word count: {words}")
-                print(f"\nFirst 500 characters:")
-                print("-" * 80)
-                print(article_text.strip()[:500])
-                print("-" * 80)
+            content = await page.evaluate(MAIN_CONTENT_JS)
+            if content:
+                label = "Article" if content["tag"] == "article" else "Main content"
+                words = len(content["text"].split())
+                log(f"✅ {label} found! Word count: {words}")
+                log(f"\nFirst 500 characters:")
+                log("-" * 80)
+                log(content["text"].strip()[:500])
+                log("-" * 80)
             else:
-                # Try main tag
-                main = await page.query_selector("main")
-                if main:
-                    main_text = await main.text_content()
-                    words = len(main_text.split())
-                    print(f"✅ Main content found! Word count: {words}")
-                    print(f"\nFirst 500 characters:")
-                    print("-" * 80)
-                    print(main_text.strip()[:500])
-                    print("-" * 80)
-                else:
-                    print("⚠️  No article or main content found")
+                log("⚠️  No article or main content found")
         except Exception as e:
-            print(f"❌ Error extracting content: {e}")
+            log(f"❌ Error extracting content: {e}")
         
         # Extract links
-        print("\n\n🔗 Help Links Found:")
-        print("=" * 80)
+        log("\n\n🔗 Help Links Found:")
+        log("=" * 80)
         
         try:
-            links = await page.query_selector_all("a[href*='/help/']")
-            help_links = []
-            
-            for link in links[:20]:  # First 20 links
-                href = await link.get_attribute('href')
-                text = await link.text_content()
-                if href and '/help/hub/reference/external/G' in href:
-                    help_links.append((href, text))
+            link_summary = await page.evaluate(HELP_LINKS_JS)
+            help_links = [(link["href"], link["text"]) for link in link_summary["matching"]]
             
             if help_links:
-                print(f"✅ Found {len(help_links)} help links matching pattern")
-                print("\nSample links:")
+                log(f"✅ Found {len(help_links)} help links matching pattern")
+                log("\nSample links:")
                 for href, text in help_links[:10]:
                     text_preview = text.strip()[:60] if text else "No text"
-                    print(f"  - {href}")
-                    print(f"    Text: {text_preview}")
+                    log(f"  - {href}")
+                    log(f"    Text: {text_preview}")
             else:
-                print("⚠️  No help links matching /help/hub/reference/external/G* pattern")
+                log("⚠️  No help links matching /help/hub/reference/external/G* pattern")
                 
                 # Show any help links found
-                all_help_links = await page.query_selector_all("a[href*='/help/']")
-                if all_help_links:
-                    print(f"\n   Found {len(all_help_links)} general help links")
-                    for link in all_help_links[:5]:
-                        href = await link.get_attribute('href')
-                        print(f"     - {href}")
+                if link_summary["total"]:
+                    log(f"\n   Found {link_summary['total']} general help links")
+                    for href in link_summary["sample"]:
+                        log(f"     - {href}")
         except Exception as e:
-            print(f"❌ Error extracting links: {e}")
+            log(f"❌ Error extracting links: {e}")
         
         # Take a screenshot for debugging
-        screenshot_path = project_root / "scripts" / "debug_screenshot.png"
         await page.screenshot(path=str(screenshot_path))
-        print(f"\n📸 Screenshot saved to: {screenshot_path}")
+        log(f"\n📸 Screenshot saved to: {screenshot_path}")
         
         # Get page HTML
         html_content = await page.content()
-        print(f"\n📄 Page HTML size: {len(html_content)} bytes")
+        log(f"\n📄 Page HTML size: {len(html_content)} bytes")
         
         # Check if page has meaningful content
         body_text = await page.evaluate("() => document.body.innerText")
-        print(f"📝 Body text length: {len(body_text)} characters")
-        
-        # Close browser
-        await browser.close()
-        print("\n✅ Browser closed")
+        log(f"📝 Body text length: {len(body_text)} characters")
+    finally:
+        await page.close()
+    
+    return lines
+
+
+async def _run_one(context, semaphore, url, screenshot_path):
+    """Run a single URL test once a concurrency slot is free."""
+    async with semaphore:
+        return await test_with_playwright(context, url, screenshot_path)
 
 
-async def main():
+async def _launch_context(playwright, user_data_dir):
+    """
+    Launch Chromium and return the context shared by all URLs.
+
+    With a user_data_dir the profile persists between runs; otherwise a
+    throwaway browser is launched and closed along with its context.
+    """
+    if user_data_dir is None:
+        browser = await playwright.chromium.launch(headless=True)
+        return await browser.new_context(user_agent=USER_AGENT)
+    
+    user_data_dir.mkdir(parents=True, exist_ok=True)
+    return await playwright.chromium.launch_persistent_context(
+        str(user_data_dir),
+        headless=True,
+        user_agent=USER_AGENT,
+        args=['--disable-blink-features=AutomationControlled'],
+    )
+
+
+async def main(user_data_dir=DEFAULT_USER_DATA_DIR):
     """Run Playwright tests."""
     print("🐞 Playwright Content Extraction Debugger")
     print("=" * 100)
     print()
     
-    test_urls = [
-        "https://sellercentral.amazon.com/help/hub/reference/external/G2?locale=en-US",
-    ]
+    async with async_playwright() as p:
+        # Launch the browser once and share one context across all URLs
+        print(f"🚀 Launching Chromium browser (profile: {user_data_dir or 'none'})...")
+        context = await _launch_context(p, user_data_dir)
+        await context.route("**/*", _block_unneeded)
+        semaphore = asyncio.BoundedSemaphore(MAX_CONCURRENT_PAGES)
+        
+        try:
+            reports = await asyncio.gather(*(
+                _run_one(context, semaphore, url, _screenshot_path(i))
+                for i, url in enumerate(TEST_URLS, 1)
+            ))
+        finally:
+            await context.close()
+            if context.browser is not None:
+                await context.browser.close()
+            print("✅ Browser closed\n")
     
-    for i, url in enumerate(test_urls, 1):
+    for i, report in enumerate(reports, 1):
         if i > 1:
             print("\n\n" + "=" * 100 + "\n")
-        await test_with_playwright(url)
+        print("\n".join(report))
     
     print("\n\n" + "=" * 100)
     print("✅ Debug complete!")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--user-data-dir",
+        type=Path,
+        default=DEFAULT_USER_DATA_DIR,
+        help=f"Persistent browser profile directory (default: {DEFAULT_USER_DATA_DIR})"
+    )
+    parser.add_argument(
+        "--no-profile",
+        dest="user_data_dir",
+        action="store_const",
+        const=None,
+        help="Use a throwaway browser profile instead"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.user_data_dir))
 
@@ -8,8 +8,14 @@ Usage:
     # Export specific JSON file
     python scripts/export_embeddings_to_csv.py --input data/embeddings/embeddings_20251031_174503_20251105_020811.json
     
-    # Export all embeddings in a directory
-    python scripts/export_embeddings_to_csv.py --batch --input data/embeddings/
+    # Export all embeddings in a directory (one worker process per CPU by default)
+    python scripts/export_embeddings_to_csv.py --batch --input data/embeddings/ --workers 4
+    
+    # Export compact base64 float16 vectors instead of JSON float lists, gzip-compressed
+    python scripts/export_embeddings_to_csv.py --input data/embeddings/ --vector-format f16b64 --gzip
+    
+    # Export metadata CSV plus a binary float32 matrix (<name>.npy, loadable with np.load)
+    python scripts/export_embeddings_to_csv.py --input data/embeddings/ --vector-format npy
     
     # Export without embedding vectors (metadata only)
     python scripts/export_embeddings_to_csv.py --input data/embeddings/embeddings_20251031_174503_20251105_020811.json --no-embeddings
@@ -17,6 +23,7 @@ Usage:
 
 import argparse
 import logging
+import os
 from pathlib import Path
 import sys
 
@@ -24,7 +31,7 @@ import sys
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.export.csv_exporter import CSVExporter
+from src.export.csv_exporter import CSVExporter, VECTOR_FORMATS
 from config.settings import Settings
 
 logging.basicConfig(
@@ -34,11 +41,17 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def export_single_file(input_path: Path, output_dir: Path, include_embeddings: bool = True):
+def export_single_file(
+    input_path: Path,
+    output_dir: Path,
+    include_embeddings: bool = True,
+    vector_format: str = "json",
+    compress: bool = False
+):
     """Export a single embeddings JSON file to CSV."""
     logger.info(f"Exporting single file: {input_path}")
     
-    exporter = CSVExporter(output_dir=output_dir)
+    exporter = CSVExporter(output_dir=output_dir, vector_format=vector_format, compress=compress)
     output_file = exporter.export_from_json_file(
         input_path,
         include_embedding=include_embeddings
@@ -48,15 +61,23 @@ def export_single_file(input_path: Path, output_dir: Path, include_embeddings: b
     return output_file
 
 
-def export_batch(input_dir: Path, output_dir: Path, include_embeddings: bool = True):
+def export_batch(
+    input_dir: Path,
+    output_dir: Path,
+    include_embeddings: bool = True,
+    workers: int = 1,
+    vector_format: str = "json",
+    compress: bool = False
+):
     """Export all embeddings JSON files in a directory to CSV."""
-    logger.info(f"Batch exporting from directory: {input_dir}")
+    logger.info(f"Batch exporting from directory: {input_dir} ({workers} worker(s))")
     
-    exporter = CSVExporter(output_dir=output_dir)
+    exporter = CSVExporter(output_dir=output_dir, vector_format=vector_format, compress=compress)
     output_files = exporter.batch_export_directory(
         input_dir,
         pattern="*.json",
-        include_embedding=include_embeddings
+        include_embedding=include_embeddings,
+        max_workers=workers
     )
     
     logger.info(f"✅ Successfully exported {len(output_files)} files")
@@ -74,13 +95,13 @@ def main():
     parser.add_argument(
         "--input",
         type=Path,
-        default=Settings.DATA_DIR / "embeddings",
+        default=None,
         help="Input JSON file or directory (default: data/embeddings/)"
     )
     parser.add_argument(
         "--output",
         type=Path,
-        default=Settings.DATA_DIR / "csv_export",
+        default=None,
         help="Output directory for CSV files (default: data/csv_export/)"
     )
     parser.add_argument(
@@ -93,9 +114,34 @@ def main():
         action="store_true",
         help="Export metadata only, exclude embedding vectors"
     )
+    parser.add_argument(
+        "--vector-format",
+        choices=VECTOR_FORMATS,
+        default="json",
+        help="Embedding column encoding: JSON floats, base64 float16/int8 "
+             "buffers (decode with src.export.decode_embedding), or npy to write "
+             "a float32 .npy matrix next to each CSV instead (default: json)"
+    )
+    parser.add_argument(
+        "--gzip",
+        action="store_true",
+        help="Write gzip-compressed .csv.gz files"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes for --batch export (default: CPU count)"
+    )
     
     args = parser.parse_args()
     
+    # Only resolve the data directory when a path was not given explicitly
+    if args.input is None:
+        args.input = Settings.get_data_path("embeddings")
+    if args.output is None:
+        args.output = Settings.get_data_path("csv_export")
+    
     # Ensure output directory exists
     args.output.mkdir(parents=True, exist_ok=True)
     
@@ -108,7 +154,14 @@ def main():
                 logger.error(f"❌ Input must be a directory for batch export: {args.input}")
                 return 1
             
-            export_batch(args.input, args.output, include_embeddings)
+            export_batch(
+                args.input,
+                args.output,
+                include_embeddings,
+                args.workers,
+                args.vector_format,
+                args.gzip
+            )
         else:
             # Single file export
             if args.input.is_dir():
@@ -128,7 +181,13 @@ def main():
                 logger.error(f"❌ Input file not found: {input_file}")
                 return 1
             
-            export_single_file(input_file, args.output, include_embeddings)
+            export_single_file(
+                input_file,
+                args.output,
+                include_embeddings,
+                args.vector_format,
+                args.gzip
+            )
         
         logger.info("🎉 Export completed successfully!")
         return 0
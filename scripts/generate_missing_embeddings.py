@@ -1,11 +1,19 @@
 #!/usr/bin/env python
 """Generate embeddings for existing chunks files that don't have embeddings yet."""
 
+import mmap
+import os
 import sys
 import logging
 from pathlib import Path
+import numpy as np
 from tqdm import tqdm
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
@@ -21,6 +29,87 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Chunks from several files are embedded together until a group holds at
+# least this many, so the model sees full batches instead of one file's worth
+GROUP_MIN_CHUNKS = 1024
+
+# Chunks files at least this large are parsed straight from a memory map
+MMAP_MIN_BYTES = 1 << 20
+
+
+def iter_item_files(directory, suffix):
+    """
+    Yield item_*<suffix> files from one directory scan.
+
+    os.scandir returns names without a stat() per entry, unlike Path.glob.
+
+    Yields:
+        Tuples of (base name, e.g. 'item_42', os.DirEntry)
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            name = entry.name
+            if name.startswith("item_") and name.endswith(suffix):
+                yield name[:-len(suffix)], entry
+
+
+def load_chunks(chunks_file, file_manager):
+    """
+    Load a chunks file, parsing large ones in place from a memory map.
+
+    orjson reads the mapped pages directly, skipping the copy into a bytes
+    object and the decode to str. Small files, or a missing orjson, go
+    through FileManager.
+    """
+    if orjson is None or chunks_file.stat().st_size < MMAP_MIN_BYTES:
+        return file_manager.load_chunks(chunks_file.name)
+    with open(chunks_file, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        with memoryview(mapped) as view:
+            return orjson.loads(view)
+
+
+def embed_and_save_group(group, file_manager, embedding_generator):
+    """
+    Embed the chunks of several files in one pass and save each file.
+
+    Args:
+        group: List of (chunks_file, chunks) pairs
+
+    Returns:
+        Tuple of (files saved, files failed, chunks served from cache)
+    """
+    all_chunks = [chunk for _, chunks in group for chunk in chunks]
+    try:
+        # Embeddings are set on the chunk dicts, so each file's list is updated
+        # too; repeated texts are embedded once and cached ones not at all
+        hits_before = embedding_generator.cache_hits
+        embedding_generator.process_chunks(all_chunks)
+        cached = embedding_generator.cache_hits - hits_before
+    except Exception as e:
+        names = ", ".join(chunks_file.name for chunks_file, _ in group)
+        logger.error(f"❌ Error generating embeddings for {names}: {e}")
+        return 0, len(group), 0
+    
+    # Pack vectors as float32 rows: half the memory of boxed floats and
+    # serialized straight from the buffer when saving
+    if all_chunks:
+        vectors = np.asarray([chunk["embedding"] for chunk in all_chunks], dtype=np.float32)
+        for chunk, vector in zip(all_chunks, vectors):
+            chunk["embedding"] = vector
+    
+    saved = failed = 0
+    for chunks_file, chunks in group:
+        try:
+            base_name = chunks_file.name[:-len("_chunks.json")]
+            embeddings_filename = f"{base_name}_embeddings.json"
+            file_manager.save_embeddings(chunks, filename=embeddings_filename)
+            saved += 1
+        except Exception as e:
+            logger.error(f"❌ Error saving embeddings for {chunks_file.name}: {e}")
+            failed += 1
+    
+    return saved, failed, cached
+
 
 def main():
     """Generate embeddings for all chunks files that don't have embeddings."""
@@ -29,25 +118,23 @@ def main():
     
     # Initialize components
     file_manager = FileManager()
-    embedding_generator = EmbeddingGenerator()
-    
-    # Get all chunks files
-    chunks_dir = Settings.get_data_path("chunks")
-    chunks_files = list(chunks_dir.glob("item_*_chunks.json"))
     
-    # Get all existing embedding files
+    # Index existing embedding files, then classify chunks files in the
+    # same pass that lists them
     embeddings_dir = Settings.get_data_path("embeddings")
     embeddings_dir.mkdir(parents=True, exist_ok=True)
-    existing_embeddings = {f.stem.replace("_embeddings", "") for f in embeddings_dir.glob("item_*_embeddings.json")}
+    existing_embeddings = {base_name for base_name, _ in iter_item_files(embeddings_dir, "_embeddings.json")}
     
-    # Find chunks files that need embeddings
+    chunks_dir = Settings.get_data_path("chunks")
+    chunks_count = 0
     files_to_process = []
-    for chunks_file in chunks_files:
-        base_name = chunks_file.stem.replace("_chunks", "")
+    for base_name, entry in iter_item_files(chunks_dir, "_chunks.json"):
+        chunks_count += 1
         if base_name not in existing_embeddings:
-            files_to_process.append(chunks_file)
+            files_to_process.append(Path(entry.path))
+    files_to_process.sort()
     
-    print(f"📊 Total chunks files: {len(chunks_files)}")
+    print(f"📊 Total chunks files: {chunks_count}")
     print(f"✅ Already have embeddings: {len(existing_embeddings)}")
     print(f"⚙️  Need to generate: {len(files_to_process)}")
     print()
@@ -56,32 +143,48 @@ def main():
         print("✨ All chunks files already have embeddings!")
         return
     
+    # Caching follows EMBEDDING_CACHE_ENABLED like the rest of the pipeline
+    embedding_generator = EmbeddingGenerator()
+    
     # Process each file
     success_count = 0
     error_count = 0
+    cached_count = 0
+    
+    def flush(group):
+        nonlocal success_count, error_count, cached_count
+        saved, failed, cached = embed_and_save_group(group, file_manager, embedding_generator)
+        success_count += saved
+        error_count += failed
+        cached_count += cached
     
-    for chunks_file in tqdm(files_to_process, desc="Generating embeddings"):
+    group = []
+    group_size = 0
+    # disable=None hides the bar when output is not a terminal
+    for chunks_file in tqdm(files_to_process, desc="Generating embeddings", disable=None, mininterval=1.0):
         try:
             # Load chunks
-            chunks = file_manager.load_chunks(chunks_file.name)
-            
-            if not chunks:
-                logger.warning(f"No chunks in {chunks_file.name}, skipping")
-                continue
-            
-            # Generate embeddings
-            chunks_with_embeddings = embedding_generator.process_chunks(chunks)
-            
-            # Save embeddings
-            base_name = chunks_file.stem.replace("_chunks", "")
-            embeddings_filename = f"{base_name}_embeddings.json"
-            file_manager.save_embeddings(chunks_with_embeddings, filename=embeddings_filename)
-            
-            success_count += 1
-            
+            chunks = load_chunks(chunks_file, file_manager)
         except Exception as e:
             logger.error(f"❌ Error processing {chunks_file.name}: {e}")
             error_count += 1
+            continue
+        
+        if not chunks:
+            logger.warning(f"No chunks in {chunks_file.name}, skipping")
+            continue
+        
+        group.append((chunks_file, chunks))
+        group_size += len(chunks)
+        if group_size >= GROUP_MIN_CHUNKS:
+            flush(group)
+            group = []
+            group_size = 0
+    
+    if group:
+        flush(group)
+    
+    embedding_generator.close()
     
     # Print summary
     print()
@@ -89,6 +192,7 @@ def main():
     print("📈 Summary:")
     print(f"  ✅ Successfully generated: {success_count}")
     print(f"  ❌ Errors: {error_count}")
+    print(f"  ♻️  Chunks reused from cache: {cached_count}")
     print(f"  📁 Embeddings saved to: {embeddings_dir}")
     print("=" * 70)
 
@@ -1,9 +1,11 @@
 #!/usr/bin/env python
 """Process existing raw files through the pipeline stages."""
 
+import os
 import sys
-import time
+import threading
 from pathlib import Path
+from tqdm import tqdm
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
@@ -62,14 +64,26 @@ def main():
     raw_dir = Settings.get_data_path("raw")
     processed_dir = Settings.get_data_path("processed")
     
-    raw_files = list(raw_dir.glob("item_*.json"))
-    processed_files = set(processed_dir.glob("item_*_processed.json"))
-    processed_stems = {f.stem.replace("_processed", "") for f in processed_files}
+    # Base names come from slicing the file names; no Path per entry
+    with os.scandir(processed_dir) as entries:
+        processed_stems = {
+            entry.name[:-len("_processed.json")]
+            for entry in entries
+            if entry.name.startswith("item_") and entry.name.endswith("_processed.json")
+        }
     
     # Filter to unprocessed files
-    unprocessed = [f for f in raw_files if f.stem not in processed_stems]
-    
-    print(f"📊 Found {len(raw_files)} raw files, {len(processed_files)} already processed")
+    raw_count = 0
+    unprocessed = []
+    with os.scandir(raw_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            if name.startswith("item_") and name.endswith(".json"):
+                raw_count += 1
+                if name[:-len(".json")] not in processed_stems:
+                    unprocessed.append(Path(entry.path))
+    
+    print(f"📊 Found {raw_count} raw files, {len(processed_stems)} already processed")
     print(f"🔄 Need to process: {len(unprocessed)} files")
     print()
     
@@ -84,34 +98,45 @@ def main():
     print(f"✅ Queued {len(unprocessed)} files")
     print()
     
-    # Monitor progress
-    print("📊 Processing Progress")
-    print("-" * 70)
-    last_stats = None
-    
-    while True:
-        # Check if queue is done
-        if processor.file_queue.empty() and processor.file_queue.unfinished_tasks == 0:
-            print("\n✅ All files processed!")
-            break
+    # Report progress from a background thread while the main thread
+    # blocks until every queued file is done
+    done = threading.Event()
+    
+    def report_progress(pbar):
+        last_errors = 0
+        last_processed = 0  # pbar.n stays 0 when the bar is disabled
+        while True:
+            finished = done.wait(1.0)
+            stats = processor.get_stats()
+            delta = stats['files_processed'] - last_processed
+            last_processed = stats['files_processed']
+            # Only touch the bar when a file finished or failed
+            if delta or stats['errors'] != last_errors:
+                pbar.set_postfix(
+                    docs=stats['documents_processed'],
+                    chunks=stats['chunks_created'],
+                    pinecone=stats['chunks_uploaded_pinecone'],
+                    errors=stats['errors'],
+                    refresh=False,
+                )
+                pbar.update(delta)
+                last_errors = stats['errors']
+            if finished:
+                return
+    
+    # disable=None hides the bar when output is not a terminal
+    with tqdm(total=len(unprocessed), desc="📊 Processing", unit="file", disable=None, mininterval=1.0) as pbar:
+        reporter = threading.Thread(target=report_progress, args=(pbar,), name="Progress", daemon=True)
+        reporter.start()
         
-        # Print stats
-        current_stats = processor.get_stats()
-        if current_stats != last_stats:
-            print(
-                f"📈 Files={current_stats['files_processed']}/{len(unprocessed)}, "
-                f"Docs={current_stats['documents_processed']}, "
-                f"Chunks={current_stats['chunks_created']}, "
-                f"Embeddings={current_stats['embeddings_generated']}, "
-                f"Pinecone={current_stats['chunks_uploaded_pinecone']}, "
-                f"Errors={current_stats['errors']}"
-            )
-            last_stats = current_stats.copy()
-        
-        time.sleep(2)
+        processor.file_queue.join()
+        done.set()
+        reporter.join()
+    
+    print("✅ All files processed!")
     
-    # Stop workers
-    processor.stop_workers()
+    # Stop workers (each exits on a None sentinel) and close the embedding cache
+    processor.close()
     
     # Final stats
     final_stats = processor.get_stats()
@@ -91,15 +91,18 @@ def main():
         # Run pipeline
         orchestrator = PipelineOrchestrator(storage_mode=args.storage)
 
-        if mode == "full":
-            logger.info("Starting full pipeline execution...")
-            results = orchestrator.run_full_pipeline()
-        elif mode == "incremental":
-            logger.info("Starting incremental pipeline execution...")
-            results = orchestrator.run_incremental_update()
-        else:
-            logger.error(f"Unknown mode: {mode}")
-            sys.exit(1)
+        try:
+            if mode == "full":
+                logger.info("Starting full pipeline execution...")
+                results = orchestrator.run_full_pipeline()
+            elif mode == "incremental":
+                logger.info("Starting incremental pipeline execution...")
+                results = orchestrator.run_incremental_update()
+            else:
+                logger.error(f"Unknown mode: {mode}")
+                sys.exit(1)
+        finally:
+            orchestrator.close()
 
         if results.get("success"):
             logger.info("Pipeline completed successfully")
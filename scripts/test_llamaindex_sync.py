@@ -14,15 +14,21 @@ Usage:
 """
 
 import sys
+import json
 import logging
+from collections import Counter
 from pathlib import Path
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.integrations.llamaindex.client import LlamaIndexClient
-from src.storage.file_manager import FileManager
 from config.settings import Settings
 
 # Configure logging
@@ -33,6 +39,35 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Chunks held in memory (and sent per sync call) at a time
+SYNC_BATCH_SIZE = 512
+
+
+def iter_chunks(path):
+    """Yield chunks from an embeddings file, streaming it when ijson is available."""
+    with open(path, 'rb') as f:
+        if ijson is None:
+            yield from json.load(f)
+        else:
+            yield from ijson.items(f, 'item', use_float=True)
+
+
+def iter_chunk_batches(files, batch_size=SYNC_BATCH_SIZE):
+    """Yield lists of at most batch_size chunks across all files."""
+    batch = []
+    for path in files:
+        count = 0
+        for chunk in iter_chunks(path):
+            batch.append(chunk)
+            count += 1
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        logger.info(f"   ✓ Loaded {count} chunks from {path.name}")
+    if batch:
+        yield batch
+
+
 def test_llamaindex_connection():
     """Test LlamaIndex Cloud connection."""
     logger.info("=" * 70)
@@ -89,8 +124,7 @@ def test_sync_embeddings(limit: int = 10):
     logger.info("🧪 TESTING LLAMAINDEX SYNC WITH EMBEDDINGS")
     logger.info("=" * 70)
     
-    # Initialize clients
-    file_manager = FileManager()
+    # Initialize client
     client = LlamaIndexClient()
     
     try:
@@ -113,20 +147,23 @@ def test_sync_embeddings(limit: int = 10):
         logger.info(f"   Testing with first {min(limit, len(embedding_files))} files")
         logger.info("")
         
-        # Load embeddings
-        all_chunks = []
-        for embedding_file in embedding_files[:limit]:
-            chunks = file_manager.load_embeddings(embedding_file.name)
-            all_chunks.extend(chunks)
-            logger.info(f"   ✓ Loaded {len(chunks)} chunks from {embedding_file.name}")
-        
-        logger.info(f"📊 Total chunks loaded: {len(all_chunks)}")
+        # Stream chunks and sync them in bounded batches, so memory holds at
+        # most one batch of embedding vectors at a time
+        logger.info("🔄 Starting sync to LlamaIndex Cloud...")
+        status_counts = Counter()
+        result = {"new_count": 0, "updated_count": 0, "unchanged_count": 0, "errors": []}
+        total_chunks = 0
+        for batch in iter_chunk_batches(embedding_files[:limit]):
+            total_chunks += len(batch)
+            status_counts.update(
+                chunk.get("metadata", {}).get("change_status", "unknown") for chunk in batch
+            )
+            batch_result = client.sync_documents(batch)
+            for key in ("new_count", "updated_count", "unchanged_count"):
+                result[key] += batch_result[key]
+            result["errors"].extend(batch_result.get("errors", []))
         
-        # Analyze change status distribution
-        status_counts = {}
-        for chunk in all_chunks:
-            status = chunk.get("metadata", {}).get("change_status", "unknown")
-            status_counts[status] = status_counts.get(status, 0) + 1
+        logger.info(f"📊 Total chunks loaded: {total_chunks}")
         
         logger.info("")
         logger.info("📈 Change Status Distribution:")
@@ -134,10 +171,6 @@ def test_sync_embeddings(limit: int = 10):
             logger.info(f"   {status}: {count}")
         logger.info("")
         
-        # Sync to LlamaIndex
-        logger.info("🔄 Starting sync to LlamaIndex Cloud...")
-        result = client.sync_documents(all_chunks)
-        
         # Display results
         logger.info("")
         logger.info("=" * 70)
@@ -39,7 +39,6 @@ def main():
     settings = {
         'USER_AGENT': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
         'ROBOTSTXT_OBEY': True,
-        'CONCURRENT_REQUESTS': 1,  # Lower for Playwright (uses browser instances)
         'DOWNLOAD_DELAY': 2.0,  # Increased delay for Playwright
         'CLOSESPIDER_PAGECOUNT': 10,  # Stop after 10 pages
         'ITEM_PIPELINES': {
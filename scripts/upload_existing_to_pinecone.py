@@ -1,9 +1,22 @@
 #!/usr/bin/env python
 """Upload existing chunk/embedding files to Pinecone."""
 
+import os
 import sys
 import json
+import sqlite3
+import hashlib
+import argparse
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from urllib.parse import quote
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
@@ -12,8 +25,248 @@ sys.path.insert(0, str(project_root))
 from config.settings import Settings
 from src.integrations.pinecone.client import PineconeClient
 
+# Upload batches close once they hold this many files or this many bytes of
+# chunk JSON, whichever comes first, so sync payloads stay similar in size
+BATCH_SIZE = 64
+BATCH_TARGET_BYTES = 4 << 20
+
+# Parsed batches buffered ahead of the uploader; bounds memory to a few batches
+BATCHES_AHEAD = 2
+
+
+# orjson parses chunk files several times faster than the stdlib when installed
+loads = orjson.loads if orjson is not None else json.loads
+
+# Threads overlap the file reads; the GIL is released while blocked on I/O
+READ_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+
+def read_file(path):
+    """
+    Read a file with one os.read sized from fstat.
+
+    Returns:
+        The file's bytes, or the OSError raised while reading it
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            size = os.fstat(fd).st_size
+            data = os.read(fd, size)
+            # Short reads only happen if the file grew or on odd filesystems
+            while len(data) < size:
+                more = os.read(fd, size - len(data))
+                if not more:
+                    break
+                data += more
+        finally:
+            os.close(fd)
+        return data
+    except OSError as e:
+        return e
+
+
+def prefetch(paths):
+    """
+    Ask the kernel to start reading files into the page cache.
+
+    Called for the next batch before uploading the current one, so disk
+    read-ahead overlaps the Pinecone round trips. A no-op where
+    posix_fadvise is unavailable (e.g. macOS).
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            # Advice values are not flags, so each is a separate call
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+def read_batch(paths, executor):
+    """
+    Read every file of a batch concurrently before any parsing.
+
+    Returns:
+        List of (path, bytes_or_exception) in input order
+    """
+    return list(zip(paths, executor.map(read_file, paths)))
+
+
+def plan_batches(sized_files, max_files=BATCH_SIZE, target_bytes=BATCH_TARGET_BYTES):
+    """
+    Group files into upload batches of similar total size.
+
+    Files are taken largest first, so one huge file never trails a batch of
+    small ones.
+
+    Args:
+        sized_files: List of (path, size in bytes)
+
+    Returns:
+        List of batches, each a list of paths
+    """
+    batches = []
+    batch = []
+    batch_bytes = 0
+    for path, size in sorted(sized_files, key=lambda item: item[1], reverse=True):
+        batch.append(path)
+        batch_bytes += size
+        if len(batch) >= max_files or batch_bytes >= target_bytes:
+            batches.append(batch)
+            batch = []
+            batch_bytes = 0
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def read_batches(batches, executor):
+    """
+    Read and parse chunk files batch by batch.
+
+    Yields:
+        Tuples of (batch files, parsed chunks, list of (file, error))
+    """
+    if batches:
+        prefetch(batches[0])
+    for i, batch_files in enumerate(batches):
+        # Warm the page cache for the next batch while this one is parsed
+        if i + 1 < len(batches):
+            prefetch(batches[i + 1])
+        
+        # Read the whole batch first, then parse from memory
+        batch_chunks = []
+        errors = []
+        for chunk_file, data in read_batch(batch_files, executor):
+            try:
+                if isinstance(data, Exception):
+                    raise data
+                batch_chunks.extend(loads(data))
+            except Exception as e:
+                errors.append((chunk_file, e))
+        yield batch_files, batch_chunks, errors
+
+
+def read_ahead(batches, maxsize=BATCHES_AHEAD):
+    """
+    Run a batch generator on a background thread, so the next batches are
+    parsed while the current one uploads.
+
+    Errors raised by the generator are re-raised once its batches are drained.
+    """
+    ready = queue.Queue(maxsize)
+    failure = []
+    
+    def produce():
+        try:
+            for batch in batches:
+                ready.put(batch)
+        except Exception as e:
+            failure.append(e)
+        finally:
+            ready.put(None)
+    
+    threading.Thread(target=produce, name="batch-reader", daemon=True).start()
+    while True:
+        batch = ready.get()
+        if batch is None:
+            break
+        yield batch
+    if failure:
+        raise failure[0]
+
+
+def chunk_hash(chunk):
+    """SHA-256 of the whole chunk (content, metadata and embedding)."""
+    if orjson is not None:
+        data = orjson.dumps(chunk, option=orjson.OPT_SORT_KEYS)
+    else:
+        data = json.dumps(chunk, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(data).digest()
+
+
+def uploaded_ledger_path(index_name, namespace=""):
+    """
+    Path of the upload ledger for one Pinecone index and namespace.
+
+    The same chunk ids are uploaded separately to each namespace, so every
+    namespace keeps its own ledger; the default namespace keeps the original
+    per-index filename.
+    """
+    name = f"pinecone_uploaded_{index_name}"
+    if namespace:
+        name += f"__{quote(namespace, safe='')}"
+    return Settings.get_data_path(f"{name}.sqlite")
+
+
+class UploadedChunks:
+    """Local record of chunks already synced, so reruns only send changes."""
+
+    # SQLite caps the number of bound parameters per statement
+    LOOKUP_BATCH = 500
+
+    def __init__(self, path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS uploaded (id TEXT PRIMARY KEY, hash BLOB NOT NULL)")
+
+    def filter_pending(self, chunks):
+        """
+        Drop chunks whose exact content was already uploaded.
+
+        Returns:
+            Tuple of (chunks to upload, their (id, hash) pairs to record)
+        """
+        hashes = [chunk_hash(chunk) for chunk in chunks]
+        ids = [chunk.get("id") for chunk in chunks]
+        known = {}
+        lookup = [chunk_id for chunk_id in dict.fromkeys(ids) if chunk_id]
+        for i in range(0, len(lookup), self.LOOKUP_BATCH):
+            batch = lookup[i:i + self.LOOKUP_BATCH]
+            rows = self.conn.execute(
+                f"SELECT id, hash FROM uploaded WHERE id IN ({','.join('?' * len(batch))})", batch
+            )
+            known.update(rows)
+        
+        pending = []
+        records = []
+        for chunk, chunk_id, digest in zip(chunks, ids, hashes):
+            if chunk_id and known.get(chunk_id) == digest:
+                continue
+            pending.append(chunk)
+            if chunk_id:
+                records.append((chunk_id, digest))
+        return pending, records
+
+    def mark_uploaded(self, records):
+        """Record (id, hash) pairs after a successful sync."""
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO uploaded (id, hash) VALUES (?, ?)", records)
+
+    def close(self):
+        self.conn.close()
+
+
 def main():
     """Upload all existing chunks with embeddings to Pinecone."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Upload every chunk, even if an identical copy was uploaded before"
+    )
+    args = parser.parse_args()
+    
     print("=" * 70)
     print("📌 UPLOADING EXISTING CHUNKS TO PINECONE")
     print("=" * 70)
@@ -40,7 +293,12 @@ def main():
     
     # Find all chunk files (they contain embeddings too)
     chunks_dir = Settings.get_data_path("chunks")
-    chunk_files = sorted(chunks_dir.glob("item_*_chunks.json"))
+    with os.scandir(chunks_dir) as entries:
+        chunk_files = [
+            (Path(entry.path), entry.stat().st_size)
+            for entry in entries
+            if entry.name.startswith("item_") and entry.name.endswith("_chunks.json")
+        ]
     
     print(f"📂 Found {len(chunk_files)} chunk files")
     print()
@@ -52,29 +310,37 @@ def main():
     # Upload in batches
     total_uploaded = 0
     total_errors = 0
-    batch_size = 10  # Process 10 files at a time
     
     print("📤 Uploading to Pinecone...")
     print("-" * 70)
     
-    for i in range(0, len(chunk_files), batch_size):
-        batch_files = chunk_files[i:i+batch_size]
-        batch_num = (i // batch_size) + 1
-        total_batches = (len(chunk_files) + batch_size - 1) // batch_size
-        
+    executor = ThreadPoolExecutor(max_workers=READ_WORKERS)
+    uploaded = UploadedChunks(
+        uploaded_ledger_path(Settings.PINECONE_INDEX_NAME, pinecone_client.namespace)
+    )
+    total_skipped = 0
+    
+    planned = plan_batches(chunk_files)
+    total_batches = len(planned)
+    batches = read_ahead(read_batches(planned, executor))
+    
+    for batch_num, (batch_files, batch_chunks, read_errors) in enumerate(batches, 1):
         print(f"📦 Batch {batch_num}/{total_batches} ({len(batch_files)} files)")
         
-        # Collect all chunks from batch
-        batch_chunks = []
-        for chunk_file in batch_files:
-            try:
-                with open(chunk_file) as f:
-                    chunks = json.load(f)
-                    batch_chunks.extend(chunks)
-            except Exception as e:
-                print(f"   ⚠️  Error reading {chunk_file.name}: {e}")
-                total_errors += 1
-                continue
+        for chunk_file, e in read_errors:
+            print(f"   ⚠️  Error reading {chunk_file.name}: {e}")
+        total_errors += len(read_errors)
+        
+        # Skip chunks already uploaded with identical content
+        if args.force:
+            records = [(chunk["id"], chunk_hash(chunk)) for chunk in batch_chunks if chunk.get("id")]
+        else:
+            pending, records = uploaded.filter_pending(batch_chunks)
+            skipped = len(batch_chunks) - len(pending)
+            if skipped:
+                print(f"   ⏭️  Skipping {skipped} chunks already uploaded")
+                total_skipped += skipped
+            batch_chunks = pending
         
         # Upload batch to Pinecone
         if batch_chunks:
@@ -83,16 +349,23 @@ def main():
                 uploaded_count = result.get("new_count", 0) + result.get("updated_count", 0)
                 total_uploaded += uploaded_count
                 print(f"   ✅ Uploaded {uploaded_count} chunks")
+                # Partial failures are reported in the result, not raised
+                if not result.get("errors"):
+                    uploaded.mark_uploaded(records)
             except Exception as e:
                 print(f"   ❌ Upload failed: {e}")
                 total_errors += 1
     
+    executor.shutdown()
+    uploaded.close()
+    
     # Summary
     print()
     print("=" * 70)
     print("🎉 UPLOAD COMPLETE")
     print("=" * 70)
     print(f"✅ Total chunks uploaded: {total_uploaded}")
+    print(f"⏭️  Already uploaded, skipped: {total_skipped}")
     print(f"❌ Errors: {total_errors}")
     print(f"📌 Pinecone index: {Settings.PINECONE_INDEX_NAME}")
     print()
@@ -2,8 +2,134 @@
 """Interactive log viewer for pipeline components."""
 
 import argparse
+import os
+import re
 import sys
+import threading
 from pathlib import Path
+from typing import Callable, Iterator, List, Optional
+
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+# Bytes read per step when scanning a log backwards from its end
+TAIL_BLOCK_SIZE = 64 * 1024
+
+
+def compile_filter(level: Optional[str], search: Optional[str]) -> Optional[Callable[[bytes], object]]:
+    """
+    Compile the --level and --search filters into one bytes regex.
+
+    Lines are matched as raw bytes, so nothing is decoded or lowercased
+    per line; the search term is matched case-insensitively. Bytes case
+    folding only covers ASCII, so a non-ASCII search term is instead
+    matched against the decoded line with a str regex.
+
+    Returns:
+        A predicate taking a raw line, or None when no filter is set
+    """
+    conditions = []
+    text_search = None
+    if level:
+        conditions.append(rb"(?=.*?" + re.escape(f"[{level}]".encode()) + rb")")
+    if search:
+        if search.isascii():
+            conditions.append(rb"(?=.*?(?i:" + re.escape(search.encode()) + rb"))")
+        else:
+            text_search = re.compile(re.escape(search), re.IGNORECASE).search
+    bytes_search = re.compile(b"".join(conditions)).search if conditions else None
+    if text_search is None:
+        return bytes_search
+
+    def matches(line: bytes) -> bool:
+        if bytes_search is not None and not bytes_search(line):
+            return False
+        return text_search(line.decode("utf-8", errors="replace")) is not None
+
+    return matches
+
+
+def lines_containing(data: bytes, needle: bytes, ignore_case: bool = False) -> Iterator[bytes]:
+    """
+    Yield the lines of data that contain needle.
+
+    Candidates are located with bytes.find over the whole buffer, so lines
+    without the needle are skipped in C and never visited one by one.
+    """
+    haystack = data.lower() if ignore_case else data
+    pos = haystack.find(needle)
+    while pos != -1:
+        start = data.rfind(b"\n", 0, pos) + 1
+        end = data.find(b"\n", pos)
+        end = len(data) if end == -1 else end + 1
+        yield data[start:end]
+        pos = haystack.find(needle, end)
+
+
+def filter_lines(data: bytes, level: Optional[str], search: Optional[str]) -> List[bytes]:
+    """Return the lines of data that pass the --level and --search filters."""
+    matches = compile_filter(level, search)
+    if matches is None:
+        return data.splitlines(keepends=True)
+    # Prefilter on one literal (the search term is usually the rarer one),
+    # then confirm the survivors with the full pattern; bytes.lower() folds
+    # ASCII only, so a non-ASCII search term cannot be the prefilter
+    if search and search.isascii():
+        candidates = lines_containing(data, search.lower().encode(), ignore_case=True)
+    elif level:
+        candidates = lines_containing(data, f"[{level}]".encode())
+    else:
+        candidates = data.splitlines(keepends=True)
+    return [line for line in candidates if matches(line)]
+
+
+def tail_lines(
+    path: Path, n: int, level: Optional[str], search: Optional[str], block: int = TAIL_BLOCK_SIZE
+) -> List[bytes]:
+    """
+    Return the last n lines of a file that pass the filters.
+
+    The file is read backwards in fixed-size blocks until n matching lines
+    have been found, so only the tail of a large log is loaded.
+    """
+    found: List[bytes] = []
+    with open(path, 'rb') as f:
+        end = f.seek(0, os.SEEK_END)
+        # Start of a line cut by the previous block; completed by the next one
+        carry = b""
+        while end > 0 and len(found) < n:
+            start = max(0, end - block)
+            f.seek(start)
+            data = f.read(end - start) + carry
+            end = start
+            if start > 0:
+                # The first line may begin in an earlier block
+                cut = data.find(b"\n") + 1
+                if not cut:
+                    carry = data
+                    continue
+                carry, data = data[:cut], data[cut:]
+            found[:0] = filter_lines(data, level, search)
+    return found[-n:]
+
+
+class _LogChangeHandler(FileSystemEventHandler):
+    """Wakes the follow loop when the watched log file changes."""
+
+    def __init__(self, path: Path, changed: threading.Event):
+        super().__init__()
+        self.path = str(path)
+        self.changed = changed
+
+    def on_any_event(self, event):
+        if not event.is_directory and self.path in (event.src_path, getattr(event, "dest_path", None)):
+            self.changed.set()
+
+
+def write_line(line: bytes) -> None:
+    """Print a raw log line."""
+    sys.stdout.write(line.decode("utf-8", errors="replace"))
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -62,54 +188,62 @@ def main():
     print("=" * 80)
     print()
     
+    matches = compile_filter(args.level, args.search)
+    
     # Handle follow mode
     if args.follow:
+        print("[Following log file... Press Ctrl+C to stop]")
+        print()
+        # Sleep until the file system reports a change instead of polling
+        changed = threading.Event()
+        observer = Observer()
+        observer.schedule(_LogChangeHandler(log_file.resolve(), changed), str(log_file.resolve().parent))
+        observer.start()
+        f = open(log_file, 'rb')
         try:
-            import time
-            print("[Following log file... Press Ctrl+C to stop]")
-            print()
-            with open(log_file, 'r') as f:
-                # Go to end of file
-                f.seek(0, 2)
-                while True:
-                    line = f.readline()
-                    if not line:
-                        time.sleep(0.1)
-                        continue
-                    
-                    # Apply filters
-                    if args.level and f"[{args.level}]" not in line:
+            # Go to end of file
+            f.seek(0, 2)
+            while True:
+                line = f.readline()
+                if not line:
+                    # A file smaller than our position was rotated or truncated
+                    if os.stat(log_file).st_size < f.tell():
+                        f.close()
+                        f = open(log_file, 'rb')
                         continue
-                    if args.search and args.search.lower() not in line.lower():
-                        continue
-                    
-                    print(line, end='')
+                    sys.stdout.flush()
+                    # The timeout covers platforms whose watchers miss events
+                    changed.wait(timeout=1.0)
+                    changed.clear()
+                    continue
+                
+                # Apply filters
+                if matches is not None and not matches(line):
+                    continue
+                
+                write_line(line)
         except KeyboardInterrupt:
             print("\n[Stopped following log]")
             sys.exit(0)
+        finally:
+            f.close()
+            observer.stop()
+            observer.join()
     
-    # Read and display log file
+    # Read and display the last N matching lines (all of them for --lines 0)
     try:
-        with open(log_file, 'r') as f:
-            lines = f.readlines()
+        if args.lines > 0:
+            lines = tail_lines(log_file, args.lines, args.level, args.search)
+        else:
+            with open(log_file, 'rb') as f:
+                lines = filter_lines(f.read(), args.level, args.search)
     except Exception as e:
         print(f"❌ Error reading log file: {e}")
         sys.exit(1)
     
-    # Apply filters
-    if args.level:
-        lines = [l for l in lines if f"[{args.level}]" in l]
-    
-    if args.search:
-        lines = [l for l in lines if args.search.lower() in l.lower()]
-    
-    # Show last N lines
-    if args.lines > 0:
-        lines = lines[-args.lines:]
-    
     # Display lines
     for line in lines:
-        print(line, end='')
+        write_line(line)
     
     # Print footer
     print()
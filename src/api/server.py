@@ -2,12 +2,15 @@
 
 import logging
 import asyncio
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, Any, Optional
-from concurrent.futures import ThreadPoolExecutor
-import requests
+from itertools import islice
+from typing import Dict, Any, Optional, Set, Tuple
+import httpx
+import orjson
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 
 from .models import (
@@ -43,11 +46,34 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory job storage (use Redis/DB for production)
-jobs: Dict[str, Dict[str, Any]] = {}
+# In-memory job storage (use Redis/DB for production), oldest first; only the
+# most recent MAX_JOBS jobs are kept
+jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+MAX_JOBS = 1000
 
-# Thread pool for running pipeline in background
-executor = ThreadPoolExecutor(max_workers=1)  # Only allow 1 concurrent pipeline execution
+# Webhook notifications waiting to be sent by deliver_webhooks(), which runs
+# on the event loop so slow endpoints never hold up a pipeline. Both are
+# created at startup, inside the server's event loop
+webhook_queue: Optional["asyncio.Queue[Tuple[str, WebhookPayload]]"] = None
+webhook_task: Optional["asyncio.Task[None]"] = None
+WEBHOOK_RETRIES = 3
+WEBHOOK_BACKOFF = 0.5  # Seconds before the first retry, doubled each time
+
+# Only 1 concurrent pipeline execution. A trigger claims the run by setting
+# active_job_id (checked and set without awaiting in between, so two requests
+# cannot both claim it); run_pipeline holds pipeline_lock while executing and
+# clears the claim when done, whatever happens to the trigger's response
+active_job_id: Optional[str] = None
+pipeline_lock = asyncio.Lock()
+
+# Pipeline runs in progress, referenced so they are not garbage-collected
+pipeline_tasks: Set["asyncio.Task[None]"] = set()
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize to JSON bytes with orjson (NumPy arrays included)."""
+    # default=str matches FastAPI's encoder for paths and other stray objects
+    return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY, default=str)
 
 
 def generate_job_id() -> str:
@@ -55,34 +81,56 @@ def generate_job_id() -> str:
     return f"job_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
 
 
-def notify_webhook(webhook_url: str, payload: WebhookPayload) -> None:
+async def notify_webhook(client: httpx.AsyncClient, webhook_url: str, payload: WebhookPayload) -> None:
     """
-    Send notification to webhook URL.
+    Send notification to webhook URL, retrying with exponential backoff.
     
     Args:
+        client: Shared HTTP client (keeps connections alive between calls)
         webhook_url: Webhook URL to POST to
         payload: Payload to send
     """
-    try:
-        logger.info(f"Sending webhook notification to: {webhook_url}")
-        response = requests.post(
-            webhook_url,
-            json=payload.dict(),
-            timeout=30
-        )
-        response.raise_for_status()
-        logger.info(f"✅ Webhook notification sent successfully")
-    except Exception as e:
-        logger.error(f"❌ Failed to send webhook notification: {e}")
+    for attempt in range(WEBHOOK_RETRIES + 1):
+        try:
+            logger.info(f"Sending webhook notification to: {webhook_url}")
+            response = await client.post(
+                webhook_url,
+                content=dumps(payload.dict()),
+                headers={"Content-Type": "application/json"},
+            )
+            response.raise_for_status()
+            logger.info(f"✅ Webhook notification sent successfully")
+            return
+        except Exception as e:
+            if attempt == WEBHOOK_RETRIES:
+                logger.error(f"❌ Failed to send webhook notification: {e}")
+                return
+            delay = WEBHOOK_BACKOFF * 2 ** attempt
+            logger.warning(f"⚠️  Webhook notification failed ({e}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
 
+async def deliver_webhooks(webhook_queue: "asyncio.Queue[Tuple[str, WebhookPayload]]") -> None:
+    """Send queued webhook notifications until cancelled."""
+    async with httpx.AsyncClient(timeout=30) as client:
+        while True:
+            webhook_url, payload = await webhook_queue.get()
+            try:
+                await notify_webhook(client, webhook_url, payload)
+            finally:
+                webhook_queue.task_done()
 
-def run_pipeline_sync(job_id: str, webhook_url: Optional[str]) -> None:
+
+def run_pipeline_sync(job_id: str, webhook_url: Optional[str]) -> Optional[WebhookPayload]:
     """
     Run pipeline synchronously in background thread.
     
     Args:
         job_id: Job identifier
         webhook_url: Optional webhook URL to notify on completion
+    
+    Returns:
+        Notification to send to webhook_url, or None when no webhook is set
     """
     try:
         logger.info(f"🚀 Starting pipeline execution for job: {job_id}")
@@ -95,7 +143,10 @@ def run_pipeline_sync(job_id: str, webhook_url: Optional[str]) -> None:
         orchestrator = PipelineOrchestrator()
         
         # Run full pipeline
-        results = orchestrator.run_full_pipeline()
+        try:
+            results = orchestrator.run_full_pipeline()
+        finally:
+            orchestrator.close()
         
         # Update job with results
         jobs[job_id]["status"] = "completed" if results.get("success") else "failed"
@@ -116,7 +167,7 @@ def run_pipeline_sync(job_id: str, webhook_url: Optional[str]) -> None:
                 results=results if results.get("success") else None,
                 error=jobs[job_id].get("error")
             )
-            notify_webhook(webhook_url, webhook_payload)
+            return webhook_payload
         
     except Exception as e:
         logger.exception(f"❌ Pipeline execution failed for job: {job_id}")
@@ -132,7 +183,34 @@ def run_pipeline_sync(job_id: str, webhook_url: Optional[str]) -> None:
                 timestamp=jobs[job_id]["completed_at"],
                 error=str(e)
             )
-            notify_webhook(webhook_url, webhook_payload)
+            return webhook_payload
+    
+    return None
+
+
+async def run_pipeline(job_id: str, webhook_url: Optional[str]) -> None:
+    """
+    Run the pipeline in a worker thread under pipeline_lock, then release the claim.
+    
+    The webhook notification is queued rather than sent here, so the next
+    pipeline can start while it is being delivered.
+    
+    Args:
+        job_id: Job identifier
+        webhook_url: Optional webhook URL to notify on completion
+    """
+    global active_job_id
+    try:
+        async with pipeline_lock:
+            webhook_payload = await run_in_threadpool(run_pipeline_sync, job_id, webhook_url)
+    finally:
+        if active_job_id == job_id:
+            active_job_id = None
+    if webhook_payload is not None:
+        if webhook_queue is None:
+            logger.error(f"❌ Webhook delivery not running, notification for {job_id} dropped")
+        else:
+            webhook_queue.put_nowait((webhook_url, webhook_payload))
 
 
 @app.post(
@@ -141,25 +219,27 @@ def run_pipeline_sync(job_id: str, webhook_url: Optional[str]) -> None:
     summary="Trigger pipeline execution",
     description="Trigger a new pipeline execution. Returns immediately with job ID."
 )
-async def trigger_scrape(request: TriggerRequest, background_tasks: BackgroundTasks):
+async def trigger_scrape(request: TriggerRequest):
     """
     Trigger pipeline execution.
     
     The pipeline runs in the background and the job ID is returned immediately.
     Use the /status/{job_id} endpoint to check progress.
     """
+    global active_job_id
+    
+    # Check if another job is claimed or running
+    if active_job_id is not None or pipeline_lock.locked():
+        raise HTTPException(
+            status_code=429,
+            detail="Another pipeline job is already running. Please wait for it to complete."
+        )
+    
+    # Generate job ID and claim the run before anything can yield
+    job_id = generate_job_id()
+    active_job_id = job_id
+    
     try:
-        # Check if another job is running
-        running_jobs = [job for job in jobs.values() if job["status"] == "running"]
-        if running_jobs:
-            raise HTTPException(
-                status_code=429,
-                detail="Another pipeline job is already running. Please wait for it to complete."
-            )
-        
-        # Generate job ID
-        job_id = generate_job_id()
-        
         # Create job record
         jobs[job_id] = {
             "job_id": job_id,
@@ -171,13 +251,15 @@ async def trigger_scrape(request: TriggerRequest, background_tasks: BackgroundTa
             "results": None,
             "error": None
         }
+        if len(jobs) > MAX_JOBS:
+            jobs.popitem(last=False)
         
-        # Start pipeline in background
-        background_tasks.add_task(
-            run_pipeline_sync,
-            job_id,
-            request.webhook_url
-        )
+        # Start pipeline as its own task rather than a response background
+        # task, so it runs (and releases the claim) even if the response
+        # is never sent
+        task = asyncio.create_task(run_pipeline(job_id, request.webhook_url))
+        pipeline_tasks.add(task)
+        task.add_done_callback(pipeline_tasks.discard)
         
         logger.info(f"Pipeline job triggered: {job_id}")
         
@@ -188,9 +270,8 @@ async def trigger_scrape(request: TriggerRequest, background_tasks: BackgroundTa
             timestamp=jobs[job_id]["created_at"]
         )
         
-    except HTTPException:
-        raise
     except Exception as e:
+        active_job_id = None
         logger.error(f"Failed to trigger pipeline: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -253,23 +334,23 @@ async def list_jobs(limit: int = 10):
     Args:
         limit: Maximum number of jobs to return (default: 10)
     """
-    # Sort jobs by created_at descending
-    sorted_jobs = sorted(
-        jobs.values(),
-        key=lambda x: x["created_at"],
-        reverse=True
-    )
-    
-    return {
-        "total": len(sorted_jobs),
+    # jobs is kept in creation order, so the newest are at the end and no
+    # sort (or heap) over all jobs is needed
+    body = {
+        "total": len(jobs),
         "limit": limit,
-        "jobs": sorted_jobs[:limit]
+        "jobs": list(islice(reversed(jobs.values()), max(limit, 0)))
     }
+    # Job results can be large; skip FastAPI's pure-Python jsonable_encoder
+    return Response(content=dumps(body), media_type="application/json")
 
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize on startup."""
+    # Load the full configuration up front for the lifetime of the server
+    Settings.resolve_all()
+    
     logger.info("=" * 70)
     logger.info("🚀 Docs2Vector Pipeline API Starting")
     logger.info(f"   Storage Mode: {Settings.STORAGE_MODE}")
@@ -281,13 +362,23 @@ async def startup_event():
     if not Settings.validate():
         logger.error("❌ Configuration validation failed!")
         raise RuntimeError("Invalid configuration")
+    
+    global webhook_queue, webhook_task
+    webhook_queue = asyncio.Queue()
+    webhook_task = asyncio.create_task(deliver_webhooks(webhook_queue))
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown."""
     logger.info("👋 Docs2Vector Pipeline API Shutting Down")
-    executor.shutdown(wait=True)
+    if webhook_task is not None:
+        # Give queued notifications a chance to go out before stopping
+        try:
+            await asyncio.wait_for(webhook_queue.join(), timeout=30)
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️  {webhook_queue.qsize()} webhook notifications not sent")
+        webhook_task.cancel()
 
 
 if __name__ == "__main__":
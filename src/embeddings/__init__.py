@@ -1,7 +1,8 @@
 """Embeddings module for vector generation."""
 
+from .cache import EmbeddingCache
 from .generator import EmbeddingGenerator
 from .models import ModelConfig
 
-__all__ = ["EmbeddingGenerator", "ModelConfig"]
+__all__ = ["EmbeddingCache", "EmbeddingGenerator", "ModelConfig"]
 
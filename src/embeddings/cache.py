@@ -0,0 +1,109 @@
+"""Persistent embedding cache keyed by content hash."""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ..utils.exceptions import EmbeddingError
+from config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+# SQLite caps the number of bound parameters per statement
+_LOOKUP_BATCH = 500
+
+
+class EmbeddingCache:
+    """SQLite-backed map from sha256(text) to embedding vector, per model."""
+
+    def __init__(self, namespace: str, path: Optional[Path] = None):
+        """
+        Open (or create) the embedding cache.
+
+        Args:
+            namespace: Identifies the model producing the vectors, e.g.
+                "sentence-transformers:all-MiniLM-L6-v2"; entries from other
+                models are never returned
+            path: SQLite database file (defaults to Settings.DATA_DIR / 'embedding_cache.sqlite')
+        """
+        self.namespace = namespace
+        self.path = Path(path) if path is not None else Settings.get_data_path("embedding_cache.sqlite")
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Shared by pipeline worker threads; access is serialized by _lock
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._lock = threading.Lock()
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                " namespace TEXT NOT NULL,"
+                " key BLOB NOT NULL,"
+                " vector BLOB NOT NULL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+        except sqlite3.Error as e:
+            logger.error(f"❌ Failed to open embedding cache {self.path}: {e}")
+            raise EmbeddingError(f"Failed to open embedding cache: {e}") from e
+
+        logger.debug(f"EmbeddingCache opened (path: {self.path}, namespace: {namespace})")
+
+    @staticmethod
+    def key(text: str) -> bytes:
+        """Cache key for a text: its SHA-256 digest."""
+        return hashlib.sha256(text.encode("utf-8")).digest()
+
+    def get_many(self, keys: Iterable[bytes]) -> Dict[bytes, List[float]]:
+        """
+        Look up cached vectors.
+
+        Args:
+            keys: Cache keys from key()
+
+        Returns:
+            Dictionary of the keys found, mapped to their vectors
+        """
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        with self._lock:
+            for i in range(0, len(keys), _LOOKUP_BATCH):
+                batch = keys[i : i + _LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE namespace = ? AND key IN ({placeholders})",
+                    [self.namespace, *batch],
+                ).fetchall()
+                for key, vector in rows:
+                    found[key] = np.frombuffer(vector, dtype=np.float32).tolist()
+        return found
+
+    def put_many(self, items: Iterable[Tuple[bytes, List[float]]]) -> None:
+        """
+        Store vectors as float32, replacing existing entries.
+
+        Args:
+            items: (key, vector) pairs
+        """
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (namespace, key, vector) VALUES (?, ?, ?)",
+                (
+                    (self.namespace, key, np.asarray(vector, dtype=np.float32).tobytes())
+                    for key, vector in items
+                ),
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "EmbeddingCache":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
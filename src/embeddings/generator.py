@@ -3,17 +3,48 @@
 import logging
 from typing import List, Dict, Any, Optional
 
+import numpy as np
 from tqdm import tqdm
 
 from ..utils.exceptions import EmbeddingError
-from ..utils.validators import validate_embedding
 from config.settings import Settings
+from .cache import EmbeddingCache
 from .models import ModelConfig
 from .providers import SentenceTransformerProvider, OllamaProvider, OpenAIProvider
 
 logger = logging.getLogger(__name__)
 
 
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Scale each row of a float32 matrix to unit length, in place."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.maximum(norms, np.finfo(np.float32).tiny, out=norms)
+    matrix /= norms
+    return matrix
+
+
+def _valid_rows(matrix: np.ndarray) -> np.ndarray:
+    """Boolean mask of rows that are finite and not all zero."""
+    return np.isfinite(matrix).all(axis=1) & matrix.any(axis=1)
+
+
+def l2_normalize(vectors: List[List[float]]) -> List[List[float]]:
+    """
+    Scale each vector to unit length in one vectorized pass.
+
+    Zero vectors are returned unchanged.
+
+    Args:
+        vectors: Embedding vectors of equal dimension
+
+    Returns:
+        Normalized vectors as lists of floats
+    """
+    if not len(vectors):
+        return []
+    return _normalize_rows(np.array(vectors, dtype=np.float32)).tolist()
+
+
 class EmbeddingGenerator:
     """Generates vector embeddings for text chunks using various providers."""
 
@@ -23,6 +54,10 @@ class EmbeddingGenerator:
         model_name: Optional[str] = None,
         batch_size: Optional[int] = None,
         device: Optional[str] = None,
+        normalize: Optional[bool] = None,
+        cache: Optional[EmbeddingCache] = None,
+        use_cache: Optional[bool] = None,
+        precision: Optional[str] = None,
     ):
         """
         Initialize embedding generator.
@@ -32,10 +67,19 @@ class EmbeddingGenerator:
             model_name: Name of the embedding model
             batch_size: Batch size for processing
             device: Device to use for local models ('cpu', 'cuda', etc.)
+            normalize: L2-normalize embeddings (defaults to Settings.EMBEDDING_NORMALIZE)
+            cache: Embedding cache to use (opened under DATA_DIR if not provided)
+            use_cache: Reuse embeddings of previously seen texts (defaults to
+                Settings.EMBEDDING_CACHE_ENABLED; ignored when cache is given)
+            precision: sentence-transformers inference precision ("auto", "fp32",
+                "fp16", "bf16"; defaults to Settings.EMBEDDING_PRECISION)
         """
         self.provider_name = provider or Settings.EMBEDDING_PROVIDER
         self.model_name = model_name or Settings.EMBEDDING_MODEL
         self.batch_size = batch_size or Settings.EMBEDDING_BATCH_SIZE
+        self.normalize = Settings.EMBEDDING_NORMALIZE if normalize is None else normalize
+        self.cache = cache
+        self.cache_hits = 0  # Chunks served without running the model
 
         logger.info(f"Initializing embedding generator...")
         logger.info(f"Provider: {self.provider_name}, Model: {self.model_name}")
@@ -44,9 +88,16 @@ class EmbeddingGenerator:
         # Initialize the appropriate provider
         try:
             if self.provider_name == "sentence-transformers":
-                self.provider = SentenceTransformerProvider(self.model_name, device)
+                self.provider = SentenceTransformerProvider(
+                    self.model_name,
+                    device,
+                    precision or Settings.EMBEDDING_PRECISION,
+                    Settings.EMBEDDING_BACKEND,
+                )
             elif self.provider_name == "ollama":
-                self.provider = OllamaProvider(self.model_name, Settings.OLLAMA_BASE_URL)
+                self.provider = OllamaProvider(
+                    self.model_name, Settings.OLLAMA_BASE_URL, Settings.OLLAMA_MAX_CONCURRENCY
+                )
             elif self.provider_name == "openai":
                 self.provider = OpenAIProvider(
                     self.model_name,
@@ -57,12 +108,26 @@ class EmbeddingGenerator:
             else:
                 raise EmbeddingError(f"Unsupported embedding provider: {self.provider_name}")
 
-            dimension = self.get_dimension()
-            logger.info(f"✅ Embedding generator initialized (dimension: {dimension})")
+            # Looked up once; the provider resolves it through ModelConfig
+            self.dimension = self.provider.get_dimension()
+            logger.info(f"✅ Embedding generator initialized (dimension: {self.dimension})")
+
+            if self.cache is None and (Settings.EMBEDDING_CACHE_ENABLED if use_cache is None else use_cache):
+                self.cache = EmbeddingCache(self.cache_namespace)
         except Exception as e:
             logger.error(f"❌ Failed to initialize embedding generator: {e}")
             raise EmbeddingError(f"Failed to initialize embedding generator: {e}") from e
 
+    @property
+    def cache_namespace(self) -> str:
+        """Cache namespace for vectors produced by this configuration."""
+        parts = [self.provider_name, self.model_name]
+        if self.normalize:
+            parts.append("normalized")
+        # Every resolved provider option that changes the vectors
+        parts.extend(self.provider.vector_options())
+        return ":".join(parts)
+
     def get_dimension(self) -> int:
         """
         Get embedding dimension for current model.
@@ -70,7 +135,7 @@ class EmbeddingGenerator:
         Returns:
             Embedding dimension
         """
-        return self.provider.get_dimension()
+        return self.dimension
 
     def generate_embedding(self, text: str) -> List[float]:
         """
@@ -85,13 +150,15 @@ class EmbeddingGenerator:
         try:
             logger.debug(f"Generating embedding for text ({len(text)} chars)...")
             embedding = self.provider.generate_embedding(text)
+            if self.normalize:
+                embedding = l2_normalize([embedding])[0]
             logger.debug(f"Generated embedding with dimension {len(embedding)}")
             return embedding
         except Exception as e:
             logger.error(f"❌ Error generating embedding: {e}")
             raise EmbeddingError(f"Failed to generate embedding: {e}") from e
 
-    def generate_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+    def generate_embeddings_batch(self, texts: List[str]) -> np.ndarray:
         """
         Generate embeddings for multiple texts in batch.
 
@@ -99,21 +166,35 @@ class EmbeddingGenerator:
             texts: List of text strings
 
         Returns:
-            List of embedding vectors
+            float32 array of shape (len(texts), dimension), one row per text
         """
         if not texts:
             logger.debug("Empty text list provided for batch embedding")
-            return []
+            return np.empty((0, self.get_dimension()), dtype=np.float32)
 
         try:
             logger.debug(f"Generating batch embeddings for {len(texts)} texts...")
-            embeddings = self.provider.generate_embeddings_batch(texts)
+            embeddings = np.asarray(self.provider.generate_embeddings_batch(texts), dtype=np.float32)
+            if self.normalize:
+                _normalize_rows(embeddings)
             logger.debug(f"Generated {len(embeddings)} embeddings")
             return embeddings
         except Exception as e:
             logger.error(f"❌ Error generating batch embeddings: {e}")
             raise EmbeddingError(f"Failed to generate batch embeddings: {e}") from e
 
+    def close(self) -> None:
+        """Close the embedding cache, if any."""
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
+
+    def __enter__(self) -> "EmbeddingGenerator":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
     def process_chunks(self, chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Process chunks and add embeddings.
@@ -136,35 +217,98 @@ class EmbeddingGenerator:
         # Extract texts to embed
         texts = [chunk.get("content", "") for chunk in chunks]
 
+        # Deduplicate: boilerplate (navigation, footers) is often chunked
+        # identically many times; each distinct text is embedded once
+        unique: Dict[str, int] = {}
+        order = [unique.setdefault(text, len(unique)) for text in texts]
+        unique_texts = list(unique)
+        if len(unique_texts) < len(texts):
+            logger.debug(f"{len(texts) - len(unique_texts)} duplicate chunk texts skipped")
+
+        # One float32 row per distinct text, written in place. It is sized on
+        # the first vector seen, since the configured dimension is only a
+        # lookup-table guess for unknown models
+        unique_embeddings: Optional[np.ndarray] = None
+
+        # Then only texts missing from the cache go to the model
+        if self.cache is not None:
+            keys = [self.cache.key(text) for text in unique_texts]
+            cached = self.cache.get_many(keys)
+            miss_slots = []
+            hit_slots = []
+            for slot, key in enumerate(keys):
+                (hit_slots if key in cached else miss_slots).append(slot)
+            if hit_slots:
+                hit_vectors = [cached[keys[slot]] for slot in hit_slots]
+                unique_embeddings = np.empty((len(unique_texts), len(hit_vectors[0])), dtype=np.float32)
+                unique_embeddings[hit_slots] = hit_vectors
+            is_hit = np.zeros(len(unique_texts), dtype=bool)
+            is_hit[hit_slots] = True
+            hits = int(is_hit[order].sum())
+            self.cache_hits += hits
+            if hits:
+                logger.info(f"♻️  Reusing cached embeddings for {hits}/{len(texts)} chunks")
+        else:
+            miss_slots = list(range(len(unique_texts)))
+
+        # Length-sort so each batch is padded to a similar length; results
+        # are written back by slot, so no un-sorting is needed
+        if len(miss_slots) > self.batch_size:
+            miss_slots.sort(key=lambda slot: len(unique_texts[slot]))
+        miss_texts = [unique_texts[slot] for slot in miss_slots]
+
         # Process in batches to avoid memory issues
-        all_embeddings = []
-        total_batches = (len(texts) + self.batch_size - 1) // self.batch_size
+        total_batches = (len(miss_texts) + self.batch_size - 1) // self.batch_size
         logger.debug(f"Processing in {total_batches} batches...")
 
-        for i in tqdm(range(0, len(texts), self.batch_size), desc="Generating embeddings"):
+        # disable=None turns the bar off when stderr is not a TTY (API server,
+        # background jobs); the debug message is only formatted when shown
+        debug = logger.isEnabledFor(logging.DEBUG)
+        batch_starts = range(0, len(miss_texts), self.batch_size)
+        for i in tqdm(batch_starts, desc="Generating embeddings", disable=None, mininterval=1.0):
             batch_num = i // self.batch_size + 1
-            batch_texts = texts[i : i + self.batch_size]
-            logger.debug(f"Processing batch {batch_num}/{total_batches} ({len(batch_texts)} chunks)...")
+            batch_texts = miss_texts[i : i + self.batch_size]
+            batch_slots = miss_slots[i : i + self.batch_size]
+            if debug:
+                logger.debug(f"Processing batch {batch_num}/{total_batches} ({len(batch_texts)} chunks)...")
             try:
                 batch_embeddings = self.generate_embeddings_batch(batch_texts)
-                all_embeddings.extend(batch_embeddings)
             except Exception as e:
                 logger.error(f"❌ Error processing batch {batch_num}: {e}")
                 raise EmbeddingError(f"Failed to process batch: {e}") from e
 
-        # Add embeddings to chunks and validate
+            if unique_embeddings is None:
+                unique_embeddings = np.empty(
+                    (len(unique_texts), batch_embeddings.shape[1]), dtype=np.float32
+                )
+            unique_embeddings[batch_slots] = batch_embeddings
+
+            if self.cache is not None:
+                # Invalid or zero (fallback) vectors are never persisted
+                self.cache.put_many(
+                    (keys[slot], embedding)
+                    for slot, embedding, valid in zip(
+                        batch_slots, batch_embeddings, _valid_rows(batch_embeddings)
+                    )
+                    if valid
+                )
+
+        # Scatter back to every chunk position in one gather; rows become
+        # lists only at the chunk-dict boundary, which is serialized to JSON,
+        # Neo4j and Pinecone
+        all_embeddings = unique_embeddings[order]
+
+        # Validate every row in one vectorized pass; only failures are visited
         logger.debug("Validating and adding embeddings to chunks...")
-        invalid_count = 0
-        for i, chunk in enumerate(chunks):
-            embedding = all_embeddings[i]
-            if validate_embedding(embedding):
-                chunk["embedding"] = embedding
-            else:
-                logger.warning(f"⚠️  Invalid embedding generated for chunk {chunk.get('id', i)}")
-                invalid_count += 1
-                # Generate a zero embedding as fallback
-                dimension = self.get_dimension()
-                chunk["embedding"] = [0.0] * dimension
+        invalid_idx = np.flatnonzero(~_valid_rows(all_embeddings))
+        invalid_count = len(invalid_idx)
+        for i in invalid_idx:
+            logger.warning(f"⚠️  Invalid embedding generated for chunk {chunks[i].get('id', i)}")
+        # Zero embedding as fallback
+        all_embeddings[invalid_idx] = 0.0
+
+        for chunk, embedding in zip(chunks, all_embeddings.tolist()):
+            chunk["embedding"] = embedding
 
         if invalid_count > 0:
             logger.warning(f"⚠️  {invalid_count} invalid embeddings replaced with zero vectors")
@@ -1,13 +1,52 @@
 """Embedding provider implementations."""
 
 import logging
-from typing import List, Optional
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 from abc import ABC, abstractmethod
 
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 from ..utils.exceptions import EmbeddingError
+from config.settings import Settings
 
 logger = logging.getLogger(__name__)
 
+# Loaded sentence-transformers models shared across providers in this process,
+# keyed by (model_name, device, precision, backend) -> (model, resolved precision)
+_MODEL_CACHE: Dict[Tuple[str, str, str, str], Tuple[Any, str]] = {}
+_MODEL_CACHE_LOCK = threading.Lock()
+
+# Characters allowed per token of max_seq_length before a text is cut ahead of
+# tokenization. The cut can only remove text the model would see if the first
+# max_seq_length tokens average more than this many characters; subword tokens
+# average about 4, and long words, URLs and identifiers are split into several
+# tokens. The tokenizer still does the exact truncation; this only skips
+# tokenizing megabytes of text that would be discarded anyway
+CHARS_PER_TOKEN = 16
+
+# Per-request limits of the OpenAI /embeddings endpoint: 2048 inputs and about
+# 300k tokens, budgeted here as characters at a conservative 3 per token
+OPENAI_MAX_BATCH_INPUTS = 2048
+OPENAI_MAX_BATCH_CHARS = 900_000
+
+
+def _configure_torch_threads() -> None:
+    """Pin torch's CPU thread pools; called before the first model load."""
+    import torch
+
+    torch.set_num_threads(Settings.EMBEDDING_THREADS or min(8, os.cpu_count() or 1))
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Only allowed before torch starts any parallel work
+        pass
+
 
 class EmbeddingProvider(ABC):
     """Abstract base class for embedding providers."""
@@ -18,8 +57,8 @@ class EmbeddingProvider(ABC):
         pass
 
     @abstractmethod
-    def generate_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for multiple texts."""
+    def generate_embeddings_batch(self, texts: List[str]) -> np.ndarray:
+        """Generate embeddings for multiple texts as a float32 array of shape (n, dim)."""
         pass
 
     @abstractmethod
@@ -27,30 +66,120 @@ class EmbeddingProvider(ABC):
         """Get embedding dimension."""
         pass
 
+    def vector_options(self) -> Tuple[str, ...]:
+        """
+        Resolved settings, besides the model, that change the vectors produced.
+
+        Used in the embedding cache namespace so vectors from different
+        configurations never mix; default values are omitted so the default
+        configuration keeps its namespace.
+        """
+        return ()
+
 
 class SentenceTransformerProvider(EmbeddingProvider):
     """Provider using local sentence-transformers models."""
 
-    def __init__(self, model_name: str, device: Optional[str] = None):
-        """Initialize SentenceTransformer provider."""
+    def __init__(
+        self,
+        model_name: str,
+        device: Optional[str] = None,
+        precision: str = "auto",
+        backend: str = "torch",
+    ):
+        """
+        Initialize SentenceTransformer provider.
+
+        Args:
+            model_name: Name of the sentence-transformers model
+            device: Device to load the model on (auto-detected if None)
+            precision: "fp32", "fp16", "bf16", or "auto" (fp16 on CUDA, else fp32);
+                only applies to the torch backend
+            backend: "torch", "onnx" (ONNX Runtime) or "openvino"; the latter two
+                need the sentence-transformers[onnx] / [openvino] extras
+        """
+        self.model_name = model_name
+        self.backend = backend
+        key = (model_name, device or "auto", precision, backend)
         try:
-            from sentence_transformers import SentenceTransformer
-
-            self.model = SentenceTransformer(model_name, device=device)
-            self.model_name = model_name
-            logger.info(f"✅ Loaded sentence-transformers model: {model_name}")
+            # The lock keeps concurrent generators from loading the same model twice
+            with _MODEL_CACHE_LOCK:
+                if key not in _MODEL_CACHE:
+                    if not _MODEL_CACHE:
+                        _configure_torch_threads()
+                    _MODEL_CACHE[key] = self._load_model(model_name, device, precision, backend)
+                else:
+                    logger.debug(f"Reusing loaded sentence-transformers model: {model_name}")
+                self.model, self.precision = _MODEL_CACHE[key]
         except Exception as e:
             raise EmbeddingError(f"Failed to load sentence-transformers model: {e}") from e
 
+    @staticmethod
+    def _load_model(
+        model_name: str, device: Optional[str], precision: str, backend: str
+    ) -> Tuple[Any, str]:
+        """Load a model and cast it to the requested precision."""
+        from sentence_transformers import SentenceTransformer
+
+        if backend != "torch":
+            # ONNX Runtime / OpenVINO run their own optimized fp32 graph
+            # (exported on first use if the model repo has none)
+            model = SentenceTransformer(model_name, device=device, backend=backend)
+            logger.info(f"✅ Loaded sentence-transformers model: {model_name} ({backend})")
+            return model, "fp32"
+
+        model = SentenceTransformer(model_name, device=device)
+
+        # Half precision doubles matmul throughput on GPUs and halves
+        # activation memory; outputs are cast back to float32
+        if precision == "auto":
+            precision = "fp16" if str(model.device).startswith("cuda") else "fp32"
+        if precision == "fp16":
+            model.half()
+        elif precision == "bf16":
+            model.bfloat16()
+        logger.info(f"✅ Loaded sentence-transformers model: {model_name} ({precision})")
+        return model, precision
+
     def generate_embedding(self, text: str) -> List[float]:
         """Generate embedding for a single text."""
-        embedding = self.model.encode(text, convert_to_numpy=True, show_progress_bar=False)
-        return embedding.tolist()
+        import torch
+
+        # inference_mode skips autograd bookkeeping entirely
+        with torch.inference_mode():
+            embedding = self.model.encode(
+                self._truncate([text])[0], convert_to_numpy=True, show_progress_bar=False
+            )
+        return embedding.astype(np.float32, copy=False).tolist()
 
-    def generate_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+    def generate_embeddings_batch(self, texts: List[str]) -> np.ndarray:
         """Generate embeddings for multiple texts."""
-        embeddings = self.model.encode(texts, convert_to_numpy=True, show_progress_bar=False)
-        return embeddings.tolist()
+        import torch
+
+        with torch.inference_mode():
+            embeddings = self.model.encode(
+                self._truncate(texts), convert_to_numpy=True, show_progress_bar=False
+            )
+        return embeddings.astype(np.float32, copy=False)
+
+    def vector_options(self) -> Tuple[str, ...]:
+        """Non-default precision and backend of the loaded model."""
+        # Reduced-precision and ONNX / OpenVINO (possibly quantized) vectors
+        # differ numerically from fp32 torch ones; list new load options here
+        resolved = ((self.precision, "fp32"), (self.backend, "torch"))
+        return tuple(value for value, default in resolved if value != default)
+
+    def _truncate(self, texts: List[str]) -> List[str]:
+        """
+        Cut texts far beyond the model's sequence limit before tokenization.
+
+        The cut is a generous character bound (CHARS_PER_TOKEN per token), not
+        the truncation itself, which the model's tokenizer performs.
+        """
+        if not self.model.max_seq_length:
+            return texts
+        max_chars = self.model.max_seq_length * CHARS_PER_TOKEN
+        return [text[:max_chars] for text in texts]
 
     def get_dimension(self) -> int:
         """Get embedding dimension."""
@@ -62,19 +191,39 @@ class SentenceTransformerProvider(EmbeddingProvider):
 class OllamaProvider(EmbeddingProvider):
     """Provider using local Ollama server."""
 
-    def __init__(self, model_name: str, base_url: str):
-        """Initialize Ollama provider."""
+    def __init__(self, model_name: str, base_url: str, max_concurrency: int = 8):
+        """
+        Initialize Ollama provider.
+
+        Args:
+            model_name: Name of the Ollama embedding model
+            base_url: Ollama server URL
+            max_concurrency: Maximum requests in flight during a batch
+        """
         self.model_name = model_name
         self.base_url = base_url.rstrip("/")
+        self.url = f"{self.base_url}/api/embeddings"
+        self.max_concurrency = max(1, max_concurrency)
+
+        # The Ollama API embeds one prompt per request, so batches are sent
+        # concurrently over a pooled session; busy responses are retried
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=self.max_concurrency,
+            max_retries=Retry(
+                total=3, backoff_factor=0.5, status_forcelist=(429, 503), allowed_methods=None
+            ),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         logger.info(f"✅ Initialized Ollama provider: {model_name} at {base_url}")
 
     def generate_embedding(self, text: str) -> List[float]:
         """Generate embedding for a single text."""
-        import requests
-
         try:
-            response = requests.post(
-                f"{self.base_url}/api/embeddings",
+            response = self.session.post(
+                self.url,
                 json={"model": self.model_name, "prompt": text},
                 timeout=30,
             )
@@ -83,9 +232,14 @@ class OllamaProvider(EmbeddingProvider):
         except Exception as e:
             raise EmbeddingError(f"Ollama API error: {e}") from e
 
-    def generate_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
+    def generate_embeddings_batch(self, texts: List[str]) -> np.ndarray:
         """Generate embeddings for multiple texts."""
-        return [self.generate_embedding(text) for text in texts]
+        workers = min(self.max_concurrency, len(texts))
+        if workers <= 1:
+            return np.asarray([self.generate_embedding(text) for text in texts], dtype=np.float32)
+        # map() yields results in input order
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="Ollama") as pool:
+            return np.asarray(list(pool.map(self.generate_embedding, texts)), dtype=np.float32)
 
     def get_dimension(self) -> int:
         """Get embedding dimension."""
@@ -98,27 +252,51 @@ class OpenAIProvider(EmbeddingProvider):
     """Provider using OpenAI-compatible API."""
 
     def __init__(
-        self, model_name: str, api_key: str, api_base: str, org_id: Optional[str] = None
+        self,
+        model_name: str,
+        api_key: str,
+        api_base: str,
+        org_id: Optional[str] = None,
+        max_concurrency: int = 8,
     ):
         """Initialize OpenAI provider."""
         self.model_name = model_name
         self.api_key = api_key
         self.api_base = api_base.rstrip("/")
         self.org_id = org_id
+        self.max_concurrency = max(1, max_concurrency)
+
+        self.url = f"{self.api_base}/embeddings"
+        self.headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        }
+        if org_id:
+            self.headers["OpenAI-Organization"] = org_id
+
+        # Oversized batches are split into several requests sent concurrently;
+        # rate-limit and transient server errors are retried with backoff
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=max(16, self.max_concurrency),
+            max_retries=Retry(
+                total=5,
+                backoff_factor=1.0,
+                status_forcelist=(429, 500, 502, 503),
+                allowed_methods=None,
+            ),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         logger.info(f"✅ Initialized OpenAI-compatible provider: {model_name} at {api_base}")
 
     def generate_embedding(self, text: str) -> List[float]:
         """Generate embedding for a single text."""
-        import requests
-
-        headers = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
-        if self.org_id:
-            headers["OpenAI-Organization"] = self.org_id
-
         try:
-            response = requests.post(
-                f"{self.api_base}/embeddings",
-                headers=headers,
+            response = self.session.post(
+                self.url,
+                headers=self.headers,
                 json={"input": text, "model": self.model_name},
                 timeout=30,
             )
@@ -127,29 +305,66 @@ class OpenAIProvider(EmbeddingProvider):
         except Exception as e:
             raise EmbeddingError(f"OpenAI API error: {e}") from e
 
-    def generate_embeddings_batch(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for multiple texts."""
-        import requests
-
-        headers = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
-        if self.org_id:
-            headers["OpenAI-Organization"] = self.org_id
-
+    def _sub_batches(self, texts: List[str]) -> List[List[str]]:
+        """Split texts into request-sized batches, preserving order."""
+        batches: List[List[str]] = []
+        current: List[str] = []
+        chars = 0
+        for text in texts:
+            if current and (
+                len(current) >= OPENAI_MAX_BATCH_INPUTS
+                or chars + len(text) > OPENAI_MAX_BATCH_CHARS
+            ):
+                batches.append(current)
+                current, chars = [], 0
+            current.append(text)
+            chars += len(text)
+        if current:
+            batches.append(current)
+        return batches
+
+    def _post_batch(self, texts: List[str]) -> np.ndarray:
+        """Embed one request-sized batch."""
         try:
-            response = requests.post(
-                f"{self.api_base}/embeddings",
-                headers=headers,
+            response = self.session.post(
+                self.url,
+                headers=self.headers,
                 json={"input": texts, "model": self.model_name},
                 timeout=60,
             )
             response.raise_for_status()
             data = response.json()["data"]
-            # Sort by index to ensure correct order
-            data.sort(key=lambda x: x["index"])
-            return [item["embedding"] for item in data]
         except Exception as e:
             raise EmbeddingError(f"OpenAI API batch error: {e}") from e
 
+        # Results carry their position within the request; every input must
+        # come back exactly once, or rows would be missing or overwritten
+        indices = sorted(item["index"] for item in data)
+        if indices != list(range(len(texts))):
+            raise EmbeddingError(
+                f"OpenAI API batch error: expected {len(texts)} embeddings indexed "
+                f"0..{len(texts) - 1}, got {len(data)}"
+            )
+        dim = len(data[0]["embedding"])
+        if any(len(item["embedding"]) != dim for item in data):
+            raise EmbeddingError("OpenAI API batch error: embeddings differ in size")
+        out = np.zeros((len(texts), dim), dtype=np.float32)
+        for item in data:
+            out[item["index"]] = item["embedding"]
+        return out
+
+    def generate_embeddings_batch(self, texts: List[str]) -> np.ndarray:
+        """Generate embeddings for multiple texts."""
+        batches = self._sub_batches(texts)
+        if not batches:
+            return np.empty((0, self.get_dimension()), dtype=np.float32)
+        if len(batches) == 1:
+            return self._post_batch(batches[0])
+        # map() yields results in batch order, so concatenation keeps input order
+        workers = min(self.max_concurrency, len(batches))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="OpenAI") as pool:
+            return np.concatenate(list(pool.map(self._post_batch, batches)))
+
     def get_dimension(self) -> int:
         """Get embedding dimension."""
         from .models import ModelConfig
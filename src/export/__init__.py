@@ -1,6 +1,18 @@
 """Export module for final data output stages."""
 
-from .csv_exporter import CSVExporter
+from .csv_exporter import (
+    CSVExporter,
+    VECTOR_FORMATS,
+    decode_embedding,
+    encode_embedding,
+    npy_sidecar_path,
+)
 
-__all__ = ["CSVExporter"]
+__all__ = [
+    "CSVExporter",
+    "VECTOR_FORMATS",
+    "decode_embedding",
+    "encode_embedding",
+    "npy_sidecar_path",
+]
 
@@ -1,28 +1,267 @@
 """CSV export service for embeddings."""
 
+import base64
 import csv
+import gzip
+import io
 import json
 import logging
+import queue
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from functools import partial
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 from datetime import datetime
 
+import numpy as np
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from ..utils.exceptions import StorageError
 from config.settings import Settings
 
 logger = logging.getLogger(__name__)
 
+# Column order of exported CSV files (plus 'embedding' when included)
+CSV_FIELDNAMES = (
+    'id', 'content', 'source_url', 'document_title', 'last_updated',
+    'breadcrumbs', 'related_links', 'scraped_at', 'category',
+    'article_id', 'locale', 'page_hash', 'change_status',
+    'chunk_index', 'sub_chunk_index', 'chunk_id', 'doc_id'
+)
+
+# Encodings for the 'embedding' column: a JSON list of floats, or a base64
+# raw buffer of float16 / int8 values ('i8b64' adds an 'embedding_scale' column).
+# 'npy' leaves the column out and writes a float32 (rows, dim) matrix to a
+# '.npy' file next to the CSV instead (see npy_sidecar_path)
+VECTOR_FORMATS = ('json', 'f16b64', 'i8b64', 'npy')
+
+# Large buffers keep reads/writes of multi-hundred-MB files to few syscalls
+IO_BUFFER_SIZE = 1 << 20
+
+
+def _json_dumps(value: Any) -> str:
+    """Serialize a column value to JSON text, with orjson when available."""
+    if orjson is not None:
+        # orjson formats floats (and NumPy arrays) in C, well ahead of json.dumps
+        return orjson.dumps(value, option=orjson.OPT_SERIALIZE_NUMPY).decode('utf-8')
+    if isinstance(value, np.ndarray):
+        value = value.tolist()
+    return json.dumps(value)
+
+
+def encode_embedding(embedding: List[float], vector_format: str) -> Dict[str, Any]:
+    """
+    Encode an embedding vector as CSV column values.
+
+    Args:
+        embedding: Embedding vector
+        vector_format: One of VECTOR_FORMATS other than 'npy'
+
+    Returns:
+        Dictionary with 'embedding' (and 'embedding_scale' for 'i8b64')
+    """
+    if vector_format == 'npy':
+        raise ValueError("'npy' vectors are written to a sidecar file, not a CSV column")
+    if vector_format == 'json':
+        return {'embedding': _json_dumps(embedding)}
+    
+    vector = np.asarray(embedding, dtype=np.float32)
+    if vector_format == 'f16b64':
+        return {'embedding': base64.b64encode(vector.astype(np.float16).tobytes()).decode('ascii')}
+    
+    scale = float(np.abs(vector).max()) if vector.size else 0.0
+    quantized = np.round(vector / (scale or 1.0) * 127).astype(np.int8)
+    return {
+        'embedding': base64.b64encode(quantized.tobytes()).decode('ascii'),
+        'embedding_scale': scale,
+    }
+
+
+def decode_embedding(value: str, vector_format: str, scale: Optional[float] = None) -> np.ndarray:
+    """
+    Decode an 'embedding' CSV column back into a float32 vector.
+
+    Args:
+        value: Column value written by encode_embedding
+        vector_format: One of VECTOR_FORMATS
+        scale: The 'embedding_scale' column, required for 'i8b64'
+
+    Returns:
+        Embedding as a float32 numpy array
+    """
+    if vector_format == 'json':
+        parsed = orjson.loads(value) if orjson is not None else json.loads(value)
+        return np.asarray(parsed, dtype=np.float32)
+    
+    raw = base64.b64decode(value)
+    if vector_format == 'f16b64':
+        return np.frombuffer(raw, dtype=np.float16).astype(np.float32)
+    
+    return np.frombuffer(raw, dtype=np.int8).astype(np.float32) * (float(scale) / 127)
+
+
+def npy_sidecar_path(csv_path: Path) -> Path:
+    """
+    Return the '.npy' vector file that accompanies a CSV exported in 'npy' format.
+
+    Row i of the matrix (load with np.load, optionally mmap_mode='r') is the
+    embedding of CSV data row i.
+    """
+    csv_path = Path(csv_path)
+    name = csv_path.name
+    for suffix in ('.gz', '.csv'):
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    return csv_path.with_name(f"{name}.npy")
+
+
+class _NpyWriter:
+    """Collects float32 vectors on disk, then writes them as one .npy matrix."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.rows = 0
+        self.dim: Optional[int] = None
+        # The row count is only known at the end, so the raw buffer is
+        # spooled to a temporary file and copied behind the header on commit
+        self._raw = tempfile.TemporaryFile(dir=path.parent)
+
+    def append(self, embedding: Any) -> None:
+        """Append one vector; all vectors must share a dimension."""
+        vector = np.asarray(embedding, dtype='<f4')
+        if vector.ndim != 1:
+            raise ValueError(f"Expected a 1-D embedding, got shape {vector.shape}")
+        if self.dim is None:
+            self.dim = vector.shape[0]
+        elif vector.shape[0] != self.dim:
+            raise ValueError(f"Embedding dimension {vector.shape[0]} does not match {self.dim}")
+        self._raw.write(vector.tobytes())
+        self.rows += 1
+
+    def close(self, commit: bool = True) -> None:
+        """Write the .npy file (if commit) and release the temporary buffer."""
+        try:
+            if commit:
+                self._raw.seek(0)
+                header = {'descr': '<f4', 'fortran_order': False, 'shape': (self.rows, self.dim or 0)}
+                with open(self.path, 'wb') as f:
+                    np.lib.format.write_array_header_1_0(f, header)
+                    shutil.copyfileobj(self._raw, f, IO_BUFFER_SIZE)
+        finally:
+            self._raw.close()
+
+
+# Records parsed ahead of the CSV writer when streaming
+READ_AHEAD_SIZE = 1024
+
+_END = object()
+
+
+class _ProducerError:
+    """Carries an exception from the read-ahead thread to the consumer."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def _read_ahead(iterable: Iterable[Any], maxsize: int = READ_AHEAD_SIZE) -> Iterator[Any]:
+    """
+    Yield items from an iterable that is consumed on a background thread.
+
+    Lets JSON parsing run while the caller formats and writes rows. Errors
+    raised by the iterable are re-raised to the caller, and closing the
+    generator early stops the thread.
+    """
+    items = queue.Queue(maxsize)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+        except Exception as e:
+            put(_ProducerError(e))
+            return
+        put(_END)
+
+    thread = threading.Thread(target=produce, name="csv-export-reader", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = items.get()
+            if item is _END:
+                return
+            if isinstance(item, _ProducerError):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        thread.join()
+
+
+def _open_csv(path: Path) -> io.TextIOBase:
+    """Open a CSV file for writing, gzip-compressed (level 1) if it ends in '.gz'."""
+    if path.suffix != '.gz':
+        return open(path, 'w', newline='', encoding='utf-8', buffering=IO_BUFFER_SIZE)
+    
+    # Level 1 shrinks CSV several times over at close to copy speed
+    compressed = gzip.GzipFile(path, mode='wb', compresslevel=1)
+    return io.TextIOWrapper(
+        io.BufferedWriter(compressed, buffer_size=IO_BUFFER_SIZE),
+        encoding='utf-8',
+        newline=''
+    )
+
 
 class CSVExporter:
     """Exports embeddings from JSON format to CSV for RAG systems."""
 
-    def __init__(self, output_dir: Optional[Path] = None):
+    def __init__(
+        self,
+        output_dir: Optional[Path] = None,
+        vector_format: str = 'json',
+        compress: bool = False
+    ):
         """
         Initialize CSV exporter.
 
         Args:
             output_dir: Directory for CSV output (defaults to Settings.DATA_DIR / 'csv_export')
+            vector_format: Encoding of the embedding column, one of VECTOR_FORMATS
+                (default: 'json'). The base64 formats write one raw buffer per row
+                instead of formatting every float; 'npy' writes all vectors to a
+                float32 '.npy' file next to the CSV (see npy_sidecar_path).
+            compress: Write gzip-compressed '.csv.gz' files by default (default: False).
+                Any output filename ending in '.gz' is compressed regardless.
         """
+        if vector_format not in VECTOR_FORMATS:
+            raise ValueError(f"Invalid vector_format '{vector_format}', expected one of {VECTOR_FORMATS}")
+        self.vector_format = vector_format
+        self.suffix = '.csv.gz' if compress else '.csv'
+        
         if output_dir is None:
             self.output_dir = Settings.DATA_DIR / "csv_export"
         else:
@@ -57,87 +296,141 @@ class CSVExporter:
 
         if output_filename is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_filename = f"embeddings_{timestamp}.csv"
+            output_filename = f"embeddings_{timestamp}{self.suffix}"
 
         output_path = self.output_dir / output_filename
         
         try:
             logger.info(f"Exporting {len(embeddings)} embeddings to CSV...")
             logger.debug(f"Output path: {output_path}")
+            self._write_rows(embeddings, output_path, include_embedding)
+            logger.info(f"✅ Successfully exported {len(embeddings)} embeddings to {output_path}")
+            return output_path
             
-            # Define CSV fieldnames
-            fieldnames = [
-                'id', 'content', 'source_url', 'document_title', 'last_updated',
-                'breadcrumbs', 'related_links', 'scraped_at', 'category',
-                'article_id', 'locale', 'page_hash', 'change_status',
-                'chunk_index', 'sub_chunk_index', 'chunk_id', 'doc_id'
-            ]
-            
-            if include_embedding:
-                fieldnames.append('embedding')
-            
-            with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
+        except Exception as e:
+            logger.error(f"❌ Error exporting embeddings to CSV: {e}")
+            raise StorageError(f"Failed to export embeddings: {e}") from e
+
+    def _write_rows(
+        self,
+        records: Iterable[Dict[str, Any]],
+        output_path: Path,
+        include_embedding: bool = True
+    ) -> int:
+        """
+        Write embedding records to a CSV file as they are produced.
+
+        Args:
+            records: Iterable of embedding records (may be a lazy stream)
+            output_path: Destination CSV path
+            include_embedding: Whether to include embedding vector
+
+        Returns:
+            Number of rows written
+
+        Raises:
+            StorageError: If a record cannot be converted
+        """
+        sidecar = None
+        if include_embedding and self.vector_format == 'npy':
+            sidecar = _NpyWriter(npy_sidecar_path(output_path))
+        
+        count = 0
+        try:
+            with _open_csv(output_path) as csvfile:
+                # Positional rows skip DictWriter's per-field dict lookups
+                writer = csv.writer(csvfile)
+                writer.writerow(self._fieldnames(include_embedding))
                 
-                for i, record in enumerate(embeddings):
+                for i, record in enumerate(records):
                     try:
-                        row = self._convert_record_to_row(record, include_embedding)
+                        row = self._record_to_list(record, include_embedding)
+                        if sidecar is not None:
+                            sidecar.append(record.get('embedding', []))
                         writer.writerow(row)
                     except Exception as e:
                         logger.error(f"❌ Error converting record {i} (id: {record.get('id', 'unknown')}): {e}")
                         raise StorageError(f"Failed to convert record {i}: {e}") from e
-            
-            logger.info(f"✅ Successfully exported {len(embeddings)} embeddings to {output_path}")
-            return output_path
-            
-        except Exception as e:
-            logger.error(f"❌ Error exporting embeddings to CSV: {e}")
-            raise StorageError(f"Failed to export embeddings: {e}") from e
+                    count += 1
+        except BaseException:
+            if sidecar is not None:
+                sidecar.close(commit=False)
+            raise
+        
+        if sidecar is not None:
+            sidecar.close()
+            logger.debug(f"Wrote {sidecar.rows}x{sidecar.dim or 0} embedding matrix to {sidecar.path}")
+        return count
 
-    def _convert_record_to_row(
+    def _fieldnames(self, include_embedding: bool = True) -> List[str]:
+        """Return the CSV header for the configured vector format."""
+        fieldnames = list(CSV_FIELDNAMES)
+        if include_embedding and self.vector_format != 'npy':
+            fieldnames.append('embedding')
+            if self.vector_format == 'i8b64':
+                fieldnames.append('embedding_scale')
+        return fieldnames
+
+    def _record_to_list(
         self,
         record: Dict[str, Any],
         include_embedding: bool = True
-    ) -> Dict[str, Any]:
+    ) -> List[Any]:
         """
-        Convert an embedding record to a CSV row.
+        Convert an embedding record to a CSV row in _fieldnames() order.
 
         Args:
             record: Embedding record with 'id', 'content', 'metadata', 'embedding'
             include_embedding: Whether to include embedding vector
 
         Returns:
-            Dictionary representing CSV row
+            List of column values
         """
         metadata = record.get('metadata', {})
         
-        row = {
-            'id': record.get('id', ''),
-            'content': record.get('content', ''),
-            'source_url': metadata.get('source_url', ''),
-            'document_title': metadata.get('document_title', ''),
-            'last_updated': metadata.get('last_updated', ''),
-            'breadcrumbs': json.dumps(metadata.get('breadcrumbs', [])),
-            'related_links': json.dumps(metadata.get('related_links', [])),
-            'scraped_at': metadata.get('scraped_at', ''),
-            'category': json.dumps(metadata.get('category', [])),
-            'article_id': metadata.get('article_id', ''),
-            'locale': metadata.get('locale', ''),
-            'page_hash': metadata.get('page_hash', ''),
-            'change_status': metadata.get('change_status', ''),
-            'chunk_index': metadata.get('chunk_index', ''),
-            'sub_chunk_index': metadata.get('sub_chunk_index', ''),
-            'chunk_id': metadata.get('chunk_id', ''),
-            'doc_id': metadata.get('doc_id', ''),
-        }
-        
-        if include_embedding:
+        row = [
+            record.get('id', ''),
+            record.get('content', ''),
+            metadata.get('source_url', ''),
+            metadata.get('document_title', ''),
+            metadata.get('last_updated', ''),
+            _json_dumps(metadata.get('breadcrumbs', [])),
+            _json_dumps(metadata.get('related_links', [])),
+            metadata.get('scraped_at', ''),
+            _json_dumps(metadata.get('category', [])),
+            metadata.get('article_id', ''),
+            metadata.get('locale', ''),
+            metadata.get('page_hash', ''),
+            metadata.get('change_status', ''),
+            metadata.get('chunk_index', ''),
+            metadata.get('sub_chunk_index', ''),
+            metadata.get('chunk_id', ''),
+            metadata.get('doc_id', ''),
+        ]
+        
+        if include_embedding and self.vector_format != 'npy':
             embedding = record.get('embedding', [])
-            row['embedding'] = json.dumps(embedding)
+            row.extend(encode_embedding(embedding, self.vector_format).values())
         
         return row
 
+    def _convert_record_to_row(
+        self,
+        record: Dict[str, Any],
+        include_embedding: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Convert an embedding record to a CSV row keyed by column name.
+
+        Args:
+            record: Embedding record with 'id', 'content', 'metadata', 'embedding'
+            include_embedding: Whether to include embedding vector
+
+        Returns:
+            Dictionary representing CSV row
+        """
+        return dict(zip(self._fieldnames(include_embedding), self._record_to_list(record, include_embedding)))
+
     def export_from_json_file(
         self,
         json_file_path: Path,
@@ -163,35 +456,85 @@ class CSVExporter:
         if not json_file_path.exists():
             raise StorageError(f"JSON file not found: {json_file_path}")
         
+        # Use input filename as base for output if not specified
+        if output_filename is None:
+            output_filename = f"{json_file_path.stem}{self.suffix}"
+        
         try:
             logger.info(f"Loading embeddings from {json_file_path}...")
-            with open(json_file_path, 'r', encoding='utf-8') as f:
-                embeddings = json.load(f)
+            with open(json_file_path, 'rb', buffering=IO_BUFFER_SIZE) as f:
+                if ijson is not None and f.peek(64).lstrip()[:1] == b'[':
+                    return self._export_json_stream(f, output_filename, include_embedding)
+                embeddings = json.loads(f.read().decode('utf-8'))
             
             if not isinstance(embeddings, list):
                 raise StorageError(f"Expected list of embeddings, got {type(embeddings)}")
             
             logger.info(f"Loaded {len(embeddings)} embeddings from JSON")
-            
-            # Use input filename as base for output if not specified
-            if output_filename is None:
-                base_name = json_file_path.stem
-                output_filename = f"{base_name}.csv"
-            
             return self.export_embeddings(embeddings, output_filename, include_embedding)
             
         except json.JSONDecodeError as e:
             logger.error(f"❌ Invalid JSON format in {json_file_path}: {e}")
             raise StorageError(f"Invalid JSON file: {e}") from e
+        except StorageError:
+            raise
         except Exception as e:
             logger.error(f"❌ Error loading JSON file: {e}")
             raise StorageError(f"Failed to load JSON file: {e}") from e
 
+    def _export_json_stream(
+        self,
+        json_file,
+        output_filename: str,
+        include_embedding: bool = True
+    ) -> Optional[Path]:
+        """
+        Stream records from an open JSON array file straight into a CSV.
+
+        Records are parsed with ijson on a reader thread, a bounded queue
+        ahead of the writer, so memory stays flat regardless of file size and
+        parsing overlaps with formatting and writing rows.
+
+        Args:
+            json_file: Binary file object positioned at the start of a JSON array
+            output_filename: Output filename
+            include_embedding: Whether to include embedding vector
+
+        Returns:
+            Path to exported CSV file, or None if the array is empty
+
+        Raises:
+            StorageError: If the JSON is invalid or a record cannot be converted
+        """
+        output_path = self.output_dir / output_filename
+        records = _read_ahead(ijson.items(json_file, 'item', use_float=True))
+        
+        try:
+            with closing(records):
+                count = self._write_rows(records, output_path, include_embedding)
+        except ijson.JSONError as e:
+            output_path.unlink(missing_ok=True)
+            logger.error(f"❌ Invalid JSON format in {json_file.name}: {e}")
+            raise StorageError(f"Invalid JSON file: {e}") from e
+        except Exception:
+            output_path.unlink(missing_ok=True)
+            raise
+        
+        if count == 0:
+            output_path.unlink(missing_ok=True)
+            npy_sidecar_path(output_path).unlink(missing_ok=True)
+            logger.warning("⚠️  No embeddings to export")
+            return None
+        
+        logger.info(f"✅ Successfully exported {count} embeddings to {output_path}")
+        return output_path
+
     def batch_export_directory(
         self,
         input_dir: Path,
         pattern: str = "*.json",
-        include_embedding: bool = True
+        include_embedding: bool = True,
+        max_workers: int = 1
     ) -> List[Path]:
         """
         Export all JSON files in a directory to CSV.
@@ -200,6 +543,8 @@ class CSVExporter:
             input_dir: Directory containing JSON embedding files
             pattern: File pattern to match (default: "*.json")
             include_embedding: Whether to include embedding vectors
+            max_workers: Number of worker processes; files are independent, so
+                values above 1 convert them in parallel (default: 1, serial)
 
         Returns:
             List of paths to exported CSV files
@@ -219,21 +564,28 @@ class CSVExporter:
             return []
         
         logger.info(f"Found {len(json_files)} JSON files to export")
-        exported_files = []
         
-        for json_file in json_files:
-            try:
-                logger.info(f"Processing {json_file.name}...")
-                csv_path = self.export_from_json_file(
-                    json_file,
-                    include_embedding=include_embedding
-                )
-                exported_files.append(csv_path)
-            except Exception as e:
-                logger.error(f"❌ Failed to export {json_file.name}: {e}")
-                # Continue with other files
-                continue
+        workers = min(max_workers, len(json_files))
+        if workers > 1:
+            # The exporter is pickled, so each worker gets its own copy
+            export_one = partial(self._export_file, include_embedding=include_embedding)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(export_one, json_files))
+        else:
+            results = [self._export_file(json_file, include_embedding) for json_file in json_files]
+        
+        # Failed (and empty) files are logged and skipped
+        exported_files = [csv_path for csv_path in results if csv_path is not None]
         
         logger.info(f"✅ Successfully exported {len(exported_files)}/{len(json_files)} files")
         return exported_files
 
+    def _export_file(self, json_file: Path, include_embedding: bool = True) -> Optional[Path]:
+        """Export one file for a batch, logging instead of raising on failure."""
+        try:
+            logger.info(f"Processing {json_file.name}...")
+            return self.export_from_json_file(json_file, include_embedding=include_embedding)
+        except Exception as e:
+            logger.error(f"❌ Failed to export {json_file.name}: {e}")
+            return None
+
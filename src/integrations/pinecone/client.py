@@ -1,6 +1,7 @@
 """Pinecone vector database client for storing embeddings."""
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 from pinecone import Pinecone, ServerlessSpec
 
@@ -18,7 +19,8 @@ class PineconeClient(BaseIntegrationClient):
         api_key: Optional[str] = None,
         environment: Optional[str] = None,
         index_name: Optional[str] = None,
-        namespace: Optional[str] = None
+        namespace: Optional[str] = None,
+        upsert_workers: int = 8
     ):
         """
         Initialize Pinecone client.
@@ -28,6 +30,8 @@ class PineconeClient(BaseIntegrationClient):
             environment: Pinecone environment (from Settings if not provided)
             index_name: Index name (from Settings if not provided)
             namespace: Optional namespace for organizing vectors (from Settings if not provided)
+            upsert_workers: Upsert requests kept in flight at once; also sizes
+                the index's HTTP connection pool
         """
         super().__init__()
         self.api_key = api_key or Settings.PINECONE_API_KEY
@@ -40,8 +44,11 @@ class PineconeClient(BaseIntegrationClient):
         if not self.index_name:
             raise ValueError("Pinecone index name is required")
 
+        self.upsert_workers = max(1, upsert_workers)
+
         self.pc = None  # Pinecone client instance
         self.index = None  # Pinecone index instance
+        self._upsert_pool = None  # Threads issuing concurrent upserts, created on first use
 
     def connect(self) -> bool:
         """
@@ -60,7 +67,7 @@ class PineconeClient(BaseIntegrationClient):
                 self.logger.info("Available indexes: " + ", ".join([idx.name for idx in self.pc.list_indexes()]))
                 return False
             
-            self.index = self.pc.Index(self.index_name)
+            self.index = self.pc.Index(self.index_name, pool_threads=self.upsert_workers)
             
             # Test connection with health check
             if self.health_check():
@@ -84,6 +91,9 @@ class PineconeClient(BaseIntegrationClient):
         """
         try:
             # Pinecone doesn't require explicit disconnection
+            if self._upsert_pool is not None:
+                self._upsert_pool.shutdown()
+                self._upsert_pool = None
             self.index = None
             self.pc = None
             self._connected = False
@@ -145,27 +155,36 @@ class PineconeClient(BaseIntegrationClient):
             if target_namespace:
                 self.logger.info(f"   Using namespace: '{target_namespace}'")
 
-            # Upsert in batches
-            total_upserted = 0
+            # Format vectors for Pinecone and split into per-request batches
+            batches = []
             for i in range(0, len(vectors), batch_size):
-                batch = vectors[i:i + batch_size]
-                
-                # Format vectors for Pinecone
-                formatted_vectors = []
-                for vec in batch:
-                    formatted_vectors.append({
+                batches.append([
+                    {
                         "id": vec["id"],
                         "values": vec["values"],
                         "metadata": vec.get("metadata", {})
-                    })
-                
-                # Upsert batch
-                self.index.upsert(
-                    vectors=formatted_vectors,
-                    namespace=target_namespace
-                )
-                total_upserted += len(batch)
-                self.logger.debug(f"   Upserted batch {i//batch_size + 1}: {len(batch)} vectors")
+                    }
+                    for vec in vectors[i:i + batch_size]
+                ])
+
+            def upsert_batch(batch):
+                self.index.upsert(vectors=batch, namespace=target_namespace)
+                return len(batch)
+
+            # Submit every batch, then wait: requests overlap on the pooled
+            # connections instead of paying one round trip after another
+            if len(batches) > 1 and self.upsert_workers > 1:
+                if self._upsert_pool is None:
+                    self._upsert_pool = ThreadPoolExecutor(
+                        max_workers=self.upsert_workers, thread_name_prefix="pinecone-upsert"
+                    )
+                futures = [self._upsert_pool.submit(upsert_batch, batch) for batch in batches]
+                counts = [future.result() for future in futures]
+            else:
+                counts = [upsert_batch(batch) for batch in batches]
+
+            total_upserted = sum(counts)
+            self.logger.debug(f"   Upserted {len(batches)} batches")
 
             self.logger.info(f"✅ Successfully upserted {total_upserted} vectors")
             return {
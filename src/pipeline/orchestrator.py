@@ -20,6 +20,9 @@ from config.settings import Settings
 
 logger = logging.getLogger(__name__)
 
+# Seconds between progress log lines while the streaming scraper runs
+PROGRESS_INTERVAL = 2.0
+
 
 class PipelineOrchestrator:
     """Orchestrates the complete pipeline execution."""
@@ -58,6 +61,10 @@ class PipelineOrchestrator:
         logger.info(f"Pipeline storage mode: {self.storage_mode}")
         logger.info(f"Pipeline processing mode: {self.pipeline_mode}")
 
+    def close(self) -> None:
+        """Release resources held across runs (the embedding cache connection)."""
+        self.embedding_generator.close()
+
     def connect_s3(self) -> bool:
         """
         Connect to AWS S3.
@@ -570,13 +577,12 @@ class PipelineOrchestrator:
             logger.info("📊 MONITORING PROGRESS")
             logger.info("-" * 70)
             
-            # Wait for scraper to finish and queue to empty
-            # Poll for completion (scraper done + queue empty)
+            # Wait for the scraper to exit, then for the queue to drain
             max_wait = 600  # 10 minutes max
-            start_time = time.time()
+            deadline = time.monotonic() + max_wait
             last_stats = None
             
-            while time.time() - start_time < max_wait:
+            while scraper_process and scraper_process.poll() is None:
                 current_stats = self.stream_processor.get_stats()
                 
                 # Print stats if changed
@@ -589,24 +595,28 @@ class PipelineOrchestrator:
                         f"Pinecone={current_stats['chunks_uploaded_pinecone']}, "
                         f"Errors={current_stats['errors']}"
                     )
-                    last_stats = current_stats.copy()
-                
-                # Check if scraper is still running
-                scraper_running = scraper_process and scraper_process.poll() is None
-                
-                # Check if we're done: scraper finished AND queue is empty
-                if not scraper_running and \
-                   self.stream_processor.file_queue.empty() and \
-                   self.stream_processor.file_queue.unfinished_tasks == 0:
-                    # Wait a bit more to ensure all files are processed
-                    logger.info("🛑 Scraper finished. Waiting for remaining items to be processed...")
-                    time.sleep(5)
-                    if self.stream_processor.file_queue.empty() and \
-                       self.stream_processor.file_queue.unfinished_tasks == 0:
-                        logger.info("✅ All items processed")
-                        break
+                    last_stats = current_stats
                 
-                time.sleep(2)
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    # Returns as soon as the scraper exits
+                    scraper_process.wait(timeout=min(PROGRESS_INTERVAL, remaining))
+                except subprocess.TimeoutExpired:
+                    pass
+            
+            # No new files arrive once the scraper is done; stopping the
+            # watcher hands the events for its last files to the queue
+            if scraper_process and scraper_process.poll() is None:
+                logger.warning(f"⚠️  Scraper still running after {max_wait}s; no longer watching for new items")
+            else:
+                logger.info("🛑 Scraper finished. Waiting for remaining items to be processed...")
+            self.stream_processor.stop_watching()
+            if self.stream_processor.wait_for_queue(timeout=max(deadline - time.monotonic(), 1.0)):
+                logger.info("✅ All items processed")
+            else:
+                logger.warning(f"⚠️  Timed out after {max_wait}s with items still queued")
             
             # Get final stats
             final_stats = self.stream_processor.get_stats()
@@ -643,8 +653,7 @@ class PipelineOrchestrator:
         finally:
             # Cleanup
             if self.stream_processor:
-                self.stream_processor.stop_workers()
-                self.stream_processor.stop_watching()
+                self.stream_processor.close()
             if self.s3_client:
                 self.s3_client.disconnect()
             if self.pinecone_client:
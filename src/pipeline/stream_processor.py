@@ -134,11 +134,13 @@ class StreamProcessor:
         if self.observer:
             self.observer.stop()
             self.observer.join()
+            self.observer = None
             logger.info("File watcher stopped")
     
     def start_workers(self) -> None:
         """Start worker threads for processing files."""
         logger.info(f"🚀 Starting {self.max_workers} processing workers...")
+        self.stop_event.clear()
         
         for i in range(self.max_workers):
             worker = threading.Thread(
@@ -156,36 +158,46 @@ class StreamProcessor:
         logger.info("Stopping workers...")
         self.stop_event.set()
         
+        # Wake workers blocked on an empty queue
+        for _ in self.workers:
+            self.file_queue.put(None)
+        
         for worker in self.workers:
             worker.join(timeout=5.0)
+        self.workers = []
         
         logger.info("Workers stopped")
     
+    def close(self) -> None:
+        """Stop workers and the file watcher, then close the embedding cache."""
+        self.stop_workers()
+        self.stop_watching()
+        self.embedding_generator.close()
+    
     def _worker_loop(self) -> None:
         """Main loop for worker threads."""
         worker_name = threading.current_thread().name
         logger.debug(f"{worker_name} started")
         
-        while not self.stop_event.is_set():
+        while True:
+            # Block until work arrives; a None sentinel means shut down
+            file_path = self.file_queue.get()
             try:
-                # Get file from queue with timeout
-                try:
-                    file_path = self.file_queue.get(timeout=1.0)
-                except queue.Empty:
+                if file_path is None:
+                    break
+                if self.stop_event.is_set():
+                    # Shutting down: skip remaining files but keep draining
+                    # until this worker's own sentinel, so none is left queued
+                    logger.debug(f"{worker_name} skipping {file_path.name} (stopping)")
                     continue
                 
-                # Process the file
-                try:
-                    self._process_file(file_path, worker_name)
-                except Exception as e:
-                    logger.error(f"{worker_name} error processing {file_path.name}: {e}", exc_info=True)
-                    with self.stats_lock:
-                        self.stats["errors"] += 1
-                finally:
-                    self.file_queue.task_done()
-                    
+                self._process_file(file_path, worker_name)
             except Exception as e:
-                logger.error(f"{worker_name} unexpected error: {e}", exc_info=True)
+                logger.error(f"{worker_name} error processing {file_path.name}: {e}", exc_info=True)
+                with self.stats_lock:
+                    self.stats["errors"] += 1
+            finally:
+                self.file_queue.task_done()
         
         logger.debug(f"{worker_name} stopped")
     
@@ -316,12 +328,13 @@ class StreamProcessor:
         """
         try:
             if timeout:
-                # Wait with timeout
-                start_time = time.time()
-                while not self.file_queue.empty() or self.file_queue.unfinished_tasks > 0:
-                    if time.time() - start_time > timeout:
-                        return False
-                    time.sleep(0.5)
+                # Woken by the queue's own condition when the last task_done()
+                # lands, so this returns immediately instead of on a poll tick
+                all_tasks_done = self.file_queue.all_tasks_done
+                with all_tasks_done:
+                    return all_tasks_done.wait_for(
+                        lambda: self.file_queue.unfinished_tasks == 0, timeout
+                    )
             else:
                 # Wait indefinitely
                 self.file_queue.join()
@@ -11,6 +11,9 @@ from config.settings import Settings
 
 logger = logging.getLogger(__name__)
 
+# Metadata keys set by the markdown header splitter, outermost first
+_HEADER_LEVELS = ("h1", "h2", "h3", "h4")
+
 
 class SemanticChunker:
     """Semantic chunker for splitting documents intelligently."""
@@ -62,10 +65,9 @@ class SemanticChunker:
             A descriptive title for the chunk
         """
         # Check for headers in order of specificity (h4 -> h3 -> h2 -> h1)
-        header_hierarchy = []
-        for level in ["h1", "h2", "h3", "h4"]:
-            if level in chunk_metadata and chunk_metadata[level]:
-                header_hierarchy.append(chunk_metadata[level])
+        header_hierarchy = [
+            chunk_metadata[level] for level in _HEADER_LEVELS if chunk_metadata.get(level)
+        ]
         
         if header_hierarchy:
             # Use the most specific header (last in hierarchy)
@@ -178,9 +180,9 @@ class SemanticChunker:
 
         # Add document-level metadata and generate chunk IDs
         logger.debug(f"Step 3: Adding metadata and generating IDs for {len(final_chunks)} chunks...")
+        # Generate chunk IDs from the last URL segment and index
+        url_part = url.rsplit("/", 1)[-1] if url else "unknown"
         for i, chunk in enumerate(final_chunks):
-            # Generate chunk ID from URL and index
-            url_part = url.split("/")[-1] if url else "unknown"
             chunk["id"] = f"{url_part}_{i}"
             chunk["metadata"]["chunk_id"] = chunk["id"]
             chunk["metadata"]["doc_id"] = url
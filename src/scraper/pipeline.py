@@ -4,6 +4,7 @@ import logging
 import hashlib
 from itemadapter import ItemAdapter
 from scrapy.exceptions import DropItem
+from twisted.internet import threads
 from pathlib import Path
 
 from ..utils.validators import validate_document
@@ -24,8 +25,8 @@ class ValidationPipeline:
         item_dict = dict(adapter)
 
         if not validate_document(item_dict):
-            logger.error(f"❌ Validation failed for item: {item.get('url', 'Unknown')}")
-            raise DropItem(f"Invalid item: {item.get('url', 'Unknown')}")
+            logger.error(f"❌ Validation failed for item: {adapter.get('url', 'Unknown')}")
+            raise DropItem(f"Invalid item: {adapter.get('url', 'Unknown')}")
 
         logger.debug(f"✓ Validated item: {item_dict.get('title', 'Untitled')[:40]}...")
         return item
@@ -44,21 +45,25 @@ class StoragePipeline:
         """Collect items for batch saving."""
         adapter = ItemAdapter(item)
         self.items.append(dict(adapter))
-        logger.debug(f"Collected item {len(self.items)}: {item.get('title', 'Untitled')[:40]}...")
+        logger.debug(f"Collected item {len(self.items)}: {adapter.get('title', 'Untitled')[:40]}...")
         return item
 
     def close_spider(self, spider):
         """Save all collected items when spider closes."""
         if self.items:
-            try:
-                logger.info(f"Saving {len(self.items)} items to raw storage...")
-                self.file_manager.save_raw_data(self.items)
-                logger.info(f"✅ Saved {len(self.items)} items to raw storage")
-            except Exception as e:
-                logger.error(f"❌ Error saving items: {e}")
-                raise
-        else:
-            logger.warning("No items to save")
+            # Serializing every item at once is slow; keep it off the reactor
+            return threads.deferToThread(self._save_items)
+        logger.warning("No items to save")
+
+    def _save_items(self):
+        """Write collected items to raw storage (runs in a worker thread)."""
+        try:
+            logger.info(f"Saving {len(self.items)} items to raw storage...")
+            self.file_manager.save_raw_data(self.items)
+            logger.info(f"✅ Saved {len(self.items)} items to raw storage")
+        except Exception as e:
+            logger.error(f"❌ Error saving items: {e}")
+            raise
 
 
 class StreamingStoragePipeline:
@@ -99,21 +104,29 @@ class StreamingStoragePipeline:
         adapter = ItemAdapter(item)
         item_dict = dict(adapter)
         
+        # Generate unique filename for this item
+        filename = self._generate_filename(item_dict)
+        
+        # Write in a worker thread so the reactor keeps fetching pages;
+        # Scrapy waits on the returned Deferred before the item moves on
+        d = threads.deferToThread(self._save_item, item_dict, filename)
+        d.addCallback(self._saved, item, item_dict, filename)
+        return d
+
+    def _save_item(self, item_dict: dict, filename: str) -> None:
+        """Write one item to raw storage (runs in a worker thread)."""
         try:
-            # Generate unique filename for this item
-            filename = self._generate_filename(item_dict)
-            
-            # Save immediately (single-item list for compatibility)
+            # Single-item list for compatibility
             self.file_manager.save_raw_data([item_dict], filename=filename)
-            
-            self.item_count += 1
-            title = item_dict.get('title', 'Untitled')[:50]
-            logger.info(f"📤 [{self.item_count}] Saved: {title}... → {filename}")
-            
         except Exception as e:
             logger.error(f"❌ Error saving item: {e}")
             raise
-        
+
+    def _saved(self, _, item, item_dict: dict, filename: str):
+        """Count and log a saved item (back on the reactor thread)."""
+        self.item_count += 1
+        title = item_dict.get('title', 'Untitled')[:50]
+        logger.info(f"📤 [{self.item_count}] Saved: {title}... → {filename}")
         return item
 
     def close_spider(self, spider):
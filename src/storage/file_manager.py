@@ -6,12 +6,24 @@ from pathlib import Path
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from ..utils.exceptions import StorageError
 from config.settings import Settings
 
 logger = logging.getLogger(__name__)
 
 
+def _json_default(obj: Any) -> Any:
+    """Serialize NumPy embedding arrays when orjson is unavailable."""
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
 class FileManager:
     """Manages local file storage operations."""
 
@@ -195,7 +207,8 @@ class FileManager:
         Save chunks with embeddings to JSON file.
 
         Args:
-            chunks_with_embeddings: List of chunks with embeddings
+            chunks_with_embeddings: List of chunks with embeddings (lists of
+                floats or NumPy arrays; float32 arrays are written more compactly)
             filename: Optional filename (defaults to timestamped name)
 
         Returns:
@@ -209,10 +222,18 @@ class FileManager:
         file_path.parent.mkdir(parents=True, exist_ok=True)
 
         try:
-            # Use larger buffer for large files and write in chunks
-            # to avoid BlockingIOError on very large embedding files
-            with open(file_path, "w", encoding="utf-8", buffering=8192*16) as f:
-                json.dump(chunks_with_embeddings, f, ensure_ascii=False, indent=None)
+            if orjson is not None:
+                # Serializes float32 arrays directly, without boxing each value
+                file_path.write_bytes(
+                    orjson.dumps(chunks_with_embeddings, option=orjson.OPT_SERIALIZE_NUMPY)
+                )
+            else:
+                # Use larger buffer for large files and write in chunks
+                # to avoid BlockingIOError on very large embedding files
+                with open(file_path, "w", encoding="utf-8", buffering=8192*16) as f:
+                    json.dump(
+                        chunks_with_embeddings, f, ensure_ascii=False, indent=None, default=_json_default
+                    )
             logger.info(f"Saved {len(chunks_with_embeddings)} chunks with embeddings to {file_path}")
             return file_path
         except (IOError, OSError, BlockingIOError) as e:
@@ -225,7 +246,7 @@ class FileManager:
                     for i, chunk in enumerate(chunks_with_embeddings):
                         if i > 0:
                             f.write(",")
-                        f.write(json.dumps(chunk, ensure_ascii=False))
+                        f.write(json.dumps(chunk, ensure_ascii=False, default=_json_default))
                     f.write("]")
                 logger.info(f"Successfully saved {len(chunks_with_embeddings)} chunks (retry)")
                 return file_path
@@ -251,8 +272,17 @@ class FileManager:
             raise StorageError(f"Embeddings file not found: {file_path}")
 
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            raw = file_path.read_bytes()
+            data = None
+            if orjson is not None:
+                try:
+                    data = orjson.loads(raw)
+                except orjson.JSONDecodeError:
+                    # Files written by json.dump may hold NaN/Infinity tokens,
+                    # which orjson rejects; the stdlib parser accepts them
+                    logger.debug(f"orjson could not parse {file_path.name}, falling back to json")
+            if data is None:
+                data = json.loads(raw)
             logger.info(f"Loaded {len(data)} chunks with embeddings from {file_path}")
             return data
         except Exception as e:
@@ -1,6 +1,8 @@
 """Data validation utilities."""
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
+
+import numpy as np
 
 
 def validate_chunk(chunk: Dict[str, Any]) -> bool:
@@ -17,16 +19,22 @@ def validate_chunk(chunk: Dict[str, Any]) -> bool:
     return all(field in chunk for field in required_fields)
 
 
-def validate_embedding(embedding: List[float]) -> bool:
+def validate_embedding(embedding: Union[List[float], np.ndarray]) -> bool:
     """
-    Validate that an embedding is a list of numbers.
+    Validate that an embedding is a list (or 1-D numeric array) of numbers.
 
     Args:
-        embedding: List of floating point numbers
+        embedding: List of floating point numbers, or a 1-D numpy array
 
     Returns:
         True if embedding is valid
     """
+    if isinstance(embedding, np.ndarray):
+        return bool(
+            embedding.ndim == 1
+            and embedding.size > 0
+            and np.issubdtype(embedding.dtype, np.number)
+        )
     if not isinstance(embedding, list):
         return False
     if len(embedding) == 0:
@@ -9,10 +9,20 @@ Testing Strategy:
 
 import pytest
 import csv
+import gzip
 import json
 import tempfile
 from pathlib import Path
-from src.export.csv_exporter import CSVExporter
+
+import numpy as np
+
+from src.export.csv_exporter import (
+    CSVExporter,
+    _read_ahead,
+    decode_embedding,
+    encode_embedding,
+    npy_sidecar_path,
+)
 from src.utils.exceptions import StorageError
 
 
@@ -298,6 +308,60 @@ class TestCSVExporter:
         with pytest.raises(StorageError, match="Invalid JSON"):
             self.exporter.export_from_json_file(invalid_json)
 
+    def test_export_from_json_file_streams_records(self):
+        """Test that streamed JSON export matches exporting the loaded list."""
+        embeddings = [
+            {
+                'id': f'test_{i}',
+                'content': f'Test content {i}',
+                'metadata': {'source_url': f'https://example.com/{i}', 'breadcrumbs': ['Home']},
+                'embedding': [0.125 * i, -0.5, 1e-7]
+            }
+            for i in range(3)
+        ]
+        json_file = self.temp_dir / 'stream.json'
+        with open(json_file, 'w') as f:
+            json.dump(embeddings, f)
+        
+        streamed = self.exporter.export_from_json_file(json_file)
+        loaded = self.exporter.export_embeddings(embeddings, 'loaded.csv')
+        
+        assert streamed == self.temp_dir / 'stream.csv'
+        assert streamed.read_text(encoding='utf-8') == loaded.read_text(encoding='utf-8')
+
+    def test_export_from_json_file_empty_list(self):
+        """Test that an empty JSON array produces no CSV file."""
+        json_file = self.temp_dir / 'empty.json'
+        json_file.write_text(' []')
+        
+        assert self.exporter.export_from_json_file(json_file) is None
+        assert not (self.temp_dir / 'empty.csv').exists()
+
+    def test_export_from_json_file_truncated_array(self):
+        """Test that a truncated JSON array is rejected and leaves no partial CSV."""
+        json_file = self.temp_dir / 'truncated.json'
+        json_file.write_text('[{"id": "test_1", "content": "Test"}, {"id": ')
+        
+        with pytest.raises(StorageError, match="Invalid JSON"):
+            self.exporter.export_from_json_file(json_file)
+        assert not (self.temp_dir / 'truncated.csv').exists()
+
+    def test_export_from_json_file_requires_list(self):
+        """Test that a JSON object at the top level is rejected."""
+        json_file = self.temp_dir / 'object.json'
+        json_file.write_text('{"id": "test_1"}')
+        
+        with pytest.raises(StorageError, match="Expected list"):
+            self.exporter.export_from_json_file(json_file)
+
+    def test_export_from_json_file_keeps_storage_errors(self):
+        """Test that conversion errors are re-raised as-is, not re-wrapped."""
+        json_file = self.temp_dir / 'bad_record.json'
+        json_file.write_text('[{"id": "test_1", "metadata": "not a dict"}]')
+        
+        with pytest.raises(StorageError, match="^Failed to convert record 0"):
+            self.exporter.export_from_json_file(json_file)
+
     def test_batch_export_empty_directory(self):
         """Test batch export with empty directory."""
         empty_dir = self.temp_dir / 'empty'
@@ -340,6 +404,104 @@ class TestCSVExporter:
         assert len(exported_files) == 1
         assert exported_files[0].exists()
 
+    def test_batch_export_parallel(self):
+        """Test batch export with worker processes, skipping invalid files."""
+        test_dir = self.temp_dir / 'parallel_test'
+        test_dir.mkdir()
+        
+        for i in range(3):
+            with open(test_dir / f'valid_{i}.json', 'w') as f:
+                json.dump([{'id': f'test_{i}', 'content': 'Test', 'embedding': [0.1] * 4}], f)
+        (test_dir / 'invalid.json').write_text('{ invalid }')
+        
+        exported_files = self.exporter.batch_export_directory(test_dir, max_workers=4)
+        
+        assert sorted(p.name for p in exported_files) == ['valid_0.csv', 'valid_1.csv', 'valid_2.csv']
+        assert all(p.parent == self.temp_dir for p in exported_files)
+
+    @pytest.mark.parametrize("vector_format,tolerance", [
+        ('json', 1e-7),
+        ('f16b64', 1e-3),
+        ('i8b64', 1e-2),
+    ])
+    def test_export_vector_formats_round_trip(self, vector_format, tolerance):
+        """Test that each vector format decodes back to the original embedding."""
+        embedding = [0.5, -0.25, 0.125, -0.9, 0.0]
+        exporter = CSVExporter(output_dir=self.temp_dir, vector_format=vector_format)
+        output_file = exporter.export_embeddings(
+            [{'id': 'test_1', 'content': 'Test', 'embedding': embedding}],
+            f'test_{vector_format}.csv'
+        )
+        
+        with open(output_file, 'r', encoding='utf-8') as f:
+            row = next(csv.DictReader(f))
+        
+        assert ('embedding_scale' in row) == (vector_format == 'i8b64')
+        decoded = decode_embedding(row['embedding'], vector_format, row.get('embedding_scale'))
+        assert decoded.tolist() == pytest.approx(embedding, abs=tolerance)
+
+    def test_export_npy_sidecar(self):
+        """Test that 'npy' writes vectors to a float32 matrix beside a metadata CSV."""
+        embeddings = [{'id': f'test_{i}', 'content': 'Test', 'embedding': [float(i), 0.5, -1.0]} for i in range(3)]
+        json_file = self.temp_dir / 'vectors.json'
+        with open(json_file, 'w') as f:
+            json.dump(embeddings, f)
+        
+        exporter = CSVExporter(output_dir=self.temp_dir, vector_format='npy', compress=True)
+        output_file = exporter.export_from_json_file(json_file)
+        
+        assert npy_sidecar_path(output_file) == self.temp_dir / 'vectors.npy'
+        with gzip.open(output_file, 'rt', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        assert [row['id'] for row in rows] == ['test_0', 'test_1', 'test_2']
+        assert 'embedding' not in rows[0]
+        
+        matrix = np.load(npy_sidecar_path(output_file), mmap_mode='r')
+        assert matrix.dtype == np.float32
+        assert matrix.tolist() == [e['embedding'] for e in embeddings]
+
+    def test_export_npy_sidecar_rejects_mixed_dimensions(self):
+        """Test that 'npy' export fails without leaving a sidecar on ragged vectors."""
+        exporter = CSVExporter(output_dir=self.temp_dir, vector_format='npy')
+        embeddings = [
+            {'id': 'test_1', 'content': 'Test', 'embedding': [0.1, 0.2]},
+            {'id': 'test_2', 'content': 'Test', 'embedding': [0.1]},
+        ]
+        
+        with pytest.raises(StorageError):
+            exporter.export_embeddings(embeddings, 'ragged.csv')
+        assert not (self.temp_dir / 'ragged.npy').exists()
+
+    def test_export_compressed(self):
+        """Test that compress=True writes gzip CSV with the same content."""
+        embeddings = [{'id': f'test_{i}', 'content': 'Test ' * 50, 'embedding': [0.1] * 384} for i in range(20)]
+        json_file = self.temp_dir / 'compressed.json'
+        with open(json_file, 'w') as f:
+            json.dump(embeddings, f)
+        
+        exporter = CSVExporter(output_dir=self.temp_dir, compress=True)
+        output_file = exporter.export_from_json_file(json_file)
+        plain_file = self.exporter.export_from_json_file(json_file)
+        
+        assert output_file.name == 'compressed.csv.gz'
+        with gzip.open(output_file, 'rb') as f:
+            assert f.read() == plain_file.read_bytes()
+        assert output_file.stat().st_size < plain_file.stat().st_size
+
+    def test_invalid_vector_format(self):
+        """Test that unknown vector formats are rejected."""
+        with pytest.raises(ValueError, match="vector_format"):
+            CSVExporter(output_dir=self.temp_dir, vector_format='csv')
+
+    def test_encode_json_embedding_from_ndarray(self):
+        """Test that NumPy embeddings encode to the same JSON column as lists."""
+        vector = np.array([0.5, -0.25, 1.0], dtype=np.float32)
+        
+        encoded = encode_embedding(vector, 'json')
+        
+        assert json.loads(encoded['embedding']) == [0.5, -0.25, 1.0]
+        assert encoded == encode_embedding([0.5, -0.25, 1.0], 'json')
+
     def test_convert_record_with_empty_arrays(self):
         """Test converting record with empty arrays in metadata."""
         record = {
@@ -435,3 +597,20 @@ class TestCSVExporter:
             assert '你好' in rows[0]['content']
             assert 'Unicode тест' in rows[0]['document_title']
 
+    def test_read_ahead_preserves_order_and_errors(self):
+        """Test that read-ahead yields items in order and re-raises producer errors."""
+        assert list(_read_ahead(range(100), maxsize=4)) == list(range(100))
+        
+        def failing():
+            yield 1
+            raise ValueError("boom")
+        
+        reader = _read_ahead(failing())
+        assert next(reader) == 1
+        with pytest.raises(ValueError, match="boom"):
+            next(reader)
+        
+        # Closing early stops the producer even when its queue is full
+        reader = _read_ahead(iter(range(1000)), maxsize=2)
+        assert next(reader) == 0
+        reader.close()
@@ -0,0 +1,54 @@
+"""Unit tests for the persistent embedding cache."""
+
+import pytest
+
+from src.embeddings.cache import EmbeddingCache
+
+
+class TestEmbeddingCache:
+    """Test EmbeddingCache lookups and persistence."""
+
+    def test_round_trip_as_float32(self, tmp_path):
+        """Test that stored vectors come back (as float32) and misses are omitted."""
+        path = tmp_path / "cache.sqlite"
+        key = EmbeddingCache.key("hello")
+
+        with EmbeddingCache("provider:model", path) as cache:
+            cache.put_many([(key, [0.1, -0.5, 2.0])])
+            found = cache.get_many([key, EmbeddingCache.key("missing")])
+
+        assert list(found) == [key]
+        assert found[key] == pytest.approx([0.1, -0.5, 2.0], abs=1e-7)
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test that entries survive reopening the database."""
+        path = tmp_path / "cache.sqlite"
+        key = EmbeddingCache.key("hello")
+
+        with EmbeddingCache("provider:model", path) as cache:
+            cache.put_many([(key, [1.0, 2.0])])
+
+        with EmbeddingCache("provider:model", path) as cache:
+            assert cache.get_many([key]) == {key: [1.0, 2.0]}
+
+    def test_namespaces_are_isolated(self, tmp_path):
+        """Test that vectors from another model are never returned."""
+        path = tmp_path / "cache.sqlite"
+        key = EmbeddingCache.key("hello")
+
+        with EmbeddingCache("provider:model-a", path) as cache:
+            cache.put_many([(key, [1.0])])
+
+        with EmbeddingCache("provider:model-b", path) as cache:
+            assert cache.get_many([key]) == {}
+
+    def test_large_lookup(self, tmp_path):
+        """Test lookups with more keys than fit in one SQL statement."""
+        keys = [EmbeddingCache.key(str(i)) for i in range(1200)]
+
+        with EmbeddingCache("provider:model", tmp_path / "cache.sqlite") as cache:
+            cache.put_many((key, [float(i)]) for i, key in enumerate(keys))
+            found = cache.get_many(keys)
+
+        assert len(found) == 1200
+        assert found[keys[1199]] == [1199.0]
@@ -6,9 +6,12 @@ Testing Strategy:
 - Run scripts/test_scraper_10pages.py first to generate real test data
 """
 
+import numpy as np
 import pytest
-from unittest.mock import Mock, patch
-from src.embeddings.generator import EmbeddingGenerator
+from unittest.mock import MagicMock, Mock, call, patch
+from src.embeddings.cache import EmbeddingCache
+from src.embeddings.generator import EmbeddingGenerator, l2_normalize
+from src.embeddings.providers import OllamaProvider, OpenAIProvider, SentenceTransformerProvider
 from src.processor.preprocessor import Preprocessor
 from src.processor.chunker import SemanticChunker
 from src.utils.exceptions import EmbeddingError
@@ -135,3 +138,296 @@ class TestEmbeddingGenerator:
 
         assert len(processed) == 0
 
+
+def test_l2_normalize():
+    """Test that vectors are scaled to unit length and zero vectors kept."""
+    normalized = l2_normalize([[3.0, 4.0], [0.0, 0.0]])
+
+    assert normalized[0] == pytest.approx([0.6, 0.8])
+    assert normalized[1] == [0.0, 0.0]
+    assert l2_normalize([]) == []
+
+
+@pytest.mark.parametrize(
+    "device, precision, expected",
+    [("cuda:0", "auto", "fp16"), ("cpu", "auto", "fp32"), ("cpu", "bf16", "bf16")],
+)
+def test_sentence_transformer_precision(device, precision, expected):
+    """Test that the model is cast to the requested inference precision."""
+    fake_module = Mock()
+    model = fake_module.SentenceTransformer.return_value
+    model.device = device
+    with patch.dict("sys.modules", {"sentence_transformers": fake_module, "torch": Mock()}), patch.dict(
+        "src.embeddings.providers._MODEL_CACHE", clear=True
+    ):
+        provider = SentenceTransformerProvider("test-model", precision=precision)
+
+    assert provider.precision == expected
+    assert model.half.called == (expected == "fp16")
+    assert model.bfloat16.called == (expected == "bf16")
+
+
+def test_sentence_transformer_truncates_long_texts():
+    """Test that texts are cut to a multiple of max_seq_length before encoding."""
+    fake_module = Mock()
+    model = fake_module.SentenceTransformer.return_value
+    model.device = "cpu"
+    model.max_seq_length = 4
+    model.encode.return_value = np.zeros((3, 2), dtype=np.float32)
+    with patch.dict("sys.modules", {"sentence_transformers": fake_module, "torch": MagicMock()}), patch.dict(
+        "src.embeddings.providers._MODEL_CACHE", clear=True
+    ):
+        provider = SentenceTransformerProvider("test-model")
+        provider.generate_embeddings_batch(["x" * 100, "x" * 60, "short"])
+
+    # Only text past 16 characters per token is cut; the tokenizer does the rest
+    assert model.encode.call_args[0][0] == ["x" * 64, "x" * 60, "short"]
+
+
+def test_sentence_transformer_onnx_backend():
+    """Test that non-torch backends are loaded natively and never cast."""
+    fake_module = Mock()
+    model = fake_module.SentenceTransformer.return_value
+    with patch.dict("sys.modules", {"sentence_transformers": fake_module, "torch": Mock()}), patch.dict(
+        "src.embeddings.providers._MODEL_CACHE", clear=True
+    ):
+        provider = SentenceTransformerProvider("test-model", precision="fp16", backend="onnx")
+
+    fake_module.SentenceTransformer.assert_called_once_with("test-model", device=None, backend="onnx")
+    assert provider.precision == "fp32"
+    model.half.assert_not_called()
+
+
+def test_sentence_transformer_model_shared():
+    """Test that providers with the same configuration share one loaded model."""
+    fake_module = Mock()
+    fake_module.SentenceTransformer.return_value.device = "cpu"
+    fake_torch = Mock()
+    with patch.dict("sys.modules", {"sentence_transformers": fake_module, "torch": fake_torch}), patch.dict(
+        "src.embeddings.providers._MODEL_CACHE", clear=True
+    ):
+        first = SentenceTransformerProvider("test-model")
+        second = SentenceTransformerProvider("test-model")
+        other = SentenceTransformerProvider("test-model", precision="fp16")
+
+    assert first.model is second.model
+    assert fake_module.SentenceTransformer.call_count == 2
+    fake_torch.set_num_threads.assert_called_once()
+    assert other.precision == "fp16"
+
+
+def test_ollama_batch_runs_concurrently_in_order():
+    """Test that Ollama batches are fanned out and returned in input order."""
+    provider = OllamaProvider("test-model", "http://ollama:11434/", max_concurrency=4)
+
+    def post(url, json, timeout):
+        response = Mock()
+        response.json.return_value = {"embedding": [float(len(json["prompt"])), 0.0]}
+        return response
+
+    with patch.object(provider.session, "post", side_effect=post) as session_post:
+        embeddings = provider.generate_embeddings_batch(["a", "bbb", "cc"])
+
+    assert embeddings.tolist() == [[1.0, 0.0], [3.0, 0.0], [2.0, 0.0]]
+    assert session_post.call_count == 3
+    assert session_post.call_args[0][0] == "http://ollama:11434/api/embeddings"
+
+
+def test_openai_batch_split_into_request_sized_chunks():
+    """Test that oversized OpenAI batches are split and reassembled in order."""
+    provider = OpenAIProvider("test-model", "key", "https://api.example.com/v1/", max_concurrency=2)
+
+    def post(url, headers, json, timeout):
+        response = Mock()
+        # The API may return items out of order; each carries its index
+        data = [
+            {"index": i, "embedding": [float(len(text)), 1.0]} for i, text in enumerate(json["input"])
+        ]
+        response.json.return_value = {"data": data[::-1]}
+        return response
+
+    texts = ["x" * (i % 7 + 1) for i in range(5000)]
+    with patch.object(provider.session, "post", side_effect=post) as session_post:
+        embeddings = provider.generate_embeddings_batch(texts)
+
+    assert session_post.call_count == 3
+    assert all(len(c.kwargs["json"]["input"]) <= 2048 for c in session_post.call_args_list)
+    assert session_post.call_args.kwargs["headers"]["Authorization"] == "Bearer key"
+    assert embeddings.dtype == np.float32
+    assert embeddings[:, 0].tolist() == [float(len(text)) for text in texts]
+
+
+
+@pytest.mark.parametrize("data", [
+    [],
+    [{"index": 0, "embedding": [0.1, 0.2]}],
+    [{"index": 0, "embedding": [0.1, 0.2]}, {"index": 0, "embedding": [0.3, 0.4]}],
+    [{"index": 0, "embedding": [0.1, 0.2]}, {"index": 1, "embedding": [0.3]}],
+])
+def test_openai_batch_rejects_incomplete_responses(data):
+    """Test that missing, repeated or ragged results raise instead of returning bad rows."""
+    provider = OpenAIProvider("test-model", "key", "https://api.example.com/v1")
+    response = Mock()
+    response.json.return_value = {"data": data}
+
+    with patch.object(provider.session, "post", return_value=response):
+        with pytest.raises(EmbeddingError):
+            provider.generate_embeddings_batch(["a", "b"])
+
+def test_openai_single_embedding_reuses_session():
+    """Test that single OpenAI requests go through the shared session and headers."""
+    provider = OpenAIProvider("test-model", "key", "https://api.example.com/v1", org_id="org")
+    response = Mock()
+    response.json.return_value = {"data": [{"index": 0, "embedding": [0.1, 0.2]}]}
+
+    with patch.object(provider.session, "post", return_value=response) as session_post:
+        assert provider.generate_embedding("text") == [0.1, 0.2]
+        provider.generate_embedding("more text")
+
+    assert session_post.call_count == 2
+    assert session_post.call_args.args[0] == "https://api.example.com/v1/embeddings"
+    assert session_post.call_args.kwargs["headers"] is provider.headers
+    assert provider.headers["OpenAI-Organization"] == "org"
+
+
+@pytest.mark.parametrize("precision,backend,expected", [
+    ("fp32", "torch", "sentence-transformers:test-model"),
+    ("fp16", "torch", "sentence-transformers:test-model:fp16"),
+    ("fp32", "onnx", "sentence-transformers:test-model:onnx"),
+    ("fp32", "openvino", "sentence-transformers:test-model:openvino"),
+])
+def test_cache_namespace_separates_precision_and_backend(precision, backend, expected):
+    """Test that vectors from different precisions or backends never share cache entries."""
+    with patch.dict("sys.modules", {"torch": MagicMock()}), patch.dict(
+        "src.embeddings.providers._MODEL_CACHE", clear=True
+    ), patch.object(SentenceTransformerProvider, "_load_model", return_value=(Mock(), precision)):
+        provider = SentenceTransformerProvider("test-model", backend=backend)
+
+    with patch("src.embeddings.generator.SentenceTransformerProvider", return_value=provider), patch.object(
+        provider, "get_dimension", return_value=2
+    ):
+        generator = EmbeddingGenerator(
+            provider="sentence-transformers", model_name="test-model", normalize=False, use_cache=False
+        )
+
+    assert generator.cache_namespace == expected
+
+
+def test_generate_embeddings_batch_returns_float32_matrix():
+    """Test that batch embeddings come back as one (n, dim) float32 array."""
+    with patch("src.embeddings.generator.SentenceTransformerProvider") as provider_cls:
+        provider = provider_cls.return_value
+        provider.get_dimension.return_value = 2
+        provider.generate_embeddings_batch.return_value = [[3.0, 4.0], [0.0, 2.0]]
+        generator = EmbeddingGenerator(
+            provider="sentence-transformers", model_name="test-model", normalize=True, use_cache=False
+        )
+
+        embeddings = generator.generate_embeddings_batch(["a", "b"])
+        assert embeddings.dtype == np.float32
+        assert embeddings == pytest.approx(np.array([[0.6, 0.8], [0.0, 1.0]]))
+        assert generator.generate_embeddings_batch([]).shape == (0, 2)
+        assert generator.get_dimension() == 2
+        provider.get_dimension.assert_called_once()
+
+
+def test_process_chunks_deduplicates_without_cache():
+    """Test that repeated texts are embedded once and scattered back."""
+    with patch("src.embeddings.generator.SentenceTransformerProvider") as provider_cls:
+        provider = provider_cls.return_value
+        provider.get_dimension.return_value = 2
+        provider.generate_embeddings_batch.side_effect = (
+            lambda texts: [[float(len(text)), 1.0] for text in texts]
+        )
+        generator = EmbeddingGenerator(
+            provider="sentence-transformers", model_name="test-model", use_cache=False
+        )
+
+        chunks = generator.process_chunks(
+            [{"content": "aa"}, {"content": "b"}, {"content": "aa"}]
+        )
+        assert [chunk["embedding"] for chunk in chunks] == [[2.0, 1.0], [1.0, 1.0], [2.0, 1.0]]
+        provider.generate_embeddings_batch.assert_called_once_with(["aa", "b"])
+
+
+def test_process_chunks_batches_by_length():
+    """Test that batches are length-sorted and results keep chunk order."""
+    with patch("src.embeddings.generator.SentenceTransformerProvider") as provider_cls:
+        provider = provider_cls.return_value
+        provider.get_dimension.return_value = 2
+        provider.generate_embeddings_batch.side_effect = (
+            lambda texts: [[float(len(text)), 1.0] for text in texts]
+        )
+        generator = EmbeddingGenerator(
+            provider="sentence-transformers", model_name="test-model", batch_size=2, use_cache=False
+        )
+
+        chunks = generator.process_chunks(
+            [{"content": "cccc"}, {"content": "a"}, {"content": "ddd"}, {"content": "bb"}]
+        )
+        assert [chunk["embedding"][0] for chunk in chunks] == [4.0, 1.0, 3.0, 2.0]
+        assert provider.generate_embeddings_batch.call_args_list == [
+            call(["a", "bb"]),
+            call(["ddd", "cccc"]),
+        ]
+
+
+def test_process_chunks_replaces_invalid_embeddings(tmp_path):
+    """Test that non-finite rows become zero vectors and are not cached."""
+    with patch("src.embeddings.generator.SentenceTransformerProvider") as provider_cls:
+        provider = provider_cls.return_value
+        provider.get_dimension.return_value = 2
+        provider.generate_embeddings_batch.return_value = [[1.0, 2.0], [float("nan"), 1.0]]
+        cache = EmbeddingCache("test", tmp_path / "cache.sqlite")
+        generator = EmbeddingGenerator(
+            provider="sentence-transformers", model_name="test-model", cache=cache
+        )
+
+        chunks = generator.process_chunks([{"content": "good"}, {"content": "bad"}])
+        assert [chunk["embedding"] for chunk in chunks] == [[1.0, 2.0], [0.0, 0.0]]
+        assert list(cache.get_many([cache.key("good"), cache.key("bad")])) == [cache.key("good")]
+        generator.close()
+
+
+def test_process_chunks_uses_cache(tmp_path):
+    """Test that only uncached, distinct texts are sent to the provider."""
+    with patch("src.embeddings.generator.SentenceTransformerProvider") as provider_cls:
+        provider = provider_cls.return_value
+        provider.get_dimension.return_value = 2
+        provider.generate_embeddings_batch.side_effect = (
+            lambda texts: [[float(len(text)), 1.0] for text in texts]
+        )
+        generator = EmbeddingGenerator(
+            provider="sentence-transformers",
+            model_name="test-model",
+            cache=EmbeddingCache("test", tmp_path / "cache.sqlite"),
+        )
+
+        first = generator.process_chunks(
+            [{"content": "aa"}, {"content": "aa"}, {"content": "b"}]
+        )
+        assert [chunk["embedding"] for chunk in first] == [[2.0, 1.0], [2.0, 1.0], [1.0, 1.0]]
+        assert provider.generate_embeddings_batch.call_args_list == [call(["aa", "b"])]
+        assert generator.cache_hits == 0
+
+        second = generator.process_chunks(
+            [{"content": "b"}, {"content": "ccc"}, {"content": "b"}]
+        )
+        assert [chunk["embedding"] for chunk in second] == [[1.0, 1.0], [3.0, 1.0], [1.0, 1.0]]
+        assert provider.generate_embeddings_batch.call_args_list[-1] == call(["ccc"])
+        assert generator.cache_hits == 2
+        generator.close()
+
+
+def test_generator_context_manager_closes_cache():
+    """Test that leaving the generator's context closes its cache connection."""
+    cache = Mock()
+    with patch("src.embeddings.generator.SentenceTransformerProvider") as provider_cls:
+        provider_cls.return_value.get_dimension.return_value = 2
+        with EmbeddingGenerator(
+            provider="sentence-transformers", model_name="test-model", cache=cache
+        ) as generator:
+            assert generator.cache is cache
+
+    cache.close.assert_called_once_with()
+    assert generator.cache is None
@@ -62,6 +62,29 @@ class TestFileManager:
         assert len(loaded) == 1
         assert len(loaded[0]["embedding"]) == 384
 
+    def test_save_numpy_embeddings(self):
+        """Test that float32 array embeddings are saved as plain JSON lists."""
+        np = pytest.importorskip("numpy")
+        vector = np.array([0.1, -0.5, 2.0], dtype=np.float32)
+        chunks = [{"id": "chunk1", "content": "Content", "embedding": vector}]
+        file_path = self.file_manager.save_embeddings(chunks, "test_numpy_embeddings.json")
+
+        raw = json.loads(file_path.read_text(encoding="utf-8"))
+        assert raw[0]["embedding"] == pytest.approx(vector.tolist())
+
+        loaded = self.file_manager.load_embeddings("test_numpy_embeddings.json")
+        assert loaded[0]["embedding"] == pytest.approx(vector.tolist())
+
+    def test_load_embeddings_with_nan_tokens(self):
+        """Test that legacy files with NaN/Infinity tokens still load."""
+        file_path = self.temp_dir / "embeddings" / "legacy_embeddings.json"
+        file_path.write_text('[{"id": "chunk1", "embedding": [0.1, NaN, Infinity]}]', encoding="utf-8")
+
+        loaded = self.file_manager.load_embeddings("legacy_embeddings.json")
+        assert loaded[0]["embedding"][0] == 0.1
+        assert loaded[0]["embedding"][1] != loaded[0]["embedding"][1]
+        assert loaded[0]["embedding"][2] == float("inf")
+
     def test_load_nonexistent_file(self):
         """Test loading non-existent file raises error."""
         with pytest.raises(StorageError):
@@ -0,0 +1,133 @@
+"""Unit tests for configuration settings."""
+
+from pathlib import Path
+from typing import Optional
+
+from config import settings as settings_module
+from config.settings import Settings, _EnvSetting
+
+
+class TestEnvSetting:
+    """Test lazy environment-backed settings."""
+
+    def test_resolved_on_first_access(self, monkeypatch):
+        """Test that the value is read from the environment when first accessed."""
+        monkeypatch.setattr(settings_module, "_ENV", {"BATCH": "8"})
+
+        class Demo:
+            BATCH: int = _EnvSetting("32")
+
+        assert isinstance(Demo.__dict__["BATCH"], _EnvSetting)
+        assert Demo.BATCH == 8
+        # Value is cached on the class, replacing the descriptor
+        assert Demo.__dict__["BATCH"] == 8
+
+    def test_default_used_when_unset(self, monkeypatch):
+        """Test that defaults are parsed with the setting's cast."""
+        monkeypatch.setattr(settings_module, "_ENV", {})
+
+        class Demo:
+            FLAG: bool = _EnvSetting("false")
+            NAME: str = _EnvSetting("default")
+
+        assert Demo.FLAG is False
+        assert Demo.NAME == "default"
+
+    def test_parser_chosen_from_annotation(self, monkeypatch):
+        """Test that values are converted according to the type annotation."""
+        monkeypatch.setattr(
+            settings_module, "_ENV", {"RATE": "0.5", "ON": "TRUE", "DIM": "0"}
+        )
+
+        class Demo:
+            RATE: float = _EnvSetting("1.0")
+            ON: bool = _EnvSetting("false")
+            DIM: Optional[int] = _EnvSetting("")
+            UNSET_DIM: Optional[int] = _EnvSetting("")
+
+        assert Demo.RATE == 0.5
+        assert Demo.ON is True
+        assert Demo.DIM is None
+        assert Demo.UNSET_DIM is None
+
+    def test_resolve_all(self):
+        """Test that resolve_all leaves no lazy descriptors behind."""
+        Settings.resolve_all()
+        assert not any(
+            isinstance(value, _EnvSetting) for value in vars(Settings).values()
+        )
+
+    def test_settings_monkeypatchable(self, monkeypatch, tmp_path):
+        """Test that settings can still be overridden with monkeypatch."""
+        monkeypatch.setattr("config.settings.Settings.DATA_DIR", tmp_path)
+        assert Settings.DATA_DIR == tmp_path
+        assert Settings.get_data_path("raw") == tmp_path / "raw"
+
+    def test_path_parser(self, monkeypatch, tmp_path):
+        """Test that relative or '..' paths are resolved and absolute ones kept."""
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(
+            settings_module,
+            "_ENV",
+            {"REL": "data", "UP": str(tmp_path / "a" / ".." / "b"), "ABS": str(tmp_path / "c")},
+        )
+
+        class Demo:
+            REL: Path = _EnvSetting("")
+            UP: Path = _EnvSetting("")
+            ABS: Path = _EnvSetting("")
+
+        assert Demo.REL == tmp_path.resolve() / "data"
+        assert Demo.UP == tmp_path.resolve() / "b"
+        assert Demo.ABS == tmp_path / "c"
+
+    def test_data_dir_is_absolute(self):
+        """Test that DATA_DIR resolves to an absolute path."""
+        assert isinstance(Settings.DATA_DIR, Path)
+        assert Settings.DATA_DIR.is_absolute()
+
+
+class TestDataDirectories:
+    """Test data directory helpers."""
+
+    def test_ensure_data_directories(self, monkeypatch, tmp_path):
+        """Test that all data subdirectories are created, and re-running is safe."""
+        monkeypatch.setattr("config.settings.Settings.DATA_DIR", tmp_path)
+        Settings.ensure_data_directories()
+        Settings.ensure_data_directories()
+
+        for name in ("raw", "processed", "chunks", "embeddings", "hashes", "manifests"):
+            assert (tmp_path / name).is_dir()
+
+    def test_get_data_path_follows_data_dir(self, monkeypatch, tmp_path):
+        """Test that cached data paths track changes to DATA_DIR."""
+        original = Settings.get_data_path("chunks")
+        assert Settings.get_data_path("chunks") is original
+
+        monkeypatch.setattr("config.settings.Settings.DATA_DIR", tmp_path)
+        assert Settings.get_data_path("chunks") == tmp_path / "chunks"
+        assert Settings.get_data_path("hashes", "content_hashes.json") == (
+            tmp_path / "hashes" / "content_hashes.json"
+        )
+
+
+class TestValidate:
+    """Test settings validation."""
+
+    def test_validate_default_config(self, monkeypatch):
+        """Test that a valid configuration passes in both modes."""
+        monkeypatch.setattr("config.settings.Settings.STORAGE_MODE", "local")
+        monkeypatch.setattr("config.settings.Settings.EMBEDDING_PROVIDER", "sentence-transformers")
+        assert Settings.validate() is True
+        assert Settings.validate(fail_fast=True) is True
+
+    def test_validate_collects_all_errors(self, monkeypatch):
+        """Test that all problems are reported unless fail_fast is set."""
+        monkeypatch.setattr("config.settings.Settings.STORAGE_MODE", "bogus")
+        monkeypatch.setattr("config.settings.Settings.PIPELINE_MODE", "bogus")
+
+        errors = list(Settings._iter_errors())
+        assert len(errors) == 2
+        assert errors[0].startswith("Invalid STORAGE_MODE")
+        assert Settings.validate() is False
+        assert Settings.validate(fail_fast=True) is False
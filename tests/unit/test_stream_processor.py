@@ -0,0 +1,57 @@
+"""Unit tests for StreamProcessor worker lifecycle."""
+
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.pipeline.stream_processor import StreamProcessor
+
+
+@pytest.fixture
+def processor():
+    """StreamProcessor with the embedding model stubbed out."""
+    with patch("src.pipeline.stream_processor.EmbeddingGenerator"):
+        processor = StreamProcessor(max_workers=3)
+    yield processor
+    processor.close()
+
+
+class TestStreamProcessorWorkers:
+    """Test worker start, drain and shutdown."""
+
+    def test_workers_process_queue_until_done(self, processor):
+        """Test that queued files are processed and wait_for_queue returns."""
+        processed = []
+        with patch.object(processor, "_process_file", side_effect=lambda path, _: processed.append(path)):
+            processor.start_workers()
+            for i in range(5):
+                processor.file_queue.put(Path(f"item_{i}.json"))
+            assert processor.wait_for_queue(timeout=5.0)
+
+        assert sorted(p.name for p in processed) == [f"item_{i}.json" for i in range(5)]
+
+    def test_stop_drains_to_sentinels(self, processor):
+        """Test that stopping skips pending files and leaves nothing queued."""
+        release = threading.Event()
+        started = threading.Event()
+
+        def block(path, worker_name):
+            started.set()
+            release.wait(5.0)
+
+        with patch.object(processor, "_process_file", side_effect=block) as process_file:
+            processor.start_workers()
+            for i in range(6):
+                processor.file_queue.put(Path(f"item_{i}.json"))
+            assert started.wait(5.0)
+
+            # Let workers finish their current file only after stop is requested
+            threading.Timer(0.2, release.set).start()
+            processor.stop_workers()
+
+        assert processor.workers == []
+        assert processor.file_queue.unfinished_tasks == 0
+        assert processor.file_queue.empty()
+        assert process_file.call_count <= 3
@@ -0,0 +1,47 @@
+"""Unit tests for the Pinecone upload ledger in scripts/upload_existing_to_pinecone.py."""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+SCRIPT_PATH = Path(__file__).parents[2] / "scripts" / "upload_existing_to_pinecone.py"
+
+
+@pytest.fixture(scope="module")
+def upload_script():
+    """Load the upload script as a module."""
+    spec = importlib.util.spec_from_file_location("upload_existing_to_pinecone", SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestUploadedLedger:
+    """Test that upload records are kept per index and namespace."""
+
+    def test_ledger_path_includes_namespace(self, upload_script):
+        """Test that each namespace gets its own ledger file."""
+        default = upload_script.uploaded_ledger_path("docs")
+        tenant_a = upload_script.uploaded_ledger_path("docs", "tenant-a")
+        nested = upload_script.uploaded_ledger_path("docs", "team/a b")
+
+        assert default.name == "pinecone_uploaded_docs.sqlite"
+        assert tenant_a.name == "pinecone_uploaded_docs__tenant-a.sqlite"
+        assert nested.name == "pinecone_uploaded_docs__team%2Fa%20b.sqlite"
+        assert nested.parent == default.parent
+
+    def test_upload_in_one_namespace_not_skipped_in_another(self, upload_script, tmp_path, monkeypatch):
+        """Test that chunks uploaded to one namespace are still pending in another."""
+        monkeypatch.setattr(upload_script.Settings, "DATA_DIR", tmp_path)
+        chunk = {"id": "chunk_1", "content": "Test", "embedding": [0.1, 0.2]}
+
+        ledger_a = upload_script.UploadedChunks(upload_script.uploaded_ledger_path("docs", "a"))
+        pending, records = ledger_a.filter_pending([chunk])
+        ledger_a.mark_uploaded(records)
+        assert ledger_a.filter_pending([chunk])[0] == []
+        ledger_a.close()
+
+        ledger_b = upload_script.UploadedChunks(upload_script.uploaded_ledger_path("docs", "b"))
+        assert ledger_b.filter_pending([chunk])[0] == [chunk]
+        ledger_b.close()
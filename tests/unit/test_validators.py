@@ -1,5 +1,6 @@
 """Unit tests for validators."""
 
+import numpy as np
 import pytest
 from src.utils.validators import (
     validate_chunk,
@@ -31,6 +32,12 @@ class TestValidators:
         embedding = [0.1, 0.2, 0.3]
         assert validate_embedding(embedding) is True
 
+    def test_validate_embedding_ndarray(self):
+        """Test validation of numpy embedding vectors."""
+        assert validate_embedding(np.array([0.1, 0.2], dtype=np.float32)) is True
+        assert validate_embedding(np.zeros((2, 2), dtype=np.float32)) is False
+        assert validate_embedding(np.array([], dtype=np.float32)) is False
+
     def test_validate_embedding_invalid_type(self):
         """Test validation of invalid embedding type."""
         assert validate_embedding("not a list") is False